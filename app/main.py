@@ -1,18 +1,209 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.datastructures import State
 
+from app.v1.cache.shared import ISharedCache, InMemorySharedCache
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.background import TaskSet
 from app.v1.core.config import settings
+from app.v1.core.loop import LoopLagMonitor
+from app.v1.core.metrics import MetricsMiddleware, index_errors
+from app.v1.core.singleflight import SingleFlight
+from app.v1.db.codec import DocumentCodec
+from app.v1.db.indexes import ensure_indexes
+from app.v1.db.mongodb import MongoDB
+from app.v1.dependencies import create_warmup_service
+from app.v1.repositories.access import AccessStatsRepository
+from app.v1.repositories.lease import LeaseRepository
+from app.v1.repositories.reverse_index import ReverseIndexRepository
+from app.v1.repositories.source_language import SourceLanguageRepository
+from app.v1.repositories.translation import TranslationRepository
+from app.v1.endpoints.metrics import router as metrics_router
 from app.v1.routes import router as v1_router
+from app.v1.services.access import AccessRecorder
+from app.v1.services.google_translate import close_translator, create_translator, create_upstream_policy
+from app.v1.services.refresh import TranslationRefresher
+from app.v1.services.reverse_index import ReverseIndexRecorder
+from app.v1.services.write_behind import WriteBehindQueue
+
+
+def create_shared_cache(backend: str) -> ISharedCache | None:
+    """
+    L2 of the translation cache by TRANSLATION_CACHE_L2:
+    - none: L1 only
+    - memory: in-process stand-in, for tests and local runs
+    """
+    if backend == 'memory':
+        return InMemorySharedCache()
+
+    return None
+
+
+async def warm_up(state: State) -> asyncio.Task | None:
+    """
+    Stored hot keys go to the cache before the worker serves, within WARMUP_TIMEOUT.
+    With WARMUP_PREFETCH, keys that aren't stored yet are resolved in the background: the returned task
+    """
+    warmup_service = await create_warmup_service(state)
+
+    async def load() -> list:
+        keys = await warmup_service.get_keys(settings.WARMUP_LIMIT, settings.WARMUP_KEYS_FILE)
+
+        return await warmup_service.load(keys)
+
+    try:
+        missing = await asyncio.wait_for(load(), settings.WARMUP_TIMEOUT)
+    except Exception as e:
+        # Log warm-up error here. Start cold rather than not at all
+        return None
+
+    if settings.WARMUP_PREFETCH and missing:
+        return asyncio.create_task(warmup_service.prefetch(missing))
+
+    return None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application-scoped resources. Created once per worker on startup, released on shutdown.
+    - mongodb: a single pooled Motor client shared by every request, indexes are ensured on startup
+    - index_error: why ensuring the indexes failed, None if it didn't (see HealthService)
+    - document_codec: storage format of translations (full or compact, optionally compressed)
+    - translation_repository, lease_repository, source_language_repository, reverse_index_repository:
+      stateless, shared by every request
+    - translation_cache: resolved translations, in-process LRU/TTL (L1) plus an optional shared tier (L2)
+    - single_flight: coalesces concurrent identical Google lookups within the worker
+    - translator: Google Translate client on a keep-alive connection pool
+    - upstream_policy: rate limiter, retries and circuit breaker around Google Translate
+    - write_behind: persists new words and languages off the request path, drained on shutdown
+    - access_recorder: counts requested (word, sl, tl) keys for the warm-up of the next start
+    - reverse_index_recorder: feeds the reverse index with the words Google translates
+    - background_tasks: background upgrades of the words served derived from the reverse index
+    - translation_refresher: background, rate limited re-fetches of the stale stored translations
+    - loop_monitor: event loop lag, for the readiness check
+    - warmup_task: background prefetch of hot keys that aren't stored yet. The stored ones are in the cache
+      before the worker serves its first request (see warm_up)
+    """
+    app.state.mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+    app.state.index_error = None
+
+    if settings.MONGO_ENSURE_INDEXES:
+        try:
+            await ensure_indexes(app.state.mongodb.get_database(settings.MONGO_DB))
+        except Exception as e:
+            # Log index error here. Serve without them rather than not at all, reported by the readiness check
+            app.state.index_error = str(e) or type(e).__name__
+            index_errors.inc(type(e).__name__)
+
+    app.state.document_codec = DocumentCodec.from_settings(settings)
+    app.state.translation_repository = TranslationRepository(app.state.mongodb.get_database(settings.MONGO_DB),
+                                                             app.state.document_codec)
+    app.state.lease_repository = LeaseRepository(app.state.mongodb.get_database(settings.MONGO_DB))
+    app.state.source_language_repository = SourceLanguageRepository(app.state.mongodb.get_database(settings.MONGO_DB))
+    app.state.reverse_index_repository = ReverseIndexRepository(app.state.mongodb.get_database(settings.MONGO_DB))
+    app.state.translation_cache = TieredTranslationCache(
+        LocalTranslationCache(
+            max_size=settings.TRANSLATION_CACHE_MAX_SIZE,
+            ttl=settings.TRANSLATION_CACHE_TTL,
+            negative_ttl=settings.TRANSLATION_CACHE_NEGATIVE_TTL,
+        ),
+        create_shared_cache(settings.TRANSLATION_CACHE_L2),
+        l2_ttl=settings.TRANSLATION_CACHE_L2_TTL,
+        l2_negative_ttl=settings.TRANSLATION_CACHE_NEGATIVE_TTL,
+    )
+    app.state.single_flight = SingleFlight()
+    app.state.translator = await create_translator(settings)
+    app.state.upstream_policy = create_upstream_policy(settings)
+    app.state.write_behind = None
+
+    if settings.WRITE_BEHIND_ENABLED:
+        app.state.write_behind = WriteBehindQueue(
+            app.state.translation_repository,
+            max_size=settings.WRITE_BEHIND_MAX_SIZE,
+            batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL,
+        )
+        app.state.write_behind.start()
+
+    app.state.access_recorder = None
+
+    if settings.ACCESS_STATS_ENABLED:
+        app.state.access_recorder = AccessRecorder(
+            AccessStatsRepository(app.state.mongodb.get_database(settings.MONGO_DB)),
+            flush_interval=settings.ACCESS_STATS_FLUSH_INTERVAL,
+        )
+        app.state.access_recorder.start()
+
+    app.state.reverse_index_recorder = None
+
+    if settings.REVERSE_INDEX_ENABLED:
+        app.state.reverse_index_recorder = ReverseIndexRecorder(
+            app.state.reverse_index_repository,
+            flush_interval=settings.REVERSE_INDEX_FLUSH_INTERVAL,
+        )
+        app.state.reverse_index_recorder.start()
+
+    app.state.background_tasks = TaskSet(settings.REVERSE_INDEX_MAX_UPGRADES)
+    app.state.translation_refresher = None
+
+    if settings.TRANSLATION_REFRESH_ENABLED:
+        app.state.translation_refresher = TranslationRefresher(
+            fresh_for=settings.TRANSLATION_FRESH_FOR,
+            max_age=settings.TRANSLATION_MAX_AGE,
+            rate=settings.TRANSLATION_REFRESH_RATE,
+            max_pending=settings.TRANSLATION_REFRESH_MAX_PENDING,
+        )
+        app.state.translation_refresher.start()
+
+    app.state.loop_monitor = LoopLagMonitor(settings.HEALTH_LOOP_LAG_INTERVAL)
+    app.state.loop_monitor.start()
+    app.state.warmup_task = await warm_up(app.state) if settings.WARMUP_ENABLED else None
+
+    try:
+        yield
+    finally:
+        if app.state.warmup_task:
+            app.state.warmup_task.cancel()
+
+        await app.state.loop_monitor.stop()
+        await app.state.background_tasks.stop()
+
+        if app.state.translation_refresher:
+            await app.state.translation_refresher.stop()
+
+        if app.state.reverse_index_recorder:
+            await app.state.reverse_index_recorder.stop()
+
+        if app.state.access_recorder:
+            await app.state.access_recorder.stop()
+
+        if app.state.write_behind:
+            await app.state.write_behind.stop()
+
+        await close_translator(app.state.translator)
+        app.state.mongodb.close()
+
 
 app = FastAPI(
     title=settings.APP_TITLE,
     version=settings.APP_VERSION,
     description=settings.APP_DESCRIPTION,
+    lifespan=lifespan,
 )
 app.include_router(v1_router, prefix="/v1")
 
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
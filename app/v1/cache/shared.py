@@ -0,0 +1,59 @@
+import time
+
+from abc import ABC, abstractmethod
+from typing import Callable
+
+
+class ISharedCache(ABC):
+    """
+    Responsibility: Key-value store shared by every worker (L2 of the translation cache).
+    A networked store (e.g. Redis, Memcached) implements this interface.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """
+        Atomically increment an integer, missing keys start from 0. Never expires
+        """
+        pass
+
+
+class InMemorySharedCache(ISharedCache):
+    """
+    Responsibility: Local stand-in for a shared cache, for tests and single-process setups
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock: Callable[[], float] = clock
+        self._values: dict[str, tuple[float | None, bytes]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._values.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at is not None and expires_at <= self.clock():
+            del self._values[key]
+            return None
+
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._values[key] = (self.clock() + ttl, value)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self._values[key] = (None, str(value).encode())
+
+        return value
@@ -0,0 +1,333 @@
+import time
+
+import orjson
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable
+
+from app.v1.cache.shared import ISharedCache
+from app.v1.core.exceptions import GoogleTranslateRequestException
+from app.v1.models import WordDocument
+
+CacheKey = tuple[str, str, str]
+
+
+class ITranslationCache(ABC):
+    """
+    Responsibility: Cache resolved translations, keyed by (word, sl, tl)
+    """
+
+    @abstractmethod
+    async def get(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        """
+        Returns the cached word or None on miss.
+        Raises GoogleTranslateRequestException if a recent lookup of the key failed.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, word: str, sl: str, tl: str, value: WordDocument, fresh: bool = False) -> None:
+        """
+        By default the value is taken as read from the DB after the last miss of the key: if the word was
+        invalidated since, it may be older than the write that invalidated it. fresh: the value is newer
+        than every write of the word so far (e.g. just fetched from Google and stored)
+        """
+        pass
+
+    @abstractmethod
+    async def set_negative(self, word: str, sl: str, tl: str, error: Exception) -> None:
+        pass
+
+    @abstractmethod
+    async def invalidate(self, word: str) -> None:
+        """
+        Drop every cached (sl, tl) combination of the word
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+class LocalTranslationCache:
+    """
+    Responsibility: Keep hot translations in process memory, keyed by (word, sl, tl). L1 of TieredTranslationCache
+
+    - Bounded LRU: the least recently used entry is evicted when max_size is reached
+    - TTL: every entry expires after ttl seconds
+    - Negative results (failed Google lookups) are kept for negative_ttl seconds
+      and re-raised on hit, so a failing word doesn't hammer Google
+    - Cached words are shared between requests and must not be mutated
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.negative_ttl: float = negative_ttl
+        self.clock: Callable[[], float] = clock
+
+        self._entries: OrderedDict[CacheKey, tuple[float, WordDocument | Exception]] = OrderedDict()
+        self._keys_by_word: dict[str, set[CacheKey]] = {}
+
+        self.hits: int = 0
+        self.negative_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        """
+        Returns the cached word or None on miss.
+        Raises GoogleTranslateRequestException if a recent lookup of the key failed.
+        """
+        key = (word, sl, tl)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= self.clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+
+        if isinstance(value, Exception):
+            self.negative_hits += 1
+            raise GoogleTranslateRequestException(str(value))
+
+        self.hits += 1
+
+        return value
+
+    def set(self, word: str, sl: str, tl: str, value: WordDocument) -> None:
+        self._put((word, sl, tl), value, self.ttl)
+
+    def set_negative(self, word: str, sl: str, tl: str, error: Exception) -> None:
+        self._put((word, sl, tl), error, self.negative_ttl)
+
+    def invalidate(self, word: str) -> None:
+        """
+        Drop every cached (sl, tl) combination of the word
+        """
+        for key in list(self._keys_by_word.get(word, ())):
+            self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_word.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+
+        return {
+            'size': len(self._entries),
+            'maxSize': self.max_size,
+            'hits': self.hits,
+            'negativeHits': self.negative_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'hitRatio': (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+    def _put(self, key: CacheKey, value: WordDocument | Exception, ttl: float) -> None:
+        if self.max_size <= 0 or ttl <= 0:
+            return
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+        self._entries[key] = (self.clock() + ttl, value)
+        self._keys_by_word.setdefault(key[0], set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_word.get(key[0])
+
+        if keys is not None:
+            keys.discard(key)
+
+            if not keys:
+                del self._keys_by_word[key[0]]
+
+
+class TieredTranslationCache(ITranslationCache):
+    """
+    Responsibility: Two-tier translation cache
+    - L1: LocalTranslationCache, per worker
+    - L2: ISharedCache, shared by every worker, optional
+
+    L2 entries carry the version of the word: f"translation:{word}:{version}:{sl}:{tl}".
+    invalidate() bumps the version, so every stale entry of the word becomes unreachable at once.
+    A miss remembers the version it saw (for at most max_misses words, the oldest are forgotten), and set()
+    of the key writes under it: a value read from the DB before another worker's bump lands under the old
+    version, unreachable. A value read before this worker's invalidate() isn't cached at all.
+    Fresh values (see ITranslationCache.set) are written under the current version.
+    Other workers' L1 entries live until their (short) TTL: the L1 TTL bounds cross-worker staleness.
+    L2 errors are counted and ignored, the cache is best effort.
+    L2 payloads are written by the app itself: decoded with orjson, not validated again.
+    """
+    POSITIVE = b'+'
+    NEGATIVE = b'-'
+    INVALIDATED = -1
+
+    def __init__(self, l1: LocalTranslationCache, l2: ISharedCache | None = None,
+                 l2_ttl: float = 3600, l2_negative_ttl: float = 30, max_misses: int = 10000):
+        self.l1: LocalTranslationCache = l1
+        self.l2: ISharedCache | None = l2
+        self.l2_ttl: float = l2_ttl
+        self.l2_negative_ttl: float = l2_negative_ttl
+        self.max_misses: int = max_misses
+
+        # L2 version seen by the pending misses, by word. INVALIDATED once invalidate() overtook them
+        self._misses: OrderedDict[str, dict[CacheKey, int]] = OrderedDict()
+
+        self.l2_hits: int = 0
+        self.l2_misses: int = 0
+        self.l2_errors: int = 0
+
+    async def get(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        cached_word = self.l1.get(word, sl, tl)
+
+        if cached_word:
+            return cached_word
+
+        if self.l2 is None:
+            self._remember_miss((word, sl, tl), 0)
+            return None
+
+        try:
+            version = await self._version(word)
+            payload = await self.l2.get(self._key(word, version, sl, tl))
+        except Exception as e:
+            # Log cache error here
+            self.l2_errors += 1
+            return None
+
+        if payload is None:
+            self.l2_misses += 1
+            self._remember_miss((word, sl, tl), version)
+            return None
+
+        self.l2_hits += 1
+        kind, data = payload[:1], payload[1:]
+
+        if kind == self.NEGATIVE:
+            error = GoogleTranslateRequestException(data.decode())
+            self.l1.set_negative(word, sl, tl, error)
+            raise error
+
+        cached_word = orjson.loads(data)
+        self.l1.set(word, sl, tl, cached_word)
+
+        return cached_word
+
+    async def set(self, word: str, sl: str, tl: str, value: WordDocument, fresh: bool = False) -> None:
+        version = self._forget_miss((word, sl, tl))
+
+        if fresh:
+            version = None
+        elif version == self.INVALIDATED:
+            return
+
+        self.l1.set(word, sl, tl, value)
+        await self._set_l2(word, version, sl, tl, self.POSITIVE + orjson.dumps(value), self.l2_ttl)
+
+    async def set_negative(self, word: str, sl: str, tl: str, error: Exception) -> None:
+        version = self._forget_miss((word, sl, tl))
+
+        if version == self.INVALIDATED:
+            return
+
+        self.l1.set_negative(word, sl, tl, error)
+        await self._set_l2(word, version, sl, tl, self.NEGATIVE + str(error).encode(), self.l2_negative_ttl)
+
+    async def invalidate(self, word: str) -> None:
+        self.l1.invalidate(word)
+
+        if word in self._misses:
+            self._misses[word] = dict.fromkeys(self._misses[word], self.INVALIDATED)
+
+        if self.l2 is None:
+            return
+
+        try:
+            await self.l2.incr(self._version_key(word))
+        except Exception as e:
+            # Log cache error here. L2 entries of the word live until their TTL
+            self.l2_errors += 1
+
+    def stats(self) -> dict:
+        return {
+            **self.l1.stats(),
+            'l2Hits': self.l2_hits,
+            'l2Misses': self.l2_misses,
+            'l2Errors': self.l2_errors,
+        }
+
+    async def _set_l2(self, word: str, version: int | None, sl: str, tl: str, payload: bytes, ttl: float) -> None:
+        """
+        Under the version the miss saw, the current one if there was no miss
+        """
+        if self.l2 is None:
+            return
+
+        try:
+            if version is None:
+                version = await self._version(word)
+
+            await self.l2.set(self._key(word, version, sl, tl), payload, ttl)
+        except Exception as e:
+            # Log cache error here
+            self.l2_errors += 1
+
+    def _remember_miss(self, key: CacheKey, version: int) -> None:
+        self._misses.setdefault(key[0], {})[key] = version
+        self._misses.move_to_end(key[0])
+
+        while len(self._misses) > self.max_misses:
+            self._misses.popitem(last=False)
+
+    def _forget_miss(self, key: CacheKey) -> int | None:
+        misses = self._misses.get(key[0])
+
+        if misses is None or key not in misses:
+            return None
+
+        version = misses.pop(key)
+
+        if not misses:
+            del self._misses[key[0]]
+
+        return version
+
+    async def _version(self, word: str) -> int:
+        return int(await self.l2.get(self._version_key(word)) or 0)
+
+    @staticmethod
+    def _key(word: str, version: int, sl: str, tl: str) -> str:
+        return f'translation:{word}:{version}:{sl}:{tl}'
+
+    @staticmethod
+    def _version_key(word: str) -> str:
+        return f'translation-version:{word}'
@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+from app.v1.core.config import settings
+from app.v1.db.codec import DocumentCodec
+from app.v1.db.mongodb import MongoDB
+
+"""
+Convert stored languages to the configured storage format (TRANSLATION_STORAGE_FORMAT, TRANSLATION_COMPRESSION).
+With --full back to the full format, e.g. before turning the compact format off.
+
+Usage:
+    python -m app.v1.commands.compact [--batch-size 500] [--full]
+"""
+
+
+async def convert_documents(collection: AsyncIOMotorCollection, codec: DocumentCodec, batch_size: int) -> int:
+    """
+    Re-encode every language in the format of the codec. Only changed languages are $set, one by one,
+    and only if they're still stored as read: languages added or updated meanwhile are not overwritten.
+    Documents updated meanwhile are skipped, a later run converts them
+    """
+    updated = 0
+    requests = []
+
+    async for document in collection.find({}, {'languages': 1}).batch_size(batch_size):
+        read = {'_id': document['_id']}
+        changes = {}
+
+        for tl, stored in (document.get('languages') or {}).items():
+            encoded = codec.encode_language(codec.decode_language(stored))
+
+            if encoded != stored:
+                read[f'languages.{tl}'] = stored
+                changes[f'languages.{tl}'] = encoded
+
+        if changes:
+            requests.append(UpdateOne(read, {'$set': changes}))
+
+        if len(requests) >= batch_size:
+            updated += (await collection.bulk_write(requests, ordered=False)).modified_count
+            requests = []
+
+    if requests:
+        updated += (await collection.bulk_write(requests, ordered=False)).modified_count
+
+    return updated
+
+
+async def main(batch_size: int, full: bool) -> None:
+    mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+    codec = DocumentCodec() if full else DocumentCodec.from_settings(settings)
+
+    try:
+        collection = mongodb.get_database(settings.MONGO_DB)['translations']
+        updated = await convert_documents(collection, codec, batch_size)
+
+        print(f'Updated {updated} documents')
+    finally:
+        mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert translations to the configured storage format')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--full', action='store_true', help='Convert back to the full format')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.batch_size, args.full))
@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import json
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.v1.core.config import settings
+from app.v1.db.indexes import ensure_indexes, get_index_stats
+from app.v1.db.mongodb import MongoDB
+
+"""
+Usage:
+    python -m app.v1.commands.indexes ensure - create declared indexes
+    python -m app.v1.commands.indexes stats - report index usage ($indexStats)
+"""
+
+
+async def main(command: str) -> None:
+    mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+
+    try:
+        db = mongodb.get_database(settings.MONGO_DB)
+
+        if command == 'ensure':
+            result = await ensure_indexes(db)
+        else:
+            result = await get_index_stats(db)
+
+        print(json.dumps(result, indent=2, default=str))
+    finally:
+        mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage MongoDB indexes')
+    parser.add_argument('command', choices=['ensure', 'stats'])
+
+    asyncio.run(main(parser.parse_args().command))
@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import DeleteMany, UpdateOne
+
+from app.v1.core.config import settings
+from app.v1.core.normalization import normalize_word
+from app.v1.db.indexes import ensure_indexes
+from app.v1.db.mongodb import MongoDB
+
+"""
+Backfill "normalizedWord", the canonical key words are looked up by, for documents stored before it existed.
+
+Keys computed before it depended on the language (Turkish and Azerbaijani dotted and dotless i) are fixed with --all.
+--merge folds case and Unicode variants stored as separate documents into the oldest one: its spelling is kept,
+languages it lacks are taken from the others, the others are deleted. Then the indexes are ensured, the unique
+(normalizedWord, language) one included. Run with --all --merge once after upgrading.
+
+Usage:
+    python -m app.v1.commands.normalize [--batch-size 1000] [--all] [--merge]
+"""
+
+
+async def backfill_normalized_word(collection: AsyncIOMotorCollection, batch_size: int,
+                                   recompute_all: bool = False) -> int:
+    query = {} if recompute_all else {'normalizedWord': {'$exists': False}}
+    updated = 0
+    requests = []
+
+    async for document in collection.find(query, {'word': 1, 'language': 1}).batch_size(batch_size):
+        normalized_word = normalize_word(document['word'], document.get('language'))
+        requests.append(UpdateOne({'_id': document['_id']}, {'$set': {'normalizedWord': normalized_word}}))
+
+        if len(requests) >= batch_size:
+            updated += (await collection.bulk_write(requests, ordered=False)).modified_count
+            requests = []
+
+    if requests:
+        updated += (await collection.bulk_write(requests, ordered=False)).modified_count
+
+    return updated
+
+
+async def merge_duplicates(collection: AsyncIOMotorCollection, batch_size: int) -> int:
+    """
+    Returns the number of deleted duplicates. Languages are copied as stored, whatever the storage format,
+    with their fetch times: a copied language is as fresh as it was (see TranslationRefresher)
+    """
+    groups = collection.aggregate([
+        {'$group': {'_id': {'normalizedWord': '$normalizedWord', 'language': '$language'},
+                    'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+    ], allowDiskUse=True)
+    deleted = 0
+    requests = []
+
+    async for group in groups:
+        documents = await collection.find({'_id': {'$in': group['ids']}}, {'languages': 1, 'fetchedAt': 1}) \
+            .sort('_id', 1).to_list(length=None)
+        survivor, *duplicates = documents
+        languages = {}
+
+        for duplicate in duplicates:
+            fetched_at = duplicate.get('fetchedAt') or {}
+
+            for tl, data in (duplicate.get('languages') or {}).items():
+                if tl in (survivor.get('languages') or {}) or f'languages.{tl}' in languages:
+                    continue
+
+                languages[f'languages.{tl}'] = data
+
+                if tl in fetched_at:
+                    languages[f'fetchedAt.{tl}'] = fetched_at[tl]
+
+        if languages:
+            requests.append(UpdateOne({'_id': survivor['_id']}, {'$set': languages}))
+
+        requests.append(DeleteMany({'_id': {'$in': [duplicate['_id'] for duplicate in duplicates]}}))
+        deleted += len(duplicates)
+
+        if len(requests) >= batch_size:
+            await collection.bulk_write(requests, ordered=True)
+            requests = []
+
+    if requests:
+        await collection.bulk_write(requests, ordered=True)
+
+    return deleted
+
+
+async def main(batch_size: int, recompute_all: bool, merge: bool) -> None:
+    mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+
+    try:
+        db = mongodb.get_database(settings.MONGO_DB)
+        updated = await backfill_normalized_word(db['translations'], batch_size, recompute_all)
+
+        print(f'Updated {updated} documents')
+
+        if merge:
+            deleted = await merge_duplicates(db['translations'], batch_size)
+            await ensure_indexes(db)
+
+            print(f'Merged {deleted} duplicates')
+    finally:
+        mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill normalizedWord in translations')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--all', action='store_true', help='Recompute for every document')
+    parser.add_argument('--merge', action='store_true', help='Merge documents with the same key, ensure indexes')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.batch_size, args.all, args.merge))
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.v1.core.config import settings
+from app.v1.db.codec import DocumentCodec
+from app.v1.db.mongodb import MongoDB
+from app.v1.repositories.reverse_index import IReverseIndex, ReverseIndexRepository
+from app.v1.repositories.translation import ITranslation, TranslationRepository
+from app.v1.services.reverse_index import merge_entries, reverse_entries
+
+"""
+Rebuild the reverse index (tl -> sl answers derived from stored translations) from every stored word.
+Needed once after upgrading, after imports, or to drop the entries of deleted words (--clear). New words feed it
+as they are translated.
+
+Usage:
+    python -m app.v1.commands.reverse_index [--batch-size 1000] [--clear]
+"""
+
+
+async def rebuild_reverse_index(translations: ITranslation, reverse_index: IReverseIndex, batch_size: int,
+                                clear: bool = False) -> int:
+    """
+    Returns the number of indexed words. Entries of batch_size words are merged into one bulk upsert
+    """
+    if clear:
+        await reverse_index.clear()
+
+    indexed = 0
+    entries = {}
+    now = datetime.now(timezone.utc)
+
+    async for word in translations.iter_words(batch_size):
+        merge_entries(entries, reverse_entries(word))
+        indexed += 1
+
+        if indexed % batch_size == 0:
+            await reverse_index.add(entries, now)
+            entries = {}
+
+    if entries:
+        await reverse_index.add(entries, now)
+
+    return indexed
+
+
+async def main(batch_size: int, clear: bool) -> None:
+    mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+
+    try:
+        db = mongodb.get_database(settings.MONGO_DB)
+        indexed = await rebuild_reverse_index(TranslationRepository(db, DocumentCodec.from_settings(settings)),
+                                              ReverseIndexRepository(db), batch_size, clear)
+
+        print(f'Indexed {indexed} words')
+    finally:
+        mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild the reverse index from stored translations')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--clear', action='store_true', help='Drop the index first')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.batch_size, args.clear))
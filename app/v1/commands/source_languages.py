@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+
+from app.v1.core.config import settings
+from app.v1.core.normalization import normalize_word
+from app.v1.db.mongodb import MongoDB
+from app.v1.repositories.source_language import ISourceLanguage, SourceLanguageRepository
+
+"""
+Backfill the sl=auto resolution index from stored words: every stored (word, language) is seeded, apart from
+the detections. A seed resolves the word only until Google detects it once, the detections override the seeds.
+Run once after upgrading, new words are counted as Google detects them.
+
+Usage:
+    python -m app.v1.commands.source_languages [--batch-size 1000]
+"""
+
+
+async def seed_stored_words(collection: AsyncIOMotorCollection, repository: ISourceLanguage, batch_size: int) -> int:
+    pairs = []
+    seeded = 0
+    now = datetime.now(timezone.utc)
+
+    async for document in collection.find({}, {'_id': 0, 'word': 1, 'language': 1}).batch_size(batch_size):
+        # Counted under the language-neutral key, like SourceLanguageService does
+        pairs.append((normalize_word(document['word']), document['language']))
+
+        if len(pairs) >= batch_size:
+            await repository.seed(pairs, now)
+            seeded, pairs = seeded + len(pairs), []
+
+    if pairs:
+        await repository.seed(pairs, now)
+        seeded += len(pairs)
+
+    return seeded
+
+
+async def main(batch_size: int) -> None:
+    mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+
+    try:
+        db = mongodb.get_database(settings.MONGO_DB)
+        seeded = await seed_stored_words(db['translations'], SourceLanguageRepository(db), batch_size)
+
+        print(f'Seeded {seeded} stored words')
+    finally:
+        mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill the sl=auto resolution index from stored words')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.batch_size))
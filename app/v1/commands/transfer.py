@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+
+from typing import AsyncIterator
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.v1.core.config import settings
+from app.v1.core.ndjson import dump_lines, load_lines
+from app.v1.db.codec import DocumentCodec
+from app.v1.db.mongodb import MongoDB
+from app.v1.repositories.translation import TranslationRepository
+from app.v1.services.translation import TranslationService
+
+"""
+Dump / load the translations collection as NDJSON, same format as GET /translations:export.
+Files ending with .gz are gzipped. Streamed both ways: multi-GB dumps don't need the memory.
+
+Usage:
+    python -m app.v1.commands.transfer export translations.ndjson.gz [--batch-size 1000]
+    python -m app.v1.commands.transfer import translations.ndjson.gz [--chunk-size 1000]
+"""
+
+READ_SIZE = 1024 * 1024
+
+
+async def read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, 'rb') as file:
+        while chunk := file.read(READ_SIZE):
+            yield chunk
+
+
+async def main(command: str, path: str, batch_size: int, chunk_size: int) -> None:
+    mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+    gzip = path.endswith('.gz')
+
+    try:
+        repository = TranslationRepository(mongodb.get_database(settings.MONGO_DB),
+                                           DocumentCodec.from_settings(settings))
+        # No cache: nothing to invalidate outside the app
+        translation = TranslationService(repository)
+
+        if command == 'export':
+            with open(path, 'wb') as file:
+                async for chunk in dump_lines(translation.export_words(batch_size), gzip):
+                    file.write(chunk)
+
+            print(f'Exported to {path}')
+        else:
+            lines = load_lines(read_file(path), gzip, max_line_size=settings.TRANSLATION_IMPORT_MAX_LINE_SIZE)
+            meta = await translation.import_words(lines, chunk_size)
+
+            print(f'Imported {meta["imported"]} of {meta["total"]} words, {meta["failed"]} failed')
+    finally:
+        mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export / import translations as NDJSON')
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('path')
+    parser.add_argument('--batch-size', type=int, default=settings.TRANSLATION_EXPORT_BATCH_SIZE)
+    parser.add_argument('--chunk-size', type=int, default=settings.TRANSLATION_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.command, args.path, args.batch_size, args.chunk_size))
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.datastructures import State
+
+from app.main import create_shared_cache
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.config import settings
+from app.v1.core.singleflight import SingleFlight
+from app.v1.db.codec import DocumentCodec
+from app.v1.db.mongodb import MongoDB
+from app.v1.dependencies import create_warmup_service
+from app.v1.repositories.lease import LeaseRepository
+from app.v1.repositories.reverse_index import ReverseIndexRepository
+from app.v1.repositories.source_language import SourceLanguageRepository
+from app.v1.repositories.translation import TranslationRepository
+from app.v1.services.google_translate import close_translator, create_translator, create_upstream_policy
+from app.v1.services.reverse_index import ReverseIndexRecorder
+
+"""
+Precompute job: the hot keys (access stats or a JSON lines file) that aren't stored yet are translated
+through Google at --rate per second and stored, so the next start of the workers warms them from DB.
+Stored keys are written to the shared cache tier (TRANSLATION_CACHE_L2) if there is one.
+
+Usage:
+    python -m app.v1.commands.warmup [--limit 1000] [--file keys.jsonl] [--rate 1] [--no-prefetch]
+"""
+
+
+async def main(limit: int, path: str, rate: float, prefetch: bool) -> None:
+    state = State()
+    state.mongodb = MongoDB.from_settings(AsyncIOMotorClient, settings)
+    state.document_codec = DocumentCodec.from_settings(settings)
+    state.translation_repository = TranslationRepository(state.mongodb.get_database(settings.MONGO_DB),
+                                                         state.document_codec)
+    state.lease_repository = LeaseRepository(state.mongodb.get_database(settings.MONGO_DB))
+    state.source_language_repository = SourceLanguageRepository(state.mongodb.get_database(settings.MONGO_DB))
+    state.reverse_index_repository = ReverseIndexRepository(state.mongodb.get_database(settings.MONGO_DB))
+    # Not started: flushed once, when the job is done
+    state.reverse_index_recorder = ReverseIndexRecorder(state.reverse_index_repository,
+                                                        flush_interval=settings.REVERSE_INDEX_FLUSH_INTERVAL)
+    state.translation_cache = TieredTranslationCache(
+        LocalTranslationCache(max_size=limit, ttl=settings.TRANSLATION_CACHE_TTL,
+                              negative_ttl=settings.TRANSLATION_CACHE_NEGATIVE_TTL),
+        create_shared_cache(settings.TRANSLATION_CACHE_L2),
+        l2_ttl=settings.TRANSLATION_CACHE_L2_TTL,
+        l2_negative_ttl=settings.TRANSLATION_CACHE_NEGATIVE_TTL,
+    )
+    state.single_flight = SingleFlight()
+    state.translator = await create_translator(settings)
+    state.upstream_policy = create_upstream_policy(settings)
+    # Stored right away, nothing to drain
+    state.write_behind = None
+    # Missing keys are fetched from Google anyway, stored ones aren't refreshed by a one-off job
+    state.translation_refresher = None
+
+    try:
+        warmup_service = await create_warmup_service(state, prefetch_rate=rate)
+
+        keys = await warmup_service.get_keys(limit, path)
+        missing = await warmup_service.load(keys)
+
+        if prefetch:
+            await warmup_service.prefetch(missing)
+
+        print(f'{len(keys)} keys: {warmup_service.stats()}')
+    finally:
+        await state.reverse_index_recorder.stop()
+        await close_translator(state.translator)
+        state.mongodb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Warm up the translation cache and precompute hot keys')
+    parser.add_argument('--limit', type=int, default=settings.WARMUP_LIMIT)
+    parser.add_argument('--file', default=settings.WARMUP_KEYS_FILE, help='JSON lines: {"word", "sl", "tl"}')
+    parser.add_argument('--rate', type=float, default=settings.WARMUP_PREFETCH_RATE,
+                        help='Google lookups per second')
+    parser.add_argument('--no-prefetch', action='store_true', help='Only load stored keys')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.limit, args.file, args.rate, not args.no_prefetch))
@@ -0,0 +1,41 @@
+import asyncio
+
+from typing import Coroutine
+
+
+class TaskSet:
+    """
+    Responsibility: Run fire-and-forget coroutines off the request path.
+    Keeps a reference to every task until it's done (the event loop keeps weak ones only), at most max_size
+    at a time: spawn() drops the coroutine when full. stop() cancels the tasks still running.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self.dropped: int = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def spawn(self, coroutine: Coroutine) -> bool:
+        if len(self._tasks) >= self.max_size:
+            coroutine.close()
+            self.dropped += 1
+            return False
+
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return True
+
+    async def join(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+
+        await self.join()
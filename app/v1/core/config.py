@@ -17,6 +17,83 @@ class CommonSettings(BaseSettings):
     MONGO_INITDB_ROOT_PASSWORD: str
     MONGO_URL: str
     MONGO_DB: str
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SOCKET_TIMEOUT_MS: int = 10000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    MONGO_ENSURE_INDEXES: bool = True
+    GOOGLE_TRANSLATE_HTTP2: bool = True
+    GOOGLE_TRANSLATE_MAX_CONNECTIONS: int = 100
+    GOOGLE_TRANSLATE_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GOOGLE_TRANSLATE_KEEPALIVE_EXPIRY: float = 30
+    GOOGLE_TRANSLATE_TIMEOUT: float = 5
+    GOOGLE_TRANSLATE_CONNECT_TIMEOUT: float = 3
+    GOOGLE_TRANSLATE_RATE_LIMIT: float = 10
+    GOOGLE_TRANSLATE_RATE_BURST: float = 20
+    GOOGLE_TRANSLATE_RATE_LIMIT_MAX_WAIT: float = 1
+    GOOGLE_TRANSLATE_RETRY_ATTEMPTS: int = 3
+    GOOGLE_TRANSLATE_RETRY_BASE_DELAY: float = 0.1
+    GOOGLE_TRANSLATE_RETRY_MAX_DELAY: float = 2
+    GOOGLE_TRANSLATE_BREAKER_FAILURE_THRESHOLD: int = 5
+    GOOGLE_TRANSLATE_BREAKER_RECOVERY_TIMEOUT: float = 30
+    TRANSLATION_CACHE_MAX_SIZE: int = 10000
+    TRANSLATION_CACHE_TTL: float = 300
+    TRANSLATION_CACHE_NEGATIVE_TTL: float = 30
+    TRANSLATION_CACHE_L2: str = 'none'
+    TRANSLATION_CACHE_L2_TTL: float = 3600
+    TRANSLATION_LEASE_TTL: float = 10
+    TRANSLATION_LEASE_POLL_INTERVAL: float = 0.1
+    TRANSLATION_LEASE_WAIT_TIMEOUT: float = 10
+    WRITE_BEHIND_ENABLED: bool = True
+    WRITE_BEHIND_MAX_SIZE: int = 10000
+    WRITE_BEHIND_BATCH_SIZE: int = 500
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 0.05
+    TRANSLATION_STORAGE_FORMAT: str = 'full'
+    TRANSLATION_COMPRESSION: str = 'none'
+    TRANSLATION_COMPRESSION_MIN_SIZE: int = 1024
+    TRANSLATION_COMPRESSION_LEVEL: int = 6
+    TRANSLATION_EXPORT_BATCH_SIZE: int = 1000
+    TRANSLATION_IMPORT_CHUNK_SIZE: int = 1000
+    TRANSLATION_IMPORT_MAX_LINE_SIZE: int = 1048576
+    ACCESS_STATS_ENABLED: bool = True
+    ACCESS_STATS_FLUSH_INTERVAL: float = 10
+    WARMUP_ENABLED: bool = True
+    WARMUP_LIMIT: int = 1000
+    WARMUP_KEYS_FILE: str = ''
+    WARMUP_TIMEOUT: float = 30
+    WARMUP_CHUNK_SIZE: int = 500
+    WARMUP_PREFETCH: bool = False
+    WARMUP_PREFETCH_RATE: float = 1
+    HEALTH_MONGO_PING_TIMEOUT: float = 1
+    HEALTH_MONGO_MAX_LATENCY: float = 0.5
+    HEALTH_MONGO_MAX_POOL_USAGE: float = 0.9
+    HEALTH_UPSTREAM_REQUIRED: bool = False
+    HEALTH_UPSTREAM_WINDOW: float = 60
+    HEALTH_UPSTREAM_MIN_CALLS: int = 10
+    HEALTH_UPSTREAM_MAX_ERROR_RATE: float = 0.5
+    HEALTH_UPSTREAM_MAX_LATENCY: float = 3
+    HEALTH_LOOP_LAG_INTERVAL: float = 0.5
+    HEALTH_MAX_LOOP_LAG: float = 0.5
+    HEALTH_INDEXES_REQUIRED: bool = False
+    METRICS_ENABLED: bool = True
+    AUTO_SL_RESOLUTION_ENABLED: bool = True
+    AUTO_SL_MIN_DETECTIONS: int = 1
+    AUTO_SL_MIN_SHARE: float = 0.8
+    REVERSE_INDEX_ENABLED: bool = True
+    REVERSE_INDEX_FLUSH_INTERVAL: float = 5
+    REVERSE_INDEX_UPGRADE: bool = False
+    REVERSE_INDEX_MAX_UPGRADES: int = 100
+    TRANSLATION_REFRESH_ENABLED: bool = True
+    TRANSLATION_FRESH_FOR: float = 2592000
+    TRANSLATION_MAX_AGE: float = 31536000
+    TRANSLATION_REFRESH_RATE: float = 1
+    TRANSLATION_REFRESH_MAX_PENDING: int = 1000
+    BATCH_MAX_ITEMS: int = 1000
+    BATCH_CONCURRENCY: int = 10
+    MAX_TARGET_LANGUAGES: int = 10
     LIMIT: int = 10
     SKIP: int = 0
     SORTING: str = 'asc'
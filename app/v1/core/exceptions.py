@@ -3,6 +3,15 @@ class GoogleTranslateRequestException(Exception):
         super().__init__(message)
 
 
+class UpstreamUnavailableException(GoogleTranslateRequestException):
+    """
+    Google Translate is not called at all: rate limit exceeded or circuit is open
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+
+
 class WordNotFoundException(Exception):
     def __init__(self, message):
         super().__init__(message)
@@ -11,3 +20,22 @@ class WordNotFoundException(Exception):
 class WordInsertionException(Exception):
     def __init__(self, message):
         super().__init__(message)
+
+
+class InvalidCursorException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class LineTooLongException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class AmbiguousSourceLanguageException(Exception):
+    """
+    The target languages of an sl=auto word were translated from different detected source languages
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from collections import deque
+from typing import Callable
+
+
+class LoopLagMonitor:
+    """
+    Responsibility: Measure the event loop lag: how late a sleep of interval seconds wakes up.
+    A blocked loop (CPU-heavy work, sync I/O) delays every request of the worker.
+    """
+
+    def __init__(self, interval: float, max_samples: int = 20, clock: Callable[[], float] = time.monotonic):
+        self.interval: float = interval
+        self.clock: Callable[[], float] = clock
+        self._samples: deque[float] = deque(maxlen=max_samples)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict:
+        """
+        lag: the latest sample, maxLag: the worst of the recent ones (max_samples * interval seconds)
+        """
+        return {
+            'lag': self._samples[-1] if self._samples else 0.0,
+            'maxLag': max(self._samples, default=0.0),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            started_at = self.clock()
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, self.clock() - started_at - self.interval))
@@ -0,0 +1,268 @@
+import collections.abc
+import functools
+import inspect
+import time
+import typing
+
+from bisect import bisect_left
+from typing import Iterable
+
+from app.v1.core.config import settings
+
+"""
+Process-wide metrics in Prometheus text format (GET /metrics), without a client library.
+
+Every worker has its own registry: Prometheus scrapes each worker, like /cache/stats.
+Metrics are only touched from the event loop, no locks. An observation is a dict lookup and
+a bisect, cheap enough to stay on in production (METRICS_ENABLED).
+"""
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+    if extra:
+        pairs.append(extra)
+
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Responsibility: A monotonically increasing count per label values
+    """
+    TYPE = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labels: tuple[str, ...] = tuple(labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def get(self, *values: str) -> float:
+        return self._values.get(values, 0)
+
+    def samples(self) -> list[str]:
+        return [f'{self.name}{_format_labels(self.labels, values)} {_format_value(value)}'
+                for values, value in self._values.items()]
+
+
+class Histogram:
+    """
+    Responsibility: Distribution of observed values (seconds) per label values, in cumulative buckets
+    """
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labels: tuple[str, ...] = tuple(labels)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # Per label values: [count per bucket (the last one is +Inf), sum]
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *values: str) -> None:
+        series = self._values.get(values)
+
+        if series is None:
+            series = self._values[values] = [[0] * (len(self.buckets) + 1), 0.0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *values: str) -> int:
+        series = self._values.get(values)
+
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+
+        for values, (counts, total) in self._values.items():
+            cumulative = 0
+
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(float(bound))
+                labels = _format_labels(self.labels, values, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, values)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, values)} {cumulative}')
+
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Responsibility: Own the metrics of the process and render them in Prometheus text format
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+            lines.extend(metric.samples())
+
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+
+        self._metrics[metric.name] = metric
+
+        return metric
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds',
+    'Time to the end of the response, by route template',
+    labels=('method', 'route', 'status'),
+)
+stage_duration = registry.histogram(
+    'stage_duration_seconds',
+    'Time spent in a service or repository call. Nested: a service call includes the repository calls it makes',
+    labels=('component', 'operation'),
+)
+translation_lookups = registry.counter(
+    'translation_lookups_total',
+    'Lookups by scenario: cache, db, coalesced (shared an in-flight lookup), lease (stored by another worker), '
+    'derived (reverse index), new_language, new_word, same_languages (rejected), '
+    'stale (served, refreshed in the background), expired (refreshed before serving)',
+    labels=('scenario',),
+)
+auto_resolutions = registry.counter(
+    'auto_resolutions_total',
+    'sl=auto lookups by resolution: resolved (served as the stored source language), unknown, ambiguous',
+    labels=('result',),
+)
+index_errors = registry.counter(
+    'index_errors_total',
+    'Failed index creations on startup (MONGO_ENSURE_INDEXES), by exception type. The worker serves without them',
+    labels=('error',),
+)
+upstream_errors = registry.counter(
+    'upstream_errors_total',
+    'Failed Google Translate attempts (retried ones included) and rejected calls, by exception type',
+    labels=('error',),
+)
+
+
+def instrumented(component: str):
+    """
+    Class decorator: every public method (coroutines and plain functions) is timed in stage_duration,
+    labelled with component and the method name. Errors are timed too.
+    Async generators, functions returning async iterators (the time to create one tells nothing),
+    static and class methods are left as they are. No-op if METRICS_ENABLED is off.
+    """
+    def decorate(cls):
+        if not settings.METRICS_ENABLED:
+            return cls
+
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith('_') or not inspect.isfunction(attribute) or _is_async_iteration(attribute):
+                continue
+
+            setattr(cls, name, _timed(attribute, component, name))
+
+        return cls
+
+    return decorate
+
+
+def _is_async_iteration(fn) -> bool:
+    if inspect.isasyncgenfunction(fn):
+        return True
+
+    try:
+        returns = typing.get_type_hints(fn).get('return')
+    except Exception as e:
+        # Unresolvable annotations: timed
+        return False
+
+    return typing.get_origin(returns) in (collections.abc.AsyncIterator, collections.abc.AsyncIterable,
+                                          collections.abc.AsyncGenerator)
+
+
+def _timed(fn, component: str, operation: str):
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                stage_duration.observe(time.perf_counter() - started_at, component, operation)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stage_duration.observe(time.perf_counter() - started_at, component, operation)
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    Responsibility: Time every HTTP request into http_request_duration (pure ASGI, streaming safe).
+
+    Labelled by the route template (/v1/translations/{word}), not the path: one series per route.
+    Requests that matched no route are labelled "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        started_at = time.perf_counter()
+        status = ['500']
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status[0] = str(message['status'])
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get('route')
+            http_request_duration.observe(time.perf_counter() - started_at, scope['method'],
+                                          getattr(route, 'path', 'unmatched'), status[0])
@@ -0,0 +1,90 @@
+import zlib
+
+from typing import AsyncIterable, AsyncIterator
+
+import orjson
+
+from app.v1.core.exceptions import LineTooLongException
+
+"""
+Streaming NDJSON (one JSON document per line), optionally gzipped.
+Memory is bounded by one chunk and one line, not by the size of the stream: compressed chunks are inflated
+piece by piece, lines longer than max_line_size are rejected (a decompression bomb is one huge line).
+"""
+
+GZIP_WBITS = 31
+# Reading: gzip or zlib, detected from the header
+AUTO_WBITS = 47
+
+
+async def dump_lines(documents: AsyncIterable[dict], gzip: bool = False,
+                     chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """
+    Documents to NDJSON, yielded in chunks of about chunk_size bytes rather than line by line
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS) if gzip else None
+    buffer = bytearray()
+
+    async for document in documents:
+        buffer += orjson.dumps(document)
+        buffer += b'\n'
+
+        if len(buffer) >= chunk_size:
+            chunk = compressor.compress(buffer) if compressor else bytes(buffer)
+            buffer.clear()
+
+            if chunk:
+                yield chunk
+
+    chunk = compressor.compress(buffer) + compressor.flush() if compressor else bytes(buffer)
+
+    if chunk:
+        yield chunk
+
+
+async def load_lines(chunks: AsyncIterable[bytes], gzip: bool = False, max_line_size: int = 1024 * 1024,
+                     chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """
+    Non-empty lines of an NDJSON stream, whatever the chunk boundaries are.
+    Compressed chunks are inflated chunk_size bytes at a time.
+    Raises LineTooLongException on a line longer than max_line_size bytes
+    """
+    rest = b''
+
+    async for data in _inflate(chunks, zlib.decompressobj(wbits=AUTO_WBITS) if gzip else None, chunk_size):
+        *lines, rest = (rest + data).split(b'\n')
+
+        for line in lines:
+            if line.strip():
+                yield _checked(line, max_line_size)
+
+        _checked(rest, max_line_size)
+
+    if rest.strip():
+        yield rest
+
+
+async def _inflate(chunks: AsyncIterable[bytes], decompressor, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    At most chunk_size bytes of output per decompress call: the input left is kept in unconsumed_tail
+    """
+    async for chunk in chunks:
+        if decompressor is None:
+            yield chunk
+            continue
+
+        data = decompressor.decompress(chunk, chunk_size)
+
+        while data:
+            yield data
+            data = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+
+    if decompressor is not None:
+        yield decompressor.flush()
+
+
+def _checked(line: bytes, max_line_size: int) -> bytes:
+    if len(line) > max_line_size:
+        raise LineTooLongException(f'Lines are limited to {max_line_size} bytes')
+
+    return line
@@ -0,0 +1,34 @@
+import unicodedata
+
+# Languages whose dotted and dotless i don't casefold like the rest: I -> ı, İ -> i
+DOTLESS_I_LANGUAGES = ('tr', 'az')
+DOTLESS_I_TABLE = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+
+def clean_word(word: str) -> str:
+    """
+    The spelling of a word as stored and sent to Google: NFKC, trimmed, inner whitespace collapsed. Case is kept
+    """
+    return ' '.join(unicodedata.normalize('NFKC', word).split())
+
+
+def normalize_word(word: str, language: str | None = None) -> str:
+    """
+    Canonical key of a word, stored next to the original spelling as "normalizedWord".
+    Case, Unicode (NFC/NFD, compatibility forms) and whitespace variants share one key, and so one stored entry.
+    Casefolded with the rules of the language if it has its own (sl), language-neutral otherwise (auto, prefixes).
+    Idempotent: a key normalizes to itself
+    """
+    word = clean_word(word)
+
+    if language in DOTLESS_I_LANGUAGES:
+        word = word.translate(DOTLESS_I_TABLE)
+
+    return unicodedata.normalize('NFKC', word.casefold())
+
+
+def normalized_variants(word: str) -> set[str]:
+    """
+    The keys of a word under every casefolding rule, for lookups without a language (delete, cache invalidation)
+    """
+    return {normalize_word(word), *(normalize_word(word, language) for language in DOTLESS_I_LANGUAGES)}
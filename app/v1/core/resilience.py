@@ -0,0 +1,236 @@
+import asyncio
+import random
+import time
+
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from app.v1.core.exceptions import UpstreamUnavailableException
+from app.v1.core.metrics import upstream_errors
+
+T = TypeVar('T')
+
+
+class TokenBucket:
+    """
+    Responsibility: Limit the rate of calls. Refills "rate" tokens per second up to "capacity" (burst).
+    A caller that can't get a token within max_wait is rejected instead of queueing forever.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.clock: Callable[[], float] = clock
+        self._tokens: float = capacity
+        self._updated_at: float = clock()
+
+    async def acquire(self, max_wait: float) -> None:
+        if self.rate <= 0:
+            return
+
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        wait = (1 - self._tokens) / self.rate
+
+        if wait > max_wait:
+            raise UpstreamUnavailableException(f'Rate limit exceeded, retry in {wait:.2f}s')
+
+        # Reserve the token now, so concurrent callers queue up behind us
+        self._tokens -= 1
+        await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Responsibility: Fail fast while the upstream is unhealthy.
+
+    - closed: calls pass, failure_threshold consecutive failures open the circuit
+    - open: calls are rejected for recovery_timeout seconds
+    - half-open: one trial call passes, its success closes the circuit, its failure opens it again
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+        self.clock: Callable[[], float] = clock
+        self.failures: int = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight: bool = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+
+        if self.clock() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+
+        return self.OPEN
+
+    def before_call(self) -> None:
+        state = self.state
+
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_in_flight):
+            raise UpstreamUnavailableException('Upstream is unavailable, circuit is open')
+
+        if state == self.HALF_OPEN:
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+
+        self._trial_in_flight = False
+
+    def record_ignored(self) -> None:
+        """
+        The call ended with an error that says nothing about upstream health (e.g. bad input), or was cancelled
+        """
+        self._trial_in_flight = False
+
+
+class RecentCalls:
+    """
+    Responsibility: Outcome and latency of the calls of the last window seconds, for health checks.
+    At most max_samples calls are kept: under heavy load the window is shorter.
+    """
+
+    def __init__(self, window: float, max_samples: int = 1000, clock: Callable[[], float] = time.monotonic):
+        self.window: float = window
+        self.clock: Callable[[], float] = clock
+        self._calls: deque[tuple[float, float, bool]] = deque(maxlen=max_samples)
+
+    def record(self, latency: float, failed: bool) -> None:
+        self._calls.append((self.clock(), latency, failed))
+
+    def stats(self) -> dict:
+        expired_at = self.clock() - self.window
+
+        while self._calls and self._calls[0][0] <= expired_at:
+            self._calls.popleft()
+
+        if not self._calls:
+            return {'calls': 0, 'errorRate': 0.0, 'latencyP50': 0.0, 'latencyP95': 0.0}
+
+        latencies = sorted(latency for _, latency, _ in self._calls)
+        failures = sum(failed for _, _, failed in self._calls)
+
+        return {
+            'calls': len(latencies),
+            'errorRate': failures / len(latencies),
+            'latencyP50': latencies[len(latencies) // 2],
+            'latencyP95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        }
+
+
+class UpstreamPolicy:
+    """
+    Responsibility: Call an upstream with rate limiting, retries and a circuit breaker.
+
+    Only transient errors (is_transient) are retried, with exponential backoff and full jitter,
+    and count as circuit breaker failures. Other errors are raised straight away.
+    recent_calls: latency (retries included) and outcome of the recent calls that reached the upstream
+    Every failed attempt and rejected call is counted in upstream_errors by exception type
+    """
+
+    def __init__(self, rate_limiter: TokenBucket, circuit_breaker: CircuitBreaker,
+                 is_transient: Callable[[Exception], bool],
+                 rate_limit_max_wait: float, retry_attempts: int, retry_base_delay: float, retry_max_delay: float,
+                 recent_calls: RecentCalls | None = None):
+        self.rate_limiter: TokenBucket = rate_limiter
+        self.circuit_breaker: CircuitBreaker = circuit_breaker
+        self.is_transient: Callable[[Exception], bool] = is_transient
+        self.rate_limit_max_wait: float = rate_limit_max_wait
+        self.retry_attempts: int = retry_attempts
+        self.retry_base_delay: float = retry_base_delay
+        self.retry_max_delay: float = retry_max_delay
+        self.recent_calls: RecentCalls = recent_calls or RecentCalls(window=60)
+
+        self.calls: int = 0
+        self.successes: int = 0
+        self.failures: int = 0
+        self.retries: int = 0
+        self.rejected: int = 0
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+
+        try:
+            self.circuit_breaker.before_call()
+        except UpstreamUnavailableException as e:
+            self.rejected += 1
+            upstream_errors.inc(type(e).__name__)
+            raise
+
+        attempt = 0
+        started_at = self.recent_calls.clock()
+
+        try:
+            while True:
+                try:
+                    await self.rate_limiter.acquire(self.rate_limit_max_wait)
+                    result = await fn()
+                except UpstreamUnavailableException as e:
+                    self.rejected += 1
+                    self.circuit_breaker.record_ignored()
+                    upstream_errors.inc(type(e).__name__)
+                    raise
+                except Exception as e:
+                    upstream_errors.inc(type(e).__name__)
+
+                    if not self.is_transient(e):
+                        self.failures += 1
+                        self.circuit_breaker.record_ignored()
+                        raise
+
+                    attempt += 1
+
+                    if attempt >= self.retry_attempts:
+                        self.failures += 1
+                        self.circuit_breaker.record_failure()
+                        self.recent_calls.record(self.recent_calls.clock() - started_at, failed=True)
+                        raise
+
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(attempt))
+                else:
+                    self.successes += 1
+                    self.circuit_breaker.record_success()
+                    self.recent_calls.record(self.recent_calls.clock() - started_at, failed=False)
+
+                    return result
+        except asyncio.CancelledError:
+            # Cancelled (client gone, timeout): says nothing about upstream health,
+            # but a cancelled half-open trial must not keep rejecting every later call
+            self.circuit_breaker.record_ignored()
+            raise
+
+    def stats(self) -> dict:
+        return {
+            'circuitState': self.circuit_breaker.state,
+            'calls': self.calls,
+            'successes': self.successes,
+            'failures': self.failures,
+            'retries': self.retries,
+            'rejected': self.rejected,
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1)))
@@ -0,0 +1,58 @@
+import asyncio
+
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Responsibility: Coalesce concurrent calls with the same key into one in-flight call.
+    The first caller runs the function; everybody arriving while it runs awaits the same result or exception.
+    A cancelled caller's cancellation isn't shared: if the running one is cancelled, its waiters call again,
+    the first of them runs the function
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+
+        while future is not None:
+            try:
+                # Shielded, so a cancelled waiter doesn't cancel the call for everybody else
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    # This waiter was cancelled
+                    raise
+
+            # The running one was cancelled: call again, or run it if nobody did yet
+            future = self._calls.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark as retrieved, there might be no waiters at all
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,170 @@
+import zlib
+
+import orjson
+
+from bson import Binary
+
+from app.v1.core.config import CommonSettings
+
+# Short field names of the compact format, per sub-document
+LANGUAGE_FIELDS = {
+    'text': 't',
+    'confidence': 'c',
+    'pronunciation': 'p',
+    'definitions': 'd',
+    'examples': 'e',
+    'translations': 'r',
+}
+DEFINITION_FIELDS = {
+    'definition': 'd',
+    'example': 'e',
+    'synonyms': 's',
+    'context': 'c',
+}
+TRANSLATION_FIELDS = {
+    'text': 't',
+    'translations': 'r',
+    'confidence': 'c',
+}
+# Dropped fields are read back as None, these ones as [] (and stored as null when None): exact round trip
+LANGUAGE_LISTS = {'examples'}
+DEFINITION_LISTS = {'synonyms'}
+TRANSLATION_LISTS = {'translations'}
+
+COMPRESSORS = {
+    'zlib': (zlib.compress, zlib.decompress),
+}
+
+
+class DocumentCodec:
+    """
+    Responsibility: Map stored languages ("languages.<tl>" of a translation) to and from the storage format.
+
+    Formats of a stored language:
+    - full: the fields of the Language model as is
+    - compact: short field names (LANGUAGE_FIELDS etc.), fields of the value they're read back as dropped:
+      None, [] for the list fields (LANGUAGE_LISTS etc.). Decoded to exactly the language encoded
+    - compressed: compact, serialized and compressed into one binary field, {"z": <compressor>, "b": <bytes>}.
+      Only languages of at least compression_min_size bytes, small ones don't pay off. Compact only
+
+    Only the languages are encoded: word, language and normalizedWord stay as is for queries and indexes,
+    "languages.<tl>" stays addressable for targeted $set and projections.
+    Writes use the configured format, reads decode every format: documents of different formats
+    can live in one collection, switching the format needs no downtime (see commands/compact.py).
+    """
+
+    def __init__(self, compact: bool = False, compression: str = 'none', compression_min_size: int = 1024,
+                 compression_level: int = 6):
+        if compression != 'none' and compression not in COMPRESSORS:
+            raise ValueError(f'Unknown compression: {compression}')
+
+        if compression != 'none' and not compact:
+            raise ValueError(f'Compression ({compression}) needs the compact storage format')
+
+        self.compact: bool = compact
+        self.compression: str = compression
+        self.compression_min_size: int = compression_min_size
+        self.compression_level: int = compression_level
+
+    @classmethod
+    def from_settings(cls, settings: CommonSettings) -> 'DocumentCodec':
+        return cls(
+            compact=settings.TRANSLATION_STORAGE_FORMAT == 'compact',
+            compression=settings.TRANSLATION_COMPRESSION,
+            compression_min_size=settings.TRANSLATION_COMPRESSION_MIN_SIZE,
+            compression_level=settings.TRANSLATION_COMPRESSION_LEVEL,
+        )
+
+    def encode_word(self, word: dict) -> dict:
+        if not self.compact or not word.get('languages'):
+            return word
+
+        return {**word, 'languages': {tl: self.encode_language(data) for tl, data in word['languages'].items()}}
+
+    def decode_word(self, document: dict) -> dict:
+        languages = document.get('languages')
+
+        if languages:
+            document['languages'] = {tl: self.decode_language(data) for tl, data in languages.items()}
+
+        return document
+
+    def encode_update(self, data: dict) -> dict:
+        """
+        $set of a stored word: "languages.<tl>" values are encoded, the rest is sent as is
+        """
+        return {
+            path: self.encode_language(value) if path.startswith('languages.') else value
+            for path, value in data.items()
+        }
+
+    def encode_language(self, language: dict) -> dict:
+        if not self.compact:
+            return language
+
+        compact = self._compact(language, LANGUAGE_FIELDS, LANGUAGE_LISTS)
+
+        if language.get('definitions'):
+            compact['d'] = {
+                part_of_speech: [self._compact(row, DEFINITION_FIELDS, DEFINITION_LISTS) for row in rows]
+                for part_of_speech, rows in language['definitions'].items()
+            }
+
+        if language.get('translations'):
+            compact['r'] = {
+                part_of_speech: [self._compact(row, TRANSLATION_FIELDS, TRANSLATION_LISTS) for row in rows]
+                for part_of_speech, rows in language['translations'].items()
+            }
+
+        if self.compression == 'none':
+            return compact
+
+        serialized = orjson.dumps(compact)
+
+        if len(serialized) < self.compression_min_size:
+            return compact
+
+        compress, _ = COMPRESSORS[self.compression]
+
+        return {'z': self.compression, 'b': Binary(compress(serialized, self.compression_level))}
+
+    def decode_language(self, stored: dict) -> dict:
+        if 'text' in stored:
+            # Full format
+            return stored
+
+        if 'b' in stored:
+            _, decompress = COMPRESSORS[stored['z']]
+            stored = orjson.loads(decompress(stored['b']))
+
+        language = self._expand(stored, LANGUAGE_FIELDS, LANGUAGE_LISTS)
+
+        if language['definitions']:
+            language['definitions'] = {
+                part_of_speech: [self._expand(row, DEFINITION_FIELDS, DEFINITION_LISTS) for row in rows]
+                for part_of_speech, rows in language['definitions'].items()
+            }
+
+        if language['translations']:
+            language['translations'] = {
+                part_of_speech: [self._expand(row, TRANSLATION_FIELDS, TRANSLATION_LISTS) for row in rows]
+                for part_of_speech, rows in language['translations'].items()
+            }
+
+        return language
+
+    @staticmethod
+    def _compact(data: dict, fields: dict[str, str], lists: set[str]) -> dict:
+        compact = {}
+
+        for field, short in fields.items():
+            default = [] if field in lists else None
+
+            if data.get(field, default) != default:
+                compact[short] = data[field]
+
+        return compact
+
+    @staticmethod
+    def _expand(data: dict, fields: dict[str, str], lists: set[str]) -> dict:
+        return {field: data.get(short, [] if field in lists else None) for field, short in fields.items()}
@@ -0,0 +1,85 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+"""
+Indexes the app relies on, per collection. Declared here, ensured on startup (idempotent).
+"""
+
+INDEXES: dict[str, list[IndexModel]] = {
+    'translations': [
+        # Lookups, upserts and deletes by canonical key, sorting in get_list_of_words (prefix).
+        # Unique: case and Unicode variants are one document, add_new_word can't create duplicates.
+        # Merge the duplicates stored before first: python -m app.v1.commands.normalize --all --merge
+        IndexModel([('normalizedWord', ASCENDING), ('language', ASCENDING)], name='normalizedWord_language_unique',
+                   unique=True),
+        # Prefix search and keyset pagination in get_list_of_words_by_prefix, both sort directions
+        IndexModel([('normalizedWord', ASCENDING), ('_id', ASCENDING)], name='normalizedWord_id'),
+    ],
+    'translationAccess': [
+        # Counters are upserted by key
+        IndexModel([('word', ASCENDING), ('sl', ASCENDING), ('tl', ASCENDING)], name='word_sl_tl_unique', unique=True),
+        # Top-N keys for the cache warm-up
+        IndexModel([('count', DESCENDING)], name='count_desc'),
+    ],
+    'translationSourceLanguages': [
+        # Detected languages are upserted and read by word (sl=auto resolution)
+        IndexModel([('word', ASCENDING)], name='word_unique', unique=True),
+    ],
+    'translationReverse': [
+        # Derived words are upserted and read by key (reverse index)
+        IndexModel([('normalizedWord', ASCENDING), ('language', ASCENDING), ('tl', ASCENDING)],
+                   name='normalizedWord_language_tl_unique', unique=True),
+    ],
+    'translationLeases': [
+        # Expired leases are removed by MongoDB
+        IndexModel([('expiresAt', ASCENDING)], name='expiresAt_ttl', expireAfterSeconds=0),
+    ],
+}
+
+
+# Indexes declared before, dropped by ensure_indexes
+OBSOLETE_INDEXES: dict[str, list[str]] = {
+    # Covered by normalizedWord_language_unique: every lookup is by canonical key
+    'translations': ['word_language_unique'],
+}
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> dict[str, list[str]]:
+    """
+    Create declared indexes and drop the obsolete ones. Existing identical indexes are left as they are.
+    Returns created (or already existing) index names per collection.
+    """
+    result = {}
+
+    for collection, indexes in INDEXES.items():
+        result[collection] = await db[collection].create_indexes(indexes)
+
+    for collection, names in OBSOLETE_INDEXES.items():
+        existing = await db[collection].index_information()
+
+        for name in names:
+            if name in existing:
+                await db[collection].drop_index(name)
+
+    return result
+
+
+async def get_index_stats(db: AsyncIOMotorDatabase) -> dict[str, list[dict]]:
+    """
+    Index usage per collection, via $indexStats. Counters reset on mongod restart.
+    """
+    result = {}
+
+    for collection in INDEXES:
+        stats = await db[collection].aggregate([{'$indexStats': {}}]).to_list(length=None)
+        result[collection] = [
+            {
+                'name': index['name'],
+                'key': index['key'],
+                'ops': index['accesses']['ops'],
+                'since': index['accesses']['since'],
+            }
+            for index in stats
+        ]
+
+    return result
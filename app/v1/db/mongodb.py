@@ -1,9 +1,108 @@
+import threading
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.monitoring import ConnectionPoolListener
+
+from app.v1.core.config import CommonSettings
+
+
+class PoolStats(ConnectionPoolListener):
+    """
+    Responsibility: Connection pool usage of the client, counted from pymongo pool events.
+
+    Summed over the servers of the deployment, "available" is against max_pool_size (per server):
+    exact for a single server or the primary-only traffic of this app.
+    Events come from the driver threads, hence the lock.
+    """
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size: int = max_pool_size
+        self.open: int = 0
+        self.in_use: int = 0
+        self.waiting: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            'open': self.open,
+            'inUse': self.in_use,
+            'available': max(0, self.max_pool_size - self.in_use),
+            'waiting': self.waiting,
+            'maxSize': self.max_pool_size,
+        }
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.open -= 1
+
+    def connection_check_out_started(self, event) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            self.waiting -= 1
+
+    def connection_checked_out(self, event) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.in_use += 1
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
 
 
 class MongoDB:
-    def __init__(self, client: AsyncIOMotorClient, uri: str):
-        self.client: AsyncIOMotorClient = client(uri)
+    """
+    Responsibility: Own the process-wide Motor client and its connection pool.
+    Created once on application startup and closed on shutdown.
+    """
+
+    def __init__(self, client: type[AsyncIOMotorClient], uri: str, pool_stats: PoolStats | None = None, **options):
+        self.pool_stats: PoolStats | None = pool_stats
+
+        if pool_stats is not None:
+            options['event_listeners'] = [pool_stats]
+
+        self.client: AsyncIOMotorClient = client(uri, **options)
+
+    @classmethod
+    def from_settings(cls, client: type[AsyncIOMotorClient], settings: CommonSettings) -> 'MongoDB':
+        return cls(
+            client,
+            settings.MONGO_URL,
+            pool_stats=PoolStats(settings.MONGO_MAX_POOL_SIZE),
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        )
 
     def get_database(self, db: str) -> AsyncIOMotorDatabase:
         return self.client.get_database(db)
+
+    def close(self) -> None:
+        self.client.close()
@@ -1,26 +1,198 @@
-from fastapi import Depends
+from aiogoogletrans import Translator
+from fastapi import Depends, Request
+from starlette.datastructures import State
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.v1.cache.translation import ITranslationCache
+from app.v1.core.background import TaskSet
 from app.v1.core.config import settings
+from app.v1.core.loop import LoopLagMonitor
+from app.v1.core.resilience import UpstreamPolicy
+from app.v1.core.singleflight import SingleFlight
 from app.v1.db.mongodb import MongoDB
-from app.v1.repositories.translation import TranslationRepository, ITranslation
+from app.v1.repositories.access import AccessStatsRepository
+from app.v1.repositories.lease import ILease
+from app.v1.repositories.reverse_index import IReverseIndex
+from app.v1.repositories.source_language import ISourceLanguage
+from app.v1.repositories.translation import ITranslation
+from app.v1.services.access import AccessRecorder
+from app.v1.services.google_translate import GoogleTranslateService
+from app.v1.services.health import HealthService
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.refresh import TranslationRefresher
+from app.v1.services.reverse_index import ReverseIndexRecorder, ReverseIndexService
+from app.v1.services.source_language import SourceLanguageService
 from app.v1.services.translation import TranslationService
+from app.v1.services.warmup import WarmupService
+from app.v1.services.write_behind import WriteBehindQueue
 
 """
 The naming is self-explanatory. Skipped documentation.
+Providers are coroutines: FastAPI runs plain functions in the threadpool, a thread hop per dependency per request.
 """
 
 
-def get_mongo_db() -> AsyncIOMotorDatabase:
-    mongo_db = MongoDB(AsyncIOMotorClient, settings.MONGO_URL)
+async def get_mongo_db(request: Request) -> AsyncIOMotorDatabase:
+    mongo_db: MongoDB = request.app.state.mongodb
 
     return mongo_db.get_database(settings.MONGO_DB)
 
 
-def get_translation_repository(db=Depends(get_mongo_db)) -> ITranslation:
-    return TranslationRepository(db)
+async def get_translation_repository(request: Request) -> ITranslation:
+    return request.app.state.translation_repository
 
 
-def get_translation_service(repo=Depends(get_translation_repository)) -> TranslationService:
-    return TranslationService(repo)
+async def get_lease_repository(request: Request) -> ILease:
+    return request.app.state.lease_repository
+
+
+async def get_translation_cache(request: Request) -> ITranslationCache:
+    return request.app.state.translation_cache
+
+
+async def get_write_behind_queue(request: Request) -> WriteBehindQueue | None:
+    return request.app.state.write_behind
+
+
+async def get_translation_service(repo=Depends(get_translation_repository),
+                                  cache=Depends(get_translation_cache),
+                                  write_behind=Depends(get_write_behind_queue)) -> TranslationService:
+    return TranslationService(repo, cache, write_behind)
+
+
+async def get_translator(request: Request) -> Translator:
+    return request.app.state.translator
+
+
+async def get_upstream_policy(request: Request) -> UpstreamPolicy:
+    return request.app.state.upstream_policy
+
+
+async def get_google_translate_service(translator=Depends(get_translator),
+                                       policy=Depends(get_upstream_policy)) -> GoogleTranslateService:
+    return GoogleTranslateService(translator, policy)
+
+
+async def get_single_flight(request: Request) -> SingleFlight:
+    return request.app.state.single_flight
+
+
+async def get_lease_service(repo=Depends(get_lease_repository)) -> LeaseService:
+    return LeaseService(
+        repo,
+        ttl=settings.TRANSLATION_LEASE_TTL,
+        poll_interval=settings.TRANSLATION_LEASE_POLL_INTERVAL,
+        wait_timeout=settings.TRANSLATION_LEASE_WAIT_TIMEOUT,
+    )
+
+
+async def get_loop_monitor(request: Request) -> LoopLagMonitor:
+    return request.app.state.loop_monitor
+
+
+async def get_health_service(request: Request,
+                             db=Depends(get_mongo_db),
+                             policy=Depends(get_upstream_policy),
+                             cache=Depends(get_translation_cache),
+                             loop_monitor=Depends(get_loop_monitor)) -> HealthService:
+    return HealthService(
+        db,
+        request.app.state.mongodb.pool_stats,
+        policy,
+        cache,
+        loop_monitor,
+        ping_timeout=settings.HEALTH_MONGO_PING_TIMEOUT,
+        max_ping_latency=settings.HEALTH_MONGO_MAX_LATENCY,
+        max_pool_usage=settings.HEALTH_MONGO_MAX_POOL_USAGE,
+        upstream_required=settings.HEALTH_UPSTREAM_REQUIRED,
+        upstream_min_calls=settings.HEALTH_UPSTREAM_MIN_CALLS,
+        max_upstream_error_rate=settings.HEALTH_UPSTREAM_MAX_ERROR_RATE,
+        max_upstream_latency=settings.HEALTH_UPSTREAM_MAX_LATENCY,
+        max_loop_lag=settings.HEALTH_MAX_LOOP_LAG,
+        index_error=request.app.state.index_error,
+        indexes_required=settings.HEALTH_INDEXES_REQUIRED,
+    )
+
+
+async def get_access_recorder(request: Request) -> AccessRecorder | None:
+    return request.app.state.access_recorder
+
+
+async def get_source_language_repository(request: Request) -> ISourceLanguage:
+    return request.app.state.source_language_repository
+
+
+async def get_source_language_service(repo=Depends(get_source_language_repository)) -> SourceLanguageService | None:
+    if not settings.AUTO_SL_RESOLUTION_ENABLED:
+        return None
+
+    return SourceLanguageService(repo, min_count=settings.AUTO_SL_MIN_DETECTIONS, min_share=settings.AUTO_SL_MIN_SHARE)
+
+
+async def get_reverse_index_repository(request: Request) -> IReverseIndex:
+    return request.app.state.reverse_index_repository
+
+
+async def get_reverse_index_recorder(request: Request) -> ReverseIndexRecorder | None:
+    return request.app.state.reverse_index_recorder
+
+
+async def get_background_tasks(request: Request) -> TaskSet | None:
+    return request.app.state.background_tasks
+
+
+async def get_reverse_index_service(repo=Depends(get_reverse_index_repository),
+                                    recorder=Depends(get_reverse_index_recorder),
+                                    background_tasks=Depends(get_background_tasks)) -> ReverseIndexService | None:
+    if not settings.REVERSE_INDEX_ENABLED:
+        return None
+
+    return ReverseIndexService(repo, recorder, background_tasks if settings.REVERSE_INDEX_UPGRADE else None)
+
+
+async def get_translation_refresher(request: Request) -> TranslationRefresher | None:
+    return request.app.state.translation_refresher
+
+
+async def get_translation_lookup_service(translation_service=Depends(get_translation_service),
+                                         google_translate_service=Depends(get_google_translate_service),
+                                         cache=Depends(get_translation_cache),
+                                         single_flight=Depends(get_single_flight),
+                                         lease_service=Depends(get_lease_service),
+                                         access_recorder=Depends(get_access_recorder),
+                                         source_language_service=Depends(get_source_language_service),
+                                         reverse_index_service=Depends(get_reverse_index_service),
+                                         refresher=Depends(get_translation_refresher)) \
+        -> TranslationLookupService:
+    return TranslationLookupService(translation_service, google_translate_service, cache,
+                                    single_flight, lease_service, settings.BATCH_CONCURRENCY, access_recorder,
+                                    source_language_service, reverse_index_service, refresher)
+
+
+async def create_warmup_service(state: State, prefetch_rate: float = settings.WARMUP_PREFETCH_RATE) -> WarmupService:
+    """
+    Outside of a request (lifespan, commands): the same wiring from the application state.
+    Warm-up lookups are not recorded as accesses
+    """
+    db = state.mongodb.get_database(settings.MONGO_DB)
+    source_language_service = await get_source_language_service(state.source_language_repository)
+    translation_service = await get_translation_service(state.translation_repository, state.translation_cache,
+                                                        state.write_behind)
+    lookup_service = await get_translation_lookup_service(
+        translation_service,
+        await get_google_translate_service(state.translator, state.upstream_policy),
+        state.translation_cache,
+        state.single_flight,
+        await get_lease_service(state.lease_repository),
+        access_recorder=None,
+        source_language_service=source_language_service,
+        reverse_index_service=await get_reverse_index_service(state.reverse_index_repository,
+                                                              state.reverse_index_recorder, background_tasks=None),
+        refresher=state.translation_refresher,
+    )
+
+    return WarmupService(translation_service, lookup_service, state.translation_cache, AccessStatsRepository(db),
+                         chunk_size=settings.WARMUP_CHUNK_SIZE, prefetch_rate=prefetch_rate,
+                         source_language_service=source_language_service)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from app.v1.cache.translation import ITranslationCache
+from app.v1.dependencies import get_translation_cache
+from app.v1.schemas import CacheStatsResponse
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+@router.get("/stats", response_model=CacheStatsResponse)
+async def get_cache_stats(cache: ITranslationCache = Depends(get_translation_cache)):
+    """
+    Translation cache counters of this worker. Use hits, misses and evictions to size TRANSLATION_CACHE_MAX_SIZE.
+    l2* counters are the shared tier, if configured (TRANSLATION_CACHE_L2).
+    """
+    return cache.stats()
@@ -1,9 +1,31 @@
-from fastapi import APIRouter
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.v1.dependencies import get_health_service
+from app.v1.services.health import HealthService
 
 router = APIRouter(tags=["healthcheck"])
 
 
 @router.get('/healthcheck')
+@router.get('/healthcheck/live')
 async def healthcheck() -> dict:
-    """ We can implement soon """
+    """
+    Liveness: the worker is up and its event loop answers. Dependencies are not checked,
+    a restart wouldn't fix them. /healthcheck is kept for the existing probes.
+    """
     return {'status': 'OK'}
+
+
+@router.get('/healthcheck/ready')
+async def readiness(health: HealthService = Depends(get_health_service)):
+    """
+    Readiness: 503 if the worker should get no traffic right now (slow or failing Mongo, exhausted pool,
+    failing Google Translate, blocked event loop). Every check is reported with its numbers. See HealthService
+    """
+    result = await health.readiness()
+    status_code = HTTPStatus.OK if result['status'] == HealthService.READY else HTTPStatus.SERVICE_UNAVAILABLE
+
+    return JSONResponse(result, status_code=status_code)
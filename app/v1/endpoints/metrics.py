@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.v1.core.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Metrics of this worker in Prometheus text format: request and per-stage latency histograms,
+    lookups by scenario and upstream errors by type. See app/v1/core/metrics.py
+    """
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
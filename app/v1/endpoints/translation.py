@@ -1,24 +1,102 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import ValidationError
 
-from app.v1.core.exceptions import WordNotFoundException
+from app.v1.core.config import settings
+from app.v1.core.exceptions import AmbiguousSourceLanguageException, InvalidCursorException, LineTooLongException
+from app.v1.core.exceptions import UpstreamUnavailableException, WordNotFoundException
+from app.v1.core.ndjson import dump_lines, load_lines
 
-from app.v1.dependencies import get_translation_service
+from app.v1.dependencies import get_translation_lookup_service, get_translation_service
 from app.v1.models import Word as WordModel
-from app.v1.services.google_translate import GoogleTranslateService
+from app.v1.services.lookup import TranslationLookupService
 from app.v1.services.translation import TranslationService
 from app.v1.schemas import TranslationListResponse, DeleteWordResponse
 from app.v1.schemas import WordRequest, TranslationListRequest
+from app.v1.schemas import TranslationBatchRequest, TranslationBatchResponse
+from app.v1.schemas import TranslationExportRequest, TranslationImportRequest, TranslationImportResponse
 
 router = APIRouter(prefix="/translations", tags=["translations"])
 
 
+@router.post(":batch", response_model=TranslationBatchResponse)
+async def get_words(request: TranslationBatchRequest,
+                    lookup_service: TranslationLookupService = Depends(get_translation_lookup_service)):
+    """
+    Translate many words at once. Same scenarios as GET /translations/{word}, per item.
+
+    Every item gets its own status, so partial failures don't fail the batch.
+    Serialized as is, like GET /translations/{word}
+    """
+    try:
+        items = await lookup_service.get_words([(item.word, item.sl, item.tl) for item in request.items])
+    except Exception as e:
+        # Log the details <here>
+        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                            detail={'message': 'An error occurred while processing the request'})
+
+    succeeded = sum(item.status == TranslationLookupService.STATUS_SUCCESS for item in items)
+
+    return ORJSONResponse(TranslationBatchResponse(
+        meta={
+            'total': len(items),
+            'succeeded': succeeded,
+            'failed': len(items) - succeeded,
+        },
+        data=items
+    ).model_dump())
+
+
+@router.get(":export")
+async def export_words(request: TranslationExportRequest = Depends(),
+                       translation: TranslationService = Depends(get_translation_service)):
+    """
+    Stream every stored word as NDJSON, one document per line (the GET /translations/{word} shape, all languages).
+
+    Streamed from the DB cursor, batch_size documents per round trip: memory doesn't grow with the collection.
+    ?gzip=true compresses the stream (translations.ndjson.gz). Import it back with POST /translations:import
+    """
+    lines = dump_lines(translation.export_words(request.batch_size), request.gzip)
+
+    if request.gzip:
+        return StreamingResponse(lines, media_type='application/gzip',
+                                 headers={'Content-Disposition': 'attachment; filename="translations.ndjson.gz"'})
+
+    return StreamingResponse(lines, media_type='application/x-ndjson',
+                             headers={'Content-Disposition': 'attachment; filename="translations.ndjson"'})
+
+
+@router.post(":import", response_model=TranslationImportResponse)
+async def import_words(http_request: Request, request: TranslationImportRequest = Depends(),
+                       translation: TranslationService = Depends(get_translation_service)):
+    """
+    Upsert words from an NDJSON body (see GET /translations:export), chunk_size words per bulk write.
+
+    The body is parsed line by line as it arrives, it's never loaded as a whole.
+    Gzipped bodies: ?gzip=true or "Content-Encoding: gzip". Invalid lines are skipped and counted in meta.failed.
+    A line longer than TRANSLATION_IMPORT_MAX_LINE_SIZE bytes (decompressed) stops the import,
+    the chunks before it are imported
+    """
+    gzip = request.gzip or http_request.headers.get('content-encoding') == 'gzip'
+    lines = load_lines(http_request.stream(), gzip, max_line_size=settings.TRANSLATION_IMPORT_MAX_LINE_SIZE)
+
+    try:
+        meta = await translation.import_words(lines, request.chunk_size)
+    except LineTooLongException as e:
+        raise HTTPException(status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, detail={'message': str(e)})
+    except Exception as e:
+        # Log the details <here>. Corrupted gzip stream, client disconnect
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
+                            detail={'message': 'The body is not a valid NDJSON stream'})
+
+    return TranslationImportResponse(meta=meta)
+
+
 @router.get("/{word}", response_model=WordModel)
 async def get_word(request: WordRequest = Depends(),
-                   translation_service: TranslationService = Depends(get_translation_service),
-                   google_translate_service: GoogleTranslateService = Depends(GoogleTranslateService)):
+                   lookup_service: TranslationLookupService = Depends(get_translation_lookup_service)):
     """
     Scenarios:
 
@@ -29,42 +107,36 @@ async def get_word(request: WordRequest = Depends(),
     4. Word is not in DB, Google it and add to DB.
     5. sl == tl - Bad request
 
+    tl=es,de,fr: one word with all the target languages. Stored ones are read at once, the missing ones are
+    translated concurrently and stored with one update.
+
+    Hot words are served from an in-process cache. See TranslationLookupService
+
+    The word is served as is with orjson: response_model is only the documented schema.
+    Returning a Response skips FastAPI's validation and serialization of the stored word,
+    it was validated before it was stored.
+
     Improvements:
     - We could have used Events (Event Driven Design) in case of saving/updating the Word in DB.
 
     :param request: WordRequest
         word: Word to translate
         sl: Source Language (Google named it)
-        tl: Target Language (Google named it)
-    :param translation_service: Injecting Translation Service
-    :param google_translate_service: Injecting Google Translate Service
+        tl: Target Language (Google named it), or a comma separated list of them
+    :param lookup_service: Injecting Translation Lookup Service (cache, DB and Google Translate)
 
-    :return: Returns the Word and it's translation in target language
+    :return: Returns the Word and it's translation in target languages
     """
-    word, sl, tl = request.word, request.sl, request.tl
+    word, sl, tls = request.word, request.sl, request.targets
 
     try:
-        translated_word = await translation_service.get_word_from_db(word, sl)
-
-        if translated_word:
-            is_language_available = tl in translated_word.languages
-
-            if is_language_available:
-                return translation_service.get_only_my_language(translated_word, tl)
-
-            google_word = await google_translate_service.get_translated_word(word, sl, tl)
-
-            # Even if raises an exception, we still can return the translation straight from Google Translate
-            await translation_service.add_new_language_to_word(translated_word, tl, google_word.languages[tl])
-
-            return google_word
-
-        google_word = await google_translate_service.get_translated_word(word, sl, tl)
-
-        # We could have used Events (Event Driven Design)
-        await translation_service.add_new_word(google_word)
-
-        return google_word
+        return ORJSONResponse(await lookup_service.get_word_languages(word, sl, tls))
+    except AmbiguousSourceLanguageException as e:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT,
+                            detail={'message': str(e)})
+    except UpstreamUnavailableException as e:
+        raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                            detail={'message': str(e)})
     except ValidationError as e:
         # Log the details <here>
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
@@ -85,7 +157,21 @@ async def get_list_of_words(request: TranslationListRequest = Depends(),
     - Partial by word match
     - Sorting by word
     - Limit and skip
+
+    Fast mode (?mode=fast) for large collections:
+    - Case-insensitive prefix by word match
+    - Sorting by word
+    - Limit and cursor (meta.next of the previous page)
+    - Total count only with ?count=true
     """
+    if request.mode == 'fast':
+        try:
+            return await translation.get_list_of_words_by_prefix(request.limit, request.sort, request.word,
+                                                                 request.cursor, request.count)
+        except InvalidCursorException as e:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
+                                detail={'message': str(e)})
+
     return await translation.get_list_of_words(request.skip, request.limit, request.sort, request.word)
 
 
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.v1.core.resilience import UpstreamPolicy
+from app.v1.dependencies import get_upstream_policy
+from app.v1.schemas import UpstreamStatsResponse
+
+router = APIRouter(prefix="/upstream", tags=["upstream"])
+
+
+@router.get("/stats", response_model=UpstreamStatsResponse)
+async def get_upstream_stats(policy: UpstreamPolicy = Depends(get_upstream_policy)):
+    """
+    Google Translate calls of this worker: circuit state, successes, failures, retries and rejected calls.
+    """
+    return policy.stats()
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel
@@ -30,3 +31,9 @@ class Word(BaseModel):
     language: str | None
     pronunciation: str | None
     languages: dict[str, Language]
+    # When each language was fetched from Google, stamped by the repository if missing. See TranslationRefresher
+    fetchedAt: dict[str, datetime] | None = None
+
+
+# A Word as stored in DB: validated once, before it was stored. Read and served as is, without a model
+WordDocument = dict
@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import DESCENDING, UpdateOne
+from pymongo.results import BulkWriteResult
+
+from app.v1.core.metrics import instrumented
+
+
+class IAccessStats(ABC):
+    """
+    Responsibility: Manage access counters of (word, sl, tl) lookups in DB
+    """
+
+    @abstractmethod
+    async def increment(self, counts: dict[tuple[str, str, str], int], now: datetime) -> BulkWriteResult | None:
+        pass
+
+    @abstractmethod
+    async def get_top(self, limit: int) -> list[tuple[str, str, str]]:
+        pass
+
+
+@instrumented('access_stats_repository')
+class AccessStatsRepository(IAccessStats):
+    """
+    Responsibility: Manage access counters in MongoDB.
+    Document: {'word': word, 'sl': sl, 'tl': tl, 'count': int, 'lastAccessAt': datetime}
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection: AsyncIOMotorCollection = db['translationAccess']
+
+    async def increment(self, counts: dict[tuple[str, str, str], int], now: datetime) -> BulkWriteResult | None:
+        """
+        One unordered bulk write of $inc upserts
+        """
+        requests = [
+            UpdateOne({'word': word, 'sl': sl, 'tl': tl}, {'$inc': {'count': count}, '$set': {'lastAccessAt': now}},
+                      upsert=True)
+            for (word, sl, tl), count in counts.items()
+        ]
+
+        if not requests:
+            return None
+
+        return await self.collection.bulk_write(requests, ordered=False)
+
+    async def get_top(self, limit: int) -> list[tuple[str, str, str]]:
+        """
+        The most requested keys first
+        """
+        projection: dict = {'_id': 0, 'word': 1, 'sl': 1, 'tl': 1}
+        documents = await self.collection.find({}, projection) \
+            .sort('count', DESCENDING) \
+            .limit(limit) \
+            .to_list(length=None)
+
+        return [(document['word'], document['sl'], document['tl']) for document in documents]
@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.results import DeleteResult, InsertOneResult, UpdateResult
+
+from app.v1.core.metrics import instrumented
+
+
+class ILease(ABC):
+    """
+    Responsibility: Manage lease (lock) documents in DB
+    """
+
+    @abstractmethod
+    async def insert_lease(self, key: str, owner: str, expires_at: datetime) -> InsertOneResult:
+        """
+        Raises pymongo.errors.DuplicateKeyError if the lease already exists
+        """
+        pass
+
+    @abstractmethod
+    async def take_over_expired_lease(self, key: str, owner: str, expires_at: datetime,
+                                      now: datetime) -> UpdateResult:
+        pass
+
+    @abstractmethod
+    async def get_lease(self, key: str) -> dict | None:
+        pass
+
+    @abstractmethod
+    async def delete_lease(self, key: str, owner: str) -> DeleteResult:
+        pass
+
+
+@instrumented('lease_repository')
+class LeaseRepository(ILease):
+    """
+    Responsibility: Manage lease documents in MongoDB.
+    Document: {'_id': key, 'owner': owner, 'expiresAt': datetime}
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection: AsyncIOMotorCollection = db['translationLeases']
+
+    async def insert_lease(self, key: str, owner: str, expires_at: datetime) -> InsertOneResult:
+        return await self.collection.insert_one({'_id': key, 'owner': owner, 'expiresAt': expires_at})
+
+    async def take_over_expired_lease(self, key: str, owner: str, expires_at: datetime,
+                                      now: datetime) -> UpdateResult:
+        return await self.collection.update_one(
+            {'_id': key, 'expiresAt': {'$lte': now}},
+            {'$set': {'owner': owner, 'expiresAt': expires_at}}
+        )
+
+    async def get_lease(self, key: str) -> dict | None:
+        return await self.collection.find_one({'_id': key})
+
+    async def delete_lease(self, key: str, owner: str) -> DeleteResult:
+        return await self.collection.delete_one({'_id': key, 'owner': owner})
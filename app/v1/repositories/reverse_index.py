@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult
+
+from app.v1.core.metrics import instrumented
+
+# (normalizedWord, language, tl): a word in language, answered in tl
+ReverseKey = tuple[str, str, str]
+
+
+class IReverseIndex(ABC):
+    """
+    Responsibility: Manage the reverse index (tl -> sl answers derived from stored translations) in DB
+    """
+
+    @abstractmethod
+    async def add(self, entries: dict[ReverseKey, dict], now: datetime) -> BulkWriteResult | None:
+        pass
+
+    @abstractmethod
+    async def get_words(self, keys: list[ReverseKey]) -> dict[ReverseKey, dict]:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> DeleteResult:
+        pass
+
+
+@instrumented('reverse_index_repository')
+class ReverseIndexRepository(IReverseIndex):
+    """
+    Responsibility: Manage the reverse index in MongoDB, one document per (normalizedWord, language, tl).
+    Document: {'normalizedWord': str, 'language': str, 'tl': str, 'word': spelling,
+               'sources': [words of tl it translates], 'entries': [{'pos': str | None, 'text': str}],
+               'updatedAt': datetime}
+    Sources and entries are sets ($addToSet): recording a translation again doesn't grow them.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection: AsyncIOMotorCollection = db['translationReverse']
+
+    async def add(self, entries: dict[ReverseKey, dict], now: datetime) -> BulkWriteResult | None:
+        """
+        One unordered bulk write of upserts. entries: {key: {'word', 'sources', 'entries'}}
+        """
+        requests = [
+            UpdateOne(
+                {'normalizedWord': normalized_word, 'language': language, 'tl': tl},
+                {
+                    '$setOnInsert': {'word': entry['word']},
+                    '$addToSet': {'sources': {'$each': entry['sources']}, 'entries': {'$each': entry['entries']}},
+                    '$set': {'updatedAt': now},
+                },
+                upsert=True
+            )
+            for (normalized_word, language, tl), entry in entries.items()
+        ]
+
+        if not requests:
+            return None
+
+        return await self.collection.bulk_write(requests, ordered=False)
+
+    async def get_words(self, keys: list[ReverseKey]) -> dict[ReverseKey, dict]:
+        """
+        All keys in one query. Unknown keys are left out
+        """
+        if not keys:
+            return {}
+
+        query = {'$or': [{'normalizedWord': normalized_word, 'language': language, 'tl': tl}
+                         for normalized_word, language, tl in dict.fromkeys(keys)]}
+        documents = await self.collection.find(query, {'_id': 0, 'updatedAt': 0}).to_list(length=None)
+
+        return {(document['normalizedWord'], document['language'], document['tl']): document
+                for document in documents}
+
+    async def clear(self) -> DeleteResult:
+        return await self.collection.delete_many({})
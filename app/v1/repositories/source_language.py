@@ -0,0 +1,83 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.results import BulkWriteResult, UpdateResult
+
+from app.v1.core.metrics import instrumented
+
+
+class ISourceLanguage(ABC):
+    """
+    Responsibility: Manage the source languages detected for words (sl=auto resolution) in DB
+    """
+
+    @abstractmethod
+    async def increment(self, word: str, language: str, now: datetime) -> UpdateResult:
+        pass
+
+    @abstractmethod
+    async def get_languages(self, words: list[str]) -> dict[str, dict[str, int]]:
+        pass
+
+    @abstractmethod
+    async def seed(self, pairs: list[tuple[str, str]], now: datetime) -> BulkWriteResult | None:
+        """
+        (word, language) pairs known from elsewhere than a detection. Read only while the word has no detection
+        """
+        pass
+
+
+@instrumented('source_language_repository')
+class SourceLanguageRepository(ISourceLanguage):
+    """
+    Responsibility: Manage detected source languages in MongoDB, one document per word.
+    Document: {'word': word, 'languages': {language: detections}, 'seeds': {language: 1}, 'updatedAt': datetime}
+    Seeds (backfilled stored languages, see commands/source_languages.py) are kept apart from detections:
+    they're read only while the word has no detection, the first detection overrides them
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection: AsyncIOMotorCollection = db['translationSourceLanguages']
+
+    async def increment(self, word: str, language: str, now: datetime) -> UpdateResult:
+        return await self.collection.update_one(
+            {'word': word},
+            {'$inc': {f'languages.{language}': 1}, '$set': {'updatedAt': now}},
+            upsert=True
+        )
+
+    async def get_languages(self, words: list[str]) -> dict[str, dict[str, int]]:
+        """
+        Detections per language of every known word (its seeds if it has none), in one query.
+        Unknown words are left out
+        """
+        if not words:
+            return {}
+
+        documents = await self.collection.find({'word': {'$in': words}},
+                                               {'_id': 0, 'word': 1, 'languages': 1, 'seeds': 1}) \
+            .to_list(length=None)
+
+        return {document['word']: document.get('languages') or document.get('seeds') or {} for document in documents}
+
+    async def seed(self, pairs: list[tuple[str, str]], now: datetime) -> BulkWriteResult | None:
+        """
+        Seed the (word, language) pairs, apart from the detections: detected counts are left as they are
+        """
+        if not pairs:
+            return None
+
+        seeds: dict[str, dict[str, int]] = {}
+
+        for word, language in pairs:
+            seeds.setdefault(word, {})[f'seeds.{language}'] = 1
+
+        requests = [
+            UpdateOne({'word': word}, {'$set': {**languages, 'updatedAt': now}, '$setOnInsert': {'languages': {}}},
+                      upsert=True)
+            for word, languages in seeds.items()
+        ]
+
+        return await self.collection.bulk_write(requests, ordered=False)
@@ -1,11 +1,39 @@
+import base64
+import binascii
+import re
+
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import AsyncIterator
 
+from bson import json_util
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
-from pymongo.results import DeleteResult, InsertOneResult, UpdateResult
+from pymongo import UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertOneResult, UpdateResult
 
+from app.v1.core.exceptions import InvalidCursorException
+from app.v1.core.metrics import instrumented
+from app.v1.core.normalization import normalize_word, normalized_variants
+from app.v1.db.codec import DocumentCodec
 from app.v1.schemas import TranslationListResponse
 
 
+def encode_cursor(normalized_word: str, document_id) -> str:
+    """
+    Opaque keyset pagination token: the sort key of the last document on the page
+    """
+    return base64.urlsafe_b64encode(json_util.dumps([normalized_word, document_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        normalized_word, document_id = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorException(f'Invalid cursor: {cursor}')
+
+    return normalized_word, document_id
+
+
 class ITranslation(ABC):
     """
     Responsibility: Manage translations in DB
@@ -15,10 +43,30 @@ class ITranslation(ABC):
     async def get_word(self, word: str, sl: str) -> dict:
         pass
 
+    @abstractmethod
+    async def get_word_language(self, word: str, sl: str, tl: str) -> dict | None:
+        pass
+
+    @abstractmethod
+    async def get_words(self, keys: list[tuple[str, str]], languages: list[str] | None = None) -> list[dict]:
+        pass
+
+    @abstractmethod
+    def iter_words(self, batch_size: int) -> AsyncIterator[dict]:
+        pass
+
     @abstractmethod
     async def insert_word(self, word: dict) -> InsertOneResult:
         pass
 
+    @abstractmethod
+    async def upsert_word(self, word: dict) -> UpdateResult:
+        pass
+
+    @abstractmethod
+    async def upsert_words(self, words: list[dict]) -> BulkWriteResult:
+        pass
+
     @abstractmethod
     async def delete_word(self, word: str) -> DeleteResult:
         pass
@@ -27,30 +75,168 @@ class ITranslation(ABC):
     async def update_word(self, query: dict, data: dict) -> UpdateResult:
         pass
 
+    @abstractmethod
+    async def save_words(self, words: list[dict], updates: list[tuple[dict, dict]]) -> BulkWriteResult | None:
+        pass
+
+    @abstractmethod
+    async def set_word_language(self, word: str, sl: str, language: str, data: dict) -> UpdateResult:
+        pass
+
+    @abstractmethod
+    async def update_words(self, updates: list[tuple[dict, dict]]) -> BulkWriteResult:
+        pass
+
     @abstractmethod
     async def get_list_of_words(self, skip: int, limit: int, sort: str, word: str) -> TranslationListResponse:
         pass
 
+    @abstractmethod
+    async def get_list_of_words_by_prefix(self, limit: int, sort: str, prefix: str, cursor: str | None,
+                                          with_count: bool) -> TranslationListResponse:
+        pass
+
 
+@instrumented('translation_repository')
 class TranslationRepository(ITranslation):
     """
     Responsibility: Manage translations in MongoDB
+
+    Languages are written in the storage format of the codec and decoded on read, see DocumentCodec.
+    Words are looked up, upserted and deleted by their canonical key (normalizedWord, see normalize_word),
+    any spelling variant finds the stored word. "word" keeps the spelling it was first stored with.
+    Every language written is stamped in "fetchedAt.<tl>" (the time it was fetched if the word has it, now otherwise),
+    and loaded with it
     """
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, codec: DocumentCodec | None = None):
         self.collection: AsyncIOMotorCollection = db['translations']
+        self.codec: DocumentCodec = codec or DocumentCodec()
 
     async def get_word(self, word: str, sl: str) -> dict:
-        return await self.collection.find_one({"word": word, 'language': sl})
+        word = await self.collection.find_one(self._key(word, sl))
+
+        return self.codec.decode_word(word) if word else word
+
+    async def get_word_language(self, word: str, sl: str, tl: str) -> dict | None:
+        """
+        The word with only one language loaded: "languages" is {tl: ...} or {} if tl is not stored yet.
+        None if the word itself is not stored.
+        """
+        projection: dict = {
+            '_id': 0,
+            'word': 1,
+            'language': 1,
+            'pronunciation': 1,
+            f'languages.{tl}': 1,
+            f'fetchedAt.{tl}': 1,
+        }
+        word = await self.collection.find_one(self._key(word, sl), projection)
+
+        if word is not None:
+            word.setdefault('languages', {})
+            self.codec.decode_word(word)
+
+        return word
+
+    async def get_words(self, keys: list[tuple[str, str]], languages: list[str] | None = None) -> list[dict]:
+        """
+        Fetch many (word, language) pairs in one query: one $in per language, joined with $or.
+        With "languages" only those target languages are loaded.
+        """
+        if not keys:
+            return []
+
+        words_by_language: dict[str, set[str]] = {}
+
+        for word, language in keys:
+            words_by_language.setdefault(language, set()).add(normalize_word(word, language))
+
+        query = {'$or': [
+            {'language': language, 'normalizedWord': {'$in': list(words)}}
+            for language, words in words_by_language.items()
+        ]}
+
+        projection: dict | None = None
+
+        if languages is not None:
+            projection = {'word': 1, 'language': 1, 'pronunciation': 1}
+            projection.update({f'languages.{language}': 1 for language in languages})
+            projection.update({f'fetchedAt.{language}': 1 for language in languages})
+
+        words = await self.collection.find(query, projection).to_list(length=None)
+
+        for word in words:
+            word.setdefault('languages', {})
+            self.codec.decode_word(word)
+
+        return words
+
+    async def iter_words(self, batch_size: int) -> AsyncIterator[dict]:
+        """
+        Every stored word in the full format, streamed from the cursor batch_size documents at a time:
+        memory doesn't grow with the collection
+        """
+        projection: dict = {'_id': 0, 'normalizedWord': 0}
+
+        async for word in self.collection.find({}, projection).batch_size(batch_size):
+            yield self.codec.decode_word(word)
 
     async def insert_word(self, word: dict) -> InsertOneResult:
-        return await self.collection.insert_one(word)
+        word = self.codec.encode_word(word)
+        word['fetchedAt'] = self._fetched_at(word)
+
+        return await self.collection.insert_one(self._with_normalized_word(word))
+
+    async def upsert_word(self, word: dict) -> UpdateResult:
+        """
+        Insert the word, or add its languages to the stored one. See _upsert_request
+        """
+        query, update = self._upsert_request(word)
+
+        return await self.collection.update_one(query, update, upsert=True)
+
+    async def upsert_words(self, words: list[dict]) -> BulkWriteResult:
+        """
+        Unordered: one failing document doesn't stop the rest
+        """
+        requests = [UpdateOne(*self._upsert_request(word), upsert=True) for word in words]
+
+        return await self.collection.bulk_write(requests, ordered=False)
 
     async def delete_word(self, word: str) -> DeleteResult:
-        return await self.collection.delete_one({"word": word})
+        return await self.collection.delete_one({'normalizedWord': {'$in': list(normalized_variants(word))}})
 
     async def update_word(self, query: dict, data: dict) -> UpdateResult:
-        return await self.collection.update_one(query, {"$set": data})
+        return await self.collection.update_one(self._key_query(query), {"$set": self._stamped_update(data)})
+
+    async def save_words(self, words: list[dict], updates: list[tuple[dict, dict]]) -> BulkWriteResult | None:
+        """
+        Upsert new words and $set fields of stored ones in a single unordered bulk write
+        """
+        requests = [UpdateOne(*self._upsert_request(word), upsert=True) for word in words]
+        requests += [UpdateOne(self._key_query(query), {"$set": self._stamped_update(data)}) for query, data in updates]
+
+        if not requests:
+            return None
+
+        return await self.collection.bulk_write(requests, ordered=False)
+
+    async def set_word_language(self, word: str, sl: str, language: str, data: dict) -> UpdateResult:
+        """
+        Set one language of the word. Other languages are neither read nor sent,
+        concurrent additions of different languages don't overwrite each other
+        """
+        return await self.collection.update_one(
+            self._key(word, sl),
+            {'$set': {f'languages.{language}': self.codec.encode_language(data),
+                      f'fetchedAt.{language}': datetime.now(timezone.utc)}}
+        )
+
+    async def update_words(self, updates: list[tuple[dict, dict]]) -> BulkWriteResult:
+        requests = [UpdateOne(self._key_query(query), {"$set": self._stamped_update(data)}) for query, data in updates]
+
+        return await self.collection.bulk_write(requests, ordered=False)
 
     async def get_list_of_words(self, skip: int = 0, limit: int = 10, sort: str = 'asc',
                                 word: str = '') -> TranslationListResponse:
@@ -77,12 +263,13 @@ class TranslationRepository(ITranslation):
                 'word': {'$regex': regex_pattern, '$options': 'i'}
             }
 
+        # Sorting before $facet lets it walk the normalizedWord_language_unique index instead of sorting in memory
         pipeline: list[dict] = [
             {"$match": query},
+            {"$sort": {"normalizedWord": sort_order}},
             {"$facet": {
                 "totalCount": [{"$count": "count"}],
                 "results": [
-                    {"$sort": {"word": sort_order}},
                     {"$skip": skip},
                     {"$limit": limit},
                     {"$project": projection}
@@ -106,3 +293,108 @@ class TranslationRepository(ITranslation):
             },
             data=words
         )
+
+    async def get_list_of_words_by_prefix(self, limit: int = 10, sort: str = 'asc', prefix: str = '',
+                                          cursor: str | None = None,
+                                          with_count: bool = False) -> TranslationListResponse:
+        """
+        Fast listing. Stays fast on deep pages, unlike get_list_of_words:
+        - Anchored prefix match on normalizedWord: index bounds instead of a collection scan
+        - Keyset pagination on (normalizedWord, _id): meta.next is the cursor of the next page, no $skip
+        - Total count only on demand (with_count), it's the expensive part
+        """
+        sort_order: int = -1 if sort == 'desc' else 1
+        compare: str = '$lt' if sort_order == -1 else '$gt'
+        match: dict = {}
+
+        if prefix:
+            match = {'normalizedWord': {'$regex': f'^{re.escape(normalize_word(prefix))}'}}
+
+        query: dict = match
+
+        if cursor:
+            normalized_word, document_id = decode_cursor(cursor)
+            query = {'$and': [match, {'$or': [
+                {'normalizedWord': {compare: normalized_word}},
+                {'normalizedWord': normalized_word, '_id': {compare: document_id}},
+            ]}]}
+
+        projection: dict = {'word': 1, 'language': 1, 'normalizedWord': 1}
+
+        documents = await self.collection.find(query, projection) \
+            .sort([('normalizedWord', sort_order), ('_id', sort_order)]) \
+            .limit(limit + 1) \
+            .to_list(length=None)
+
+        next_cursor: str | None = None
+
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_cursor(documents[-1]['normalizedWord'], documents[-1]['_id'])
+
+        meta: dict = {
+            'limit': limit,
+            'next': next_cursor,
+        }
+
+        if with_count:
+            meta['totalPages'] = await self.collection.count_documents(match)
+
+        return TranslationListResponse(
+            meta=meta,
+            data=[{'word': document['word'], 'language': document['language']} for document in documents]
+        )
+
+    def _upsert_request(self, word: dict) -> tuple[dict, dict]:
+        """
+        Languages are $set one by one ("languages.<tl>", with "fetchedAt.<tl>"), the rest of the fields only on insert.
+        A word without languages (e.g. imported) is inserted with an empty "languages", MongoDB rejects an empty $set.
+        """
+        query = self._key(word['word'], word['language'])
+        languages = {f'languages.{language}': self.codec.encode_language(data)
+                     for language, data in word['languages'].items()}
+        languages.update({f'fetchedAt.{language}': fetched_at
+                          for language, fetched_at in self._fetched_at(word).items()})
+        fields = self._with_normalized_word({key: value for key, value in word.items()
+                                             if key not in ('languages', 'fetchedAt')})
+
+        if not languages:
+            return query, {'$setOnInsert': {**fields, 'languages': {}}}
+
+        return query, {'$set': languages, '$setOnInsert': fields}
+
+    def _stamped_update(self, data: dict) -> dict:
+        """
+        $set of a stored word: languages encoded and stamped
+        """
+        now = datetime.now(timezone.utc)
+        fetched_at = {f'fetchedAt.{path.split(".", 1)[1]}': now for path in data if path.startswith('languages.')}
+
+        return {**fetched_at, **self.codec.encode_update(data)}
+
+    @staticmethod
+    def _fetched_at(word: dict) -> dict:
+        fetched_at = word.get('fetchedAt') or {}
+        now = datetime.now(timezone.utc)
+
+        return {language: fetched_at.get(language) or now for language in word.get('languages') or {}}
+
+    @staticmethod
+    def _key(word: str, sl: str) -> dict:
+        return {'normalizedWord': normalize_word(word, sl), 'language': sl}
+
+    def _key_query(self, query: dict) -> dict:
+        """
+        {'word', 'language'} queries of the services, by the canonical key
+        """
+        if 'word' not in query:
+            return query
+
+        return {**{key: value for key, value in query.items() if key != 'word'},
+                **self._key(query['word'], query['language'])}
+
+    @staticmethod
+    def _with_normalized_word(word: dict) -> dict:
+        word['normalizedWord'] = normalize_word(word['word'], word['language'])
+
+        return word
@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 
+from app.v1.endpoints.cache import router as cache_router
 from app.v1.endpoints.healthcheck import router as healthcheck_router
 from app.v1.endpoints.translation import router as translation_router
+from app.v1.endpoints.upstream import router as upstream_router
 
 router = APIRouter()
 router.include_router(translation_router)
 router.include_router(healthcheck_router)
+router.include_router(cache_router)
+router.include_router(upstream_router)
@@ -1,9 +1,11 @@
 from typing import Optional
 
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.v1.core.config import settings
+from app.v1.core.metrics import translation_lookups
+from app.v1.models import WordDocument
 
 
 class Word(BaseModel):
@@ -22,37 +24,127 @@ class DeleteWordResponse(BaseModel):
     word: str
 
 
+class CacheStatsResponse(BaseModel):
+    size: int
+    maxSize: int
+    hits: int
+    negativeHits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    hitRatio: float
+    l2Hits: int = 0
+    l2Misses: int = 0
+    l2Errors: int = 0
+
+
+class UpstreamStatsResponse(BaseModel):
+    circuitState: str
+    calls: int
+    successes: int
+    failures: int
+    retries: int
+    rejected: int
+
+
 class WordRequest(BaseModel):
+    """
+    tl is one target language or a comma separated list of them (tl=es,de,fr), served as one word
+    """
     word: str = Field(min_length=2)
     sl: str = Field(min_length=2, pattern='^[a-zA-Z]+$', default='auto')
-    tl: str = Field(min_length=2, max_length=2, pattern='^[a-zA-Z]+$', default='en')
+    tl: str = Field(min_length=2, pattern='^[a-zA-Z]{2}(,[a-zA-Z]{2})*$', default='en')
 
     @model_validator(mode='before')
     def check_languages_not_same(cls, data):
         data['sl'] = data['sl'].lower()
-        data['tl'] = data['tl'].lower()
+        data['tl'] = ','.join(dict.fromkeys(data['tl'].lower().split(',')))
 
-        if data['sl'] == data['tl']:
+        if data['sl'] in data['tl'].split(','):
+            translation_lookups.inc('same_languages')
             raise RequestValidationError('Source and target languages cannot be the same', body={
                 'sl': data['sl'],
                 'tl': data['tl']
             })
 
+        if data['tl'].count(',') >= settings.MAX_TARGET_LANGUAGES:
+            raise RequestValidationError('Too many target languages', body={
+                'tl': data['tl'],
+                'max': settings.MAX_TARGET_LANGUAGES
+            })
+
         return data
 
+    @property
+    def targets(self) -> list[str]:
+        return self.tl.split(',')
+
 
 class TranslationListRequest(BaseModel):
     word: Optional[str] = ''
     skip: Optional[int] = Field(ge=0, default=settings.SKIP)
     limit: Optional[int] = Field(ge=1, default=settings.LIMIT)
     sort: Optional[str] = settings.SORTING
+    mode: Optional[str] = Field(pattern='^(offset|fast)$', default='offset')
+    cursor: Optional[str] = None
+    count: Optional[bool] = False
 
     @model_validator(mode='before')
     def check_languages_not_same(cls, data):
         """
         Use "word" filter only it's not empty and length => 2.
+
+        mode=fast: "word" is a prefix, pages are walked with "cursor" (meta.next of the previous page),
+        "skip" is ignored and the total count is returned only with count=true.
         """
         if len(data['word']) < 2:
             data['word'] = ''
 
         return data
+
+
+class TranslationBatchItem(BaseModel):
+    word: str = Field(min_length=2)
+    sl: str = Field(min_length=2, pattern='^[a-zA-Z]+$', default='auto')
+    tl: str = Field(min_length=2, max_length=2, pattern='^[a-zA-Z]+$', default='en')
+
+    @field_validator('sl', 'tl')
+    def to_lower(cls, value: str) -> str:
+        return value.lower()
+
+
+class TranslationBatchRequest(BaseModel):
+    """
+    sl == tl is not rejected here: it is reported per item, so one bad item doesn't fail the batch
+    """
+    items: list[TranslationBatchItem] = Field(min_length=1, max_length=settings.BATCH_MAX_ITEMS)
+
+
+class TranslationBatchItemResponse(BaseModel):
+    word: str
+    sl: str
+    tl: str
+    status: str
+    source: Optional[str] = None
+    message: Optional[str] = None
+    data: Optional[WordDocument] = None
+
+
+class TranslationBatchResponse(BaseModel):
+    meta: dict
+    data: list[TranslationBatchItemResponse]
+
+
+class TranslationExportRequest(BaseModel):
+    gzip: Optional[bool] = False
+    batch_size: Optional[int] = Field(ge=1, le=10000, default=settings.TRANSLATION_EXPORT_BATCH_SIZE)
+
+
+class TranslationImportRequest(BaseModel):
+    gzip: Optional[bool] = False
+    chunk_size: Optional[int] = Field(ge=1, le=10000, default=settings.TRANSLATION_IMPORT_CHUNK_SIZE)
+
+
+class TranslationImportResponse(BaseModel):
+    meta: dict
@@ -0,0 +1,61 @@
+import asyncio
+
+from collections import Counter
+from datetime import datetime, timezone
+
+from app.v1.repositories.access import IAccessStats
+
+AccessKey = tuple[str, str, str]
+
+
+class AccessRecorder:
+    """
+    Responsibility: Count (word, sl, tl) lookups for the cache warm-up (see WarmupService).
+
+    Counted in memory, off the request path, and flushed as one bulk $inc every flush_interval seconds.
+    Best effort: a failed flush loses its counts, stop() flushes the rest.
+    """
+
+    def __init__(self, repository: IAccessStats, flush_interval: float):
+        self.repository: IAccessStats = repository
+        self.flush_interval: float = flush_interval
+
+        self._counts: Counter[AccessKey] = Counter()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def record(self, word: str, sl: str, tl: str) -> None:
+        self._counts[(word, sl, tl)] += 1
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        counts, self._counts = self._counts, Counter()
+
+        if not counts:
+            return
+
+        try:
+            await self.repository.increment(dict(counts), datetime.now(timezone.utc))
+        except Exception as e:
+            # Log write error here
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
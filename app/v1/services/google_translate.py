@@ -1,78 +1,159 @@
+import asyncio
+import re
+
+from datetime import datetime, timezone
+
+import httpx
+
 from aiogoogletrans import Translator
 from aiogoogletrans.models import Translated
 
-from app.v1.core.exceptions import GoogleTranslateRequestException
-from app.v1.models import Definition as DefinitionModel
-from app.v1.models import Language as LanguageModel
+from app.v1.core.config import CommonSettings
+from app.v1.core.exceptions import GoogleTranslateRequestException, UpstreamUnavailableException
+from app.v1.core.metrics import instrumented
+from app.v1.core.resilience import CircuitBreaker, RecentCalls, TokenBucket, UpstreamPolicy
 from app.v1.models import Word as WordModel
-from app.v1.models import Translation as TranslationModel
 
+STATUS_CODE_PATTERN = re.compile(r'status code "(\d+)"')
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+async def create_translator(settings: CommonSettings) -> Translator:
+    """
+    Application-scoped translator on a keep-alive connection pool.
+    The token acquirer shares the pool, so the TKK token is fetched once per hour, not per request.
+    Translator always creates a client of its own: it's replaced by the pool and closed.
+    """
+    # Unexpected status codes raise instead of returning dummy data
+    translator = Translator(raise_exception=True)
+    default_client = translator.client
+    client = httpx.AsyncClient(
+        http2=settings.GOOGLE_TRANSLATE_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.GOOGLE_TRANSLATE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GOOGLE_TRANSLATE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GOOGLE_TRANSLATE_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.GOOGLE_TRANSLATE_TIMEOUT,
+            connect=settings.GOOGLE_TRANSLATE_CONNECT_TIMEOUT,
+        ),
+    )
+    translator.client = client
+    translator.token_acquirer.client = client
+    await default_client.aclose()
+
+    return translator
+
+
+async def close_translator(translator: Translator) -> None:
+    await translator.client.aclose()
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Network errors, timeouts, throttling and 5xx are worth a retry. Anything else is not
+    """
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
 
+    match = STATUS_CODE_PATTERN.search(str(error))
+
+    return bool(match) and int(match.group(1)) in TRANSIENT_STATUS_CODES
+
+
+def create_upstream_policy(settings: CommonSettings) -> UpstreamPolicy:
+    """
+    Application-scoped: rate limiter and circuit breaker state are shared by every request in the worker
+    """
+    return UpstreamPolicy(
+        rate_limiter=TokenBucket(
+            rate=settings.GOOGLE_TRANSLATE_RATE_LIMIT,
+            capacity=settings.GOOGLE_TRANSLATE_RATE_BURST,
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=settings.GOOGLE_TRANSLATE_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.GOOGLE_TRANSLATE_BREAKER_RECOVERY_TIMEOUT,
+        ),
+        is_transient=is_transient_error,
+        rate_limit_max_wait=settings.GOOGLE_TRANSLATE_RATE_LIMIT_MAX_WAIT,
+        retry_attempts=settings.GOOGLE_TRANSLATE_RETRY_ATTEMPTS,
+        retry_base_delay=settings.GOOGLE_TRANSLATE_RETRY_BASE_DELAY,
+        retry_max_delay=settings.GOOGLE_TRANSLATE_RETRY_MAX_DELAY,
+        recent_calls=RecentCalls(window=settings.HEALTH_UPSTREAM_WINDOW),
+    )
+
+
+@instrumented('google_translate_service')
 class GoogleTranslateService:
     """
     Responsibility: Get translated word from Google Translate API and format it
     """
 
-    def __init__(self):
-        self.translator: Translator = Translator()
+    def __init__(self, translator: Translator, policy: UpstreamPolicy | None = None):
+        self.translator: Translator = translator
+        self.policy: UpstreamPolicy | None = policy
 
     async def get_translated_word(self, word: str, sl: str, tl: str) -> WordModel | None:
         try:
-            data = await self.translator.translate(word, src=sl, dest=tl)
+            if self.policy:
+                data = await self.policy.call(lambda: self.translator.translate(word, src=sl, dest=tl))
+            else:
+                data = await self.translator.translate(word, src=sl, dest=tl)
 
             return self.get_model(data)
+        except UpstreamUnavailableException:
+            raise
         except Exception as e:
             raise GoogleTranslateRequestException(
                 f'Something went wrong in Google Translate request: {e}. Word "{word}" from {sl} to {tl}')
 
     def get_model(self, data: Translated) -> WordModel:
-        return WordModel(
-            word=data.origin,
-            language=data.src,
-            pronunciation=data.extra_data['translation'][-1][-1],
-            languages={data.dest: self._get_language(data)},
-        )
-
-    def _get_language(self, data) -> LanguageModel | None:
-        return LanguageModel(
-            text=data.text,
-            confidence=data.extra_data.get('confidence', None),
-            pronunciation=data.extra_data['translation'][-1][-2],
-            definitions=self._get_definitions(data.extra_data),
-            examples=self._get_examples(data.extra_data['examples']),
-            translations=self._get_translations(data.extra_data),
-        )
-
-    def _get_definitions(self, extra_data: dict) -> dict[str, list[DefinitionModel]] | None:
         """
-        Get definitions with synonyms
+        Google's extra_data is shaped into plain dicts first and validated once, in one pass.
+        Much cheaper than a model per definition and translation row mutated after construction:
+        words like "set" or "run" have hundreds of rows.
+        """
+        return WordModel.model_validate({
+            'word': data.origin,
+            'language': data.src,
+            'pronunciation': data.extra_data['translation'][-1][-1],
+            'languages': {data.dest: self._get_language(data)},
+            'fetchedAt': {data.dest: datetime.now(timezone.utc)},
+        })
+
+    def _get_language(self, data) -> dict:
+        return {
+            'text': data.text,
+            'confidence': data.extra_data.get('confidence', None),
+            'pronunciation': data.extra_data['translation'][-1][-2],
+            'definitions': self._get_definitions(data.extra_data),
+            'examples': self._get_examples(data.extra_data['examples']),
+            'translations': self._get_translations(data.extra_data),
+        }
+
+    def _get_definitions(self, extra_data: dict) -> dict[str, list[dict]] | None:
+        """
+        Get definitions with synonyms.
+        Definition row: [definition, synonyms key, example?, [_, _, context]?]
         """
         if not extra_data['definitions']:
             return
 
-        result = {}
         grouped_synonyms = self._get_synonyms_grouped_by_keys(extra_data)
 
-        for part_of_speech, definitions_list, _, _ in extra_data['definitions']:
-            result[part_of_speech] = []
-
-            for definition, key, *context in definitions_list:
-                item = DefinitionModel(
-                    definition=definition,
-                )
-
-                if grouped_synonyms:
-                    item.synonyms = grouped_synonyms.get(key, [])
-
-                if context:
-                    item.example = context[0]
-
-                    if len(context) > 1:
-                        item.context = context[1][0]
-
-                result[part_of_speech].append(item)
-
-        return result
+        return {
+            part_of_speech: [
+                {
+                    'definition': row[0],
+                    'synonyms': grouped_synonyms.get(row[1], []) if grouped_synonyms else None,
+                    'example': row[2] if len(row) > 2 else None,
+                    'context': row[3][0] if len(row) > 3 else None,
+                }
+                for row in definitions_list
+            ]
+            for part_of_speech, definitions_list, _, _ in extra_data['definitions']
+        }
 
     def _get_synonyms_grouped_by_keys(self, extra_data: dict) -> dict[str, list[str]] | None:
         """
@@ -98,24 +179,21 @@ class GoogleTranslateService:
 
         return [example[0] for example in examples[0]]
 
-    def _get_translations(self, extra_data: dict) -> dict[str, list[TranslationModel]] | None:
+    def _get_translations(self, extra_data: dict) -> dict[str, list[dict]] | None:
+        """
+        Translation row: [text, back translations, _, confidence?, ...]
+        """
         if not extra_data['all-translations']:
             return
 
-        result = {}
-
-        for part_of_speech, _, translation, *_ in extra_data['all-translations']:
-            result[part_of_speech] = []
-
-            for word in translation:
-                confidence = word[-1] if isinstance(word[-1], float) else None
-
-                item = TranslationModel(
-                    text=word[0],
-                    translations=word[1],
-                    confidence=confidence,
-                )
-
-                result[part_of_speech].append(item)
-
-        return result
+        return {
+            part_of_speech: [
+                {
+                    'text': row[0],
+                    'translations': row[1],
+                    'confidence': row[-1] if isinstance(row[-1], float) else None,
+                }
+                for row in translation
+            ]
+            for part_of_speech, _, translation, *_ in extra_data['all-translations']
+        }
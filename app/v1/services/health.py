@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.v1.cache.translation import ITranslationCache
+from app.v1.core.loop import LoopLagMonitor
+from app.v1.core.resilience import CircuitBreaker, UpstreamPolicy
+from app.v1.db.mongodb import PoolStats
+
+
+class HealthService:
+    """
+    Responsibility: Tell the load balancer whether this worker should get traffic (readiness).
+
+    Checks, each with its own threshold:
+    - mongo: timed ping, slower than max_ping_latency (or failing within ping_timeout) is not ready
+    - mongoPool: connections in use, above max_pool_usage of the pool is not ready (requests would queue)
+    - upstream: circuit breaker and recent error rate and p95 latency of Google Translate.
+      Judged on at least upstream_min_calls recent calls. Report only unless upstream_required:
+      stored words are still served from the DB and cache while Google is down
+    - eventLoop: the worst recent loop lag, above max_loop_lag is not ready
+    - cache: fill of the in-process tier, report only
+    - indexes: whether ensuring the indexes on startup failed (index_error). Report only unless indexes_required
+    """
+    READY = 'ready'
+    NOT_READY = 'not ready'
+
+    def __init__(self, db: AsyncIOMotorDatabase,
+                 pool_stats: PoolStats,
+                 policy: UpstreamPolicy,
+                 cache: ITranslationCache,
+                 loop_monitor: LoopLagMonitor,
+                 ping_timeout: float = 1,
+                 max_ping_latency: float = 0.5,
+                 max_pool_usage: float = 0.9,
+                 upstream_required: bool = False,
+                 upstream_min_calls: int = 10,
+                 max_upstream_error_rate: float = 0.5,
+                 max_upstream_latency: float = 3,
+                 max_loop_lag: float = 0.5,
+                 index_error: str | None = None,
+                 indexes_required: bool = False):
+        self.db: AsyncIOMotorDatabase = db
+        self.pool_stats: PoolStats = pool_stats
+        self.policy: UpstreamPolicy = policy
+        self.cache: ITranslationCache = cache
+        self.loop_monitor: LoopLagMonitor = loop_monitor
+        self.ping_timeout: float = ping_timeout
+        self.max_ping_latency: float = max_ping_latency
+        self.max_pool_usage: float = max_pool_usage
+        self.upstream_required: bool = upstream_required
+        self.upstream_min_calls: int = upstream_min_calls
+        self.max_upstream_error_rate: float = max_upstream_error_rate
+        self.max_upstream_latency: float = max_upstream_latency
+        self.max_loop_lag: float = max_loop_lag
+        self.index_error: str | None = index_error
+        self.indexes_required: bool = indexes_required
+
+    async def readiness(self) -> dict:
+        checks = {
+            'mongo': await self._check_mongo(),
+            'mongoPool': self._check_mongo_pool(),
+            'upstream': self._check_upstream(),
+            'eventLoop': self._check_event_loop(),
+            'cache': self._check_cache(),
+            'indexes': self._check_indexes(),
+        }
+
+        return {
+            'status': self.READY if all(check['ok'] for check in checks.values()) else self.NOT_READY,
+            'checks': checks,
+        }
+
+    async def _check_mongo(self) -> dict:
+        started_at = time.monotonic()
+
+        try:
+            await asyncio.wait_for(self.db.command('ping'), self.ping_timeout)
+        except Exception as e:
+            # Log ping error here
+            return {'ok': False, 'latency': time.monotonic() - started_at, 'error': str(e) or type(e).__name__}
+
+        latency = time.monotonic() - started_at
+
+        return {'ok': latency <= self.max_ping_latency, 'latency': latency}
+
+    def _check_mongo_pool(self) -> dict:
+        stats = self.pool_stats.stats()
+
+        return {'ok': stats['inUse'] <= self.max_pool_usage * stats['maxSize'], **stats}
+
+    def _check_upstream(self) -> dict:
+        circuit_state = self.policy.circuit_breaker.state
+        recent = self.policy.recent_calls.stats()
+        healthy = circuit_state != CircuitBreaker.OPEN and (
+            recent['calls'] < self.upstream_min_calls
+            or (recent['errorRate'] <= self.max_upstream_error_rate
+                and recent['latencyP95'] <= self.max_upstream_latency)
+        )
+
+        return {
+            'ok': healthy or not self.upstream_required,
+            'healthy': healthy,
+            'circuitState': circuit_state,
+            **recent,
+        }
+
+    def _check_event_loop(self) -> dict:
+        stats = self.loop_monitor.stats()
+
+        return {'ok': stats['maxLag'] <= self.max_loop_lag, **stats}
+
+    def _check_cache(self) -> dict:
+        stats = self.cache.stats()
+
+        return {
+            'ok': True,
+            'size': stats['size'],
+            'maxSize': stats['maxSize'],
+            'fill': stats['size'] / stats['maxSize'] if stats['maxSize'] else 0.0,
+        }
+
+    def _check_indexes(self) -> dict:
+        if self.index_error is None:
+            return {'ok': True, 'ensured': True}
+
+        return {'ok': not self.indexes_required, 'ensured': False, 'error': self.index_error}
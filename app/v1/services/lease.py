@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, TypeVar
+from uuid import uuid4
+
+from pymongo.errors import DuplicateKeyError
+
+from app.v1.repositories.lease import ILease
+
+T = TypeVar('T')
+
+
+class LeaseService:
+    """
+    Responsibility: Cross-worker mutual exclusion on a key through lease documents.
+
+    A lease expires on its own after ttl seconds, so a crashed holder never blocks the key for good.
+    If the DB can't be reached the lease is considered acquired: we'd rather call Google twice than fail.
+    """
+
+    def __init__(self, repository: ILease, ttl: float, poll_interval: float, wait_timeout: float):
+        self.repository: ILease = repository
+        self.ttl: float = ttl
+        self.poll_interval: float = poll_interval
+        self.wait_timeout: float = wait_timeout
+
+    async def acquire(self, key: str) -> str | None:
+        """
+        Returns the owner token if the lease is ours, None if somebody else holds it
+        """
+        owner = uuid4().hex
+        now = self._now()
+        expires_at = now + timedelta(seconds=self.ttl)
+
+        try:
+            await self.repository.insert_lease(key, owner, expires_at)
+
+            return owner
+        except DuplicateKeyError:
+            pass
+        except Exception as e:
+            # Log lease error here
+            return owner
+
+        try:
+            result = await self.repository.take_over_expired_lease(key, owner, expires_at, now)
+        except Exception as e:
+            # Log lease error here
+            return owner
+
+        return owner if result.modified_count else None
+
+    async def release(self, key: str, owner: str) -> None:
+        try:
+            await self.repository.delete_lease(key, owner)
+        except Exception as e:
+            # Log lease error here. The lease expires on its own
+            pass
+
+    async def is_held(self, key: str) -> bool:
+        try:
+            lease = await self.repository.get_lease(key)
+        except Exception as e:
+            # Log lease error here
+            return False
+
+        return bool(lease) and self._as_aware(lease['expiresAt']) > self._now()
+
+    async def wait(self, key: str, check: Callable[[], Awaitable[T | None]]) -> T | None:
+        """
+        Wait for the lease holder to finish. Polls check() until it returns a result,
+        the lease is released (or expired) or wait_timeout passes.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+
+        while time.monotonic() < deadline:
+            result = await check()
+
+            if result is not None:
+                return result
+
+            if not await self.is_held(key):
+                return await check()
+
+            await asyncio.sleep(self.poll_interval)
+
+        return None
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    @staticmethod
+    def _as_aware(value: datetime) -> datetime:
+        # Motor returns naive UTC datetimes unless tz_aware=True
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,566 @@
+import asyncio
+
+from functools import partial
+
+from app.v1.cache.translation import CacheKey, ITranslationCache
+from app.v1.core.exceptions import AmbiguousSourceLanguageException, GoogleTranslateRequestException
+from app.v1.core.exceptions import UpstreamUnavailableException
+from app.v1.core.metrics import instrumented, translation_lookups
+from app.v1.core.normalization import clean_word, normalize_word
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word as WordModel
+from app.v1.models import WordDocument
+from app.v1.schemas import TranslationBatchItemResponse
+from app.v1.services.access import AccessRecorder
+from app.v1.services.google_translate import GoogleTranslateService
+from app.v1.services.lease import LeaseService
+from app.v1.services.refresh import TranslationRefresher
+from app.v1.services.reverse_index import ReverseIndexService
+from app.v1.services.source_language import SourceLanguageService
+from app.v1.services.translation import TranslationService
+from app.v1.services.write_behind import OnStored
+
+
+@instrumented('lookup_service')
+class TranslationLookupService:
+    """
+    Responsibility: Resolve a word translation from the cache, DB or Google Translate, in that order.
+
+    Scenarios:
+
+    1. Word with source language (sl) is in DB, and we have target language (tl) translation. Return it.
+    2. Word with sl is in DB, but not tl translation. Google it and append to Word.
+    3. Word is DB, but has another sl - letters are the same, but different translation result.
+    Google it and add to DB.
+    4. Word is not in DB, Google it and add to DB.
+
+    Every resolved word is cached by (word, sl, tl) in every cache tier (see ITranslationCache);
+    failed Google lookups are cached for a short time.
+    Stored translations don't depend on Google: while it's unavailable (rate limit, open circuit)
+    they're still served, only the lookups that need Google fail fast with UpstreamUnavailableException.
+    Words are resolved to WordDocument, served as is: validated Google results are dumped once,
+    stored words aren't validated again (see TranslationService).
+    Only one Google lookup per (word, sl, tl) is in flight: concurrent requests in the worker share it
+    (SingleFlight), other workers wait for the lease holder and read its result from DB (LeaseService).
+    sl=auto is resolved to the stored source language of the word (SourceLanguageService), then looked up
+    like any sl. Nothing is stored under "auto": unresolved words go to Google, its detection is recorded.
+    Results are cached under the requested key, auto included.
+    Keys are canonical (normalize_word of the word under its sl): case, Unicode and whitespace variants share
+    one cache entry, one Google lookup in flight, one lease and one stored word. Google gets the cleaned
+    spelling of the request (clean_word), the stored word keeps the spelling it was first stored with.
+    Words Google translates feed the reverse index (ReverseIndexService): a word that isn't stored, but is
+    a known translation of a stored word in the other direction, is served derived, without Google.
+    Stored translations are served stale-while-revalidate (TranslationRefresher): stale ones are served and
+    re-fetched in the background, expired ones are re-fetched first, served stale if Google fails.
+    Every resolved lookup is counted by scenario in translation_lookups (cache, db, coalesced, lease,
+    derived, new_language, new_word, stale, expired), public calls are timed in stage_duration.
+
+    Attributes:
+        STATUS_SUCCESS, STATUS_ERROR: Per item status of a batch.
+        SOURCE_CACHE, SOURCE_DB, SOURCE_DERIVED, SOURCE_GOOGLE: Where a batch item was resolved from.
+    """
+    STATUS_SUCCESS = 'success'
+    STATUS_ERROR = 'error'
+    SOURCE_CACHE = 'cache'
+    SOURCE_DB = 'db'
+    SOURCE_DERIVED = 'derived'
+    SOURCE_GOOGLE = 'google'
+    SAME_LANGUAGES_MESSAGE = 'Source and target languages cannot be the same'
+
+    def __init__(self, translation_service: TranslationService,
+                 google_translate_service: GoogleTranslateService,
+                 cache: ITranslationCache,
+                 single_flight: SingleFlight,
+                 lease_service: LeaseService,
+                 batch_concurrency: int = 10,
+                 access_recorder: AccessRecorder | None = None,
+                 source_language_service: SourceLanguageService | None = None,
+                 reverse_index_service: ReverseIndexService | None = None,
+                 refresher: TranslationRefresher | None = None):
+        self.translation_service: TranslationService = translation_service
+        self.google_translate_service: GoogleTranslateService = google_translate_service
+        self.cache: ITranslationCache = cache
+        self.single_flight: SingleFlight = single_flight
+        self.lease_service: LeaseService = lease_service
+        self.batch_concurrency: int = batch_concurrency
+        self.access_recorder: AccessRecorder | None = access_recorder
+        self.source_language_service: SourceLanguageService | None = source_language_service
+        self.reverse_index_service: ReverseIndexService | None = reverse_index_service
+        self.refresher: TranslationRefresher | None = refresher
+
+    async def get_word(self, word: str, sl: str, tl: str) -> WordDocument:
+        word = clean_word(word)
+        key = self._key(word, sl, tl)
+        self._record_access(*key)
+        cached_word = await self.cache.get(*key)
+
+        if cached_word:
+            translation_lookups.inc('cache')
+            return cached_word
+
+        try:
+            source, translated_word = await self._resolve_word(word, sl, tl)
+        except UpstreamUnavailableException:
+            # Google wasn't asked, nothing to remember about the word
+            raise
+        except GoogleTranslateRequestException as e:
+            await self.cache.set_negative(*key, e)
+            raise
+
+        # Stored words could have been overwritten since they were read: see TieredTranslationCache
+        await self.cache.set(*key, translated_word, fresh=source == self.SOURCE_GOOGLE)
+
+        return translated_word
+
+    async def get_words(self, items: list[CacheKey]) -> list[TranslationBatchItemResponse]:
+        """
+        Batch version of get_word. Results come back in the order of items, one per item.
+
+        - Cache first, then all DB hits with a single query
+        - Misses go to Google concurrently, at most batch_concurrency at a time, once per canonical key
+        - New words are stored with one bulk upsert, new languages of stored words with one bulk_write
+        - A failed item is reported with STATUS_ERROR and doesn't fail the batch
+
+        Batch lookups don't take leases: a lease per item would cost a DB round trip per item.
+        """
+        resolved: dict[CacheKey, TranslationBatchItemResponse] = {}
+        keys: list[CacheKey] = []
+
+        for key in dict.fromkeys(items):
+            if key[1] == key[2]:
+                translation_lookups.inc('same_languages')
+                resolved[key] = self._batch_error(key, self.SAME_LANGUAGES_MESSAGE)
+            else:
+                keys.append(key)
+
+        for key, result in (await self._lookup_many(keys)).items():
+            if isinstance(result, Exception):
+                resolved[key] = self._batch_error(key, str(result))
+            else:
+                resolved[key] = self._batch_success(key, result[1], result[0])
+
+        return [resolved[key] for key in items]
+
+    async def get_word_languages(self, word: str, sl: str, tls: list[str]) -> WordDocument:
+        """
+        get_word for several target languages, served as one word with all of them.
+        Looked up like a batch of the word (see get_words): cached languages first, the rest with one DB read,
+        the missing ones from Google concurrently, stored with one update. Fails like get_word would,
+        with the error of the first failed language.
+        The languages must share the source language: an sl=auto word detected as several languages
+        raises AmbiguousSourceLanguageException. fetchedAt is merged, "derived" marks the derived languages
+        (and the word, if all of them are)
+        """
+        if len(tls) == 1:
+            return await self.get_word(word, sl, tls[0])
+
+        results = await self._lookup_many([(word, sl, tl) for tl in dict.fromkeys(tls)])
+
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+
+        words = {tl: translated_word for (_, _, tl), (_, translated_word) in results.items()}
+        source_languages = {translated_word['language'] for translated_word in words.values()}
+
+        if len(source_languages) > 1:
+            raise AmbiguousSourceLanguageException(
+                f'{word} is detected as {", ".join(sorted(map(str, source_languages)))}, set sl'
+            )
+
+        return self._merge_languages(words)
+
+    @staticmethod
+    def _merge_languages(words: dict[str, WordDocument]) -> WordDocument:
+        """
+        One word with the language of each of the words, by tl. The word itself from a stored (not derived) one
+        """
+        derived = {tl for tl, translated_word in words.items() if translated_word.get(ReverseIndexService.DERIVED)}
+        base = next((words[tl] for tl in words if tl not in derived), next(iter(words.values())))
+        merged = {key: value for key, value in base.items()
+                  if key not in ('languages', 'fetchedAt', ReverseIndexService.DERIVED)}
+        merged['languages'] = {
+            tl: {**translated_word['languages'][tl], ReverseIndexService.DERIVED: True} if tl in derived
+            else translated_word['languages'][tl]
+            for tl, translated_word in words.items()
+        }
+        fetched_at = {tl: translated_word['fetchedAt'][tl] for tl, translated_word in words.items()
+                      if tl in (translated_word.get('fetchedAt') or {})}
+
+        if fetched_at:
+            merged['fetchedAt'] = fetched_at
+
+        if derived and len(derived) == len(words):
+            merged[ReverseIndexService.DERIVED] = True
+
+        return merged
+
+    async def _lookup_many(self, keys: list[CacheKey]) -> dict[CacheKey, tuple[str, WordDocument] | Exception]:
+        """
+        The body of get_words: (source, word) or the error of every key, sl != tl
+        """
+        resolved: dict[CacheKey, tuple[str, WordDocument] | Exception] = {}
+        pending: list[CacheKey] = []
+
+        for key in keys:
+            word, sl, tl = key
+            canonical_key = self._key(word, sl, tl)
+            self._record_access(*canonical_key)
+
+            try:
+                cached_word = await self.cache.get(*canonical_key)
+            except GoogleTranslateRequestException as e:
+                resolved[key] = e
+                continue
+
+            if cached_word:
+                translation_lookups.inc('cache')
+                resolved[key] = (self.SOURCE_CACHE, cached_word)
+            else:
+                pending.append(key)
+
+        # The key looked up: the cleaned word, sl=auto resolved where possible
+        lookup_keys = await self._resolve_auto_keys(pending)
+        stored_words = await self.translation_service.get_words_from_db(
+            list({(word, sl) for word, sl, _ in lookup_keys.values() if sl != SourceLanguageService.AUTO}),
+            list({tl for _, _, tl in pending})
+        )
+        misses: list[CacheKey] = []
+        # Served if Google fails to refresh them
+        expired: dict[CacheKey, WordDocument] = {}
+
+        for key in pending:
+            word, sl, tl = lookup_keys[key]
+            stored_word = stored_words.get((normalize_word(word, sl), sl))
+
+            if stored_word and tl in stored_word['languages']:
+                only_my_language = self.translation_service.get_only_my_language(stored_word, tl)
+
+                if self._freshness(word, sl, tl, only_my_language) == TranslationRefresher.EXPIRED:
+                    expired[key] = only_my_language
+                    misses.append(key)
+                    continue
+
+                await self._cache(key, lookup_keys[key], only_my_language)
+                translation_lookups.inc('db')
+                resolved[key] = (self.SOURCE_DB, only_my_language)
+            else:
+                misses.append(key)
+
+        derived_words = await self._get_derived_words([lookup_keys[key] for key in misses if key not in expired])
+
+        for key in misses:
+            derived_word = derived_words.get(lookup_keys[key])
+
+            if derived_word:
+                await self._cache(key, lookup_keys[key], derived_word)
+                translation_lookups.inc('derived')
+                resolved[key] = (self.SOURCE_DERIVED, derived_word)
+
+        misses = [key for key in misses if key not in resolved]
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def translate(miss: CacheKey) -> WordModel:
+            async with semaphore:
+                return await self.google_translate_service.get_translated_word(*lookup_keys[miss])
+
+        # Variants of a word share one Google lookup, with the first spelling asked
+        google_keys: dict[CacheKey, CacheKey] = {}
+
+        for key in misses:
+            google_keys.setdefault(self._key(*lookup_keys[key]), key)
+
+        google_results = await asyncio.gather(*[translate(key) for key in google_keys.values()],
+                                              return_exceptions=True)
+        google_words = dict(zip(google_keys, google_results))
+        translated: dict[CacheKey, WordDocument] = {}
+        new_words: dict[tuple[str, str], WordModel] = {}
+        detected: set[tuple[str, str]] = set()
+        new_languages = []
+
+        for key in misses:
+            word, sl, tl = key
+            lookup_word, lookup_sl, _ = lookup_keys[key]
+            google_word = google_words[self._key(*lookup_keys[key])]
+
+            if isinstance(google_word, Exception):
+                if key in expired:
+                    # Like get_word: served stale until it expires from the cache, then Google is asked again
+                    await self._cache(key, lookup_keys[key], expired[key])
+                    resolved[key] = (self.SOURCE_DB, expired[key])
+                    continue
+
+                if isinstance(google_word, GoogleTranslateRequestException) \
+                        and not isinstance(google_word, UpstreamUnavailableException):
+                    await self.cache.set_negative(*self._key(word, sl, tl), google_word)
+
+                resolved[key] = google_word
+                continue
+
+            new_key = (normalize_word(google_word.word, google_word.language), google_word.language)
+
+            if lookup_sl == SourceLanguageService.AUTO and new_key not in detected:
+                detected.add(new_key)
+                await self._record_detection(lookup_word, google_word.language)
+
+            stored_word = stored_words.get((normalize_word(lookup_word, lookup_sl), lookup_sl))
+
+            if stored_word:
+                if key not in expired:
+                    translation_lookups.inc('new_language')
+
+                # Overwrites the expired language
+                new_languages.append((stored_word, tl, google_word.languages[tl]))
+            else:
+                translation_lookups.inc('new_word')
+                # Several target languages of the same new word become one document
+                new_word = new_words.setdefault(new_key, google_word.model_copy(update={'languages': {}}))
+                new_word.languages[tl] = google_word.languages[tl]
+
+            translated[key] = google_word.model_dump()
+            self._record_reverse(translated[key])
+
+        await self.translation_service.add_new_words(list(new_words.values()))
+        await self.translation_service.add_new_languages_to_words(new_languages)
+
+        # Cached after storing: storing new languages invalidates the words
+        for key, google_word in translated.items():
+            await self._cache(key, lookup_keys[key], google_word, fresh=True)
+            resolved[key] = (self.SOURCE_GOOGLE, google_word)
+
+        return {key: resolved[key] for key in keys}
+
+    async def _cache(self, key: CacheKey, lookup_key: CacheKey, word: WordDocument, fresh: bool = False) -> None:
+        """
+        Under the requested key, and under the key looked up if sl=auto was resolved: both are asked for
+        """
+        for cache_key in dict.fromkeys([self._key(*key), self._key(*lookup_key)]):
+            await self.cache.set(*cache_key, word, fresh=fresh)
+
+    async def _resolve_word(self, word: str, sl: str, tl: str) -> tuple[str, WordDocument]:
+        """
+        (source, word): where it was resolved from, like the results of _lookup_many
+        """
+        if sl == SourceLanguageService.AUTO and self.source_language_service is not None:
+            sl = await self.source_language_service.resolve(word) or sl
+
+        stored_word = await self._get_stored_word(word, sl, tl)
+
+        if stored_word:
+            return await self._revalidate(word, sl, tl, stored_word)
+
+        derived_word = (await self._get_derived_words([(word, sl, tl)])).get((word, sl, tl))
+
+        if derived_word:
+            translation_lookups.inc('derived')
+            return self.SOURCE_DERIVED, derived_word
+
+        key = self._key(word, sl, tl)
+
+        if key in self.single_flight:
+            translation_lookups.inc('coalesced')
+
+        return self.SOURCE_GOOGLE, await self.single_flight.do(key, lambda: self._translate_once(word, sl, tl))
+
+    async def _revalidate(self, word: str, sl: str, tl: str, stored_word: WordDocument) -> tuple[str, WordDocument]:
+        if self._freshness(word, sl, tl, stored_word) != TranslationRefresher.EXPIRED:
+            translation_lookups.inc('db')
+            return self.SOURCE_DB, stored_word
+
+        try:
+            return self.SOURCE_GOOGLE, await self.single_flight.do(self._key(word, sl, tl),
+                                                                   lambda: self._refresh(word, sl, tl))
+        except GoogleTranslateRequestException as e:
+            # Log refresh error here. Better stale than nothing
+            return self.SOURCE_DB, stored_word
+
+    async def _refresh(self, word: str, sl: str, tl: str) -> WordDocument:
+        """
+        Google the stored language again and overwrite it, its fetch time with it.
+        A word deleted meanwhile isn't stored again: the refresh of a deleted word is dropped
+        """
+        stored_word = await self.translation_service.get_word_language_from_db(word, sl, tl)
+        google_word = await self.google_translate_service.get_translated_word(word, sl, tl)
+
+        if stored_word:
+            # Written behind: the response doesn't wait for DB. Not an upsert, a delete meanwhile wins
+            await self.translation_service.queue_new_language(stored_word, tl, google_word.languages[tl])
+
+        return self._record_reverse(google_word.model_dump())
+
+    def _freshness(self, word: str, sl: str, tl: str, stored_word: WordDocument) -> str:
+        """
+        Stale words are submitted for a background refresh
+        """
+        if self.refresher is None:
+            return TranslationRefresher.FRESH
+
+        freshness = self.refresher.freshness(stored_word, tl)
+
+        if freshness == TranslationRefresher.STALE:
+            translation_lookups.inc('stale')
+            self.refresher.submit(self._key(word, sl, tl), partial(self._refresh, word, sl, tl))
+        elif freshness == TranslationRefresher.EXPIRED:
+            translation_lookups.inc('expired')
+
+        return freshness
+
+    async def _translate_once(self, word: str, sl: str, tl: str) -> WordDocument:
+        lease_key = f'{sl}:{tl}:{normalize_word(word, sl)}'
+        owner = await self.lease_service.acquire(lease_key)
+
+        if owner is None:
+            stored_word = await self.lease_service.wait(lease_key, lambda: self._get_leased_word(word, sl, tl))
+
+            if stored_word:
+                translation_lookups.inc('lease')
+                return stored_word
+
+            # The holder failed or timed out. Translate on our own
+            return await self._translate_and_store(word, sl, tl)
+
+        # Held until the word is in DB, even if it's written behind: other workers wait for it there
+        release = partial(self.lease_service.release, lease_key, owner)
+
+        try:
+            return await self._translate_and_store(word, sl, tl, on_stored=release)
+        except BaseException:
+            await release()
+            raise
+
+    async def _translate_and_store(self, word: str, sl: str, tl: str, on_stored: OnStored | None = None) \
+            -> WordDocument:
+        if sl == SourceLanguageService.AUTO:
+            return await self._detect_and_store(word, tl, on_stored)
+
+        translated_word = await self.translation_service.get_word_language_from_db(word, sl, tl)
+
+        if translated_word:
+            is_language_available = tl in translated_word['languages']
+
+            # Another worker could have stored it while we were acquiring the lease
+            if is_language_available:
+                if on_stored is not None:
+                    await on_stored()
+
+                translation_lookups.inc('lease')
+                return translated_word
+
+            google_word = await self.google_translate_service.get_translated_word(word, sl, tl)
+            translation_lookups.inc('new_language')
+
+            # Written behind: the response doesn't wait for DB
+            await self.translation_service.queue_new_language(translated_word, tl, google_word.languages[tl],
+                                                              on_stored)
+
+            return self._record_reverse(google_word.model_dump())
+
+        google_word = await self.google_translate_service.get_translated_word(word, sl, tl)
+        translation_lookups.inc('new_word')
+
+        # Written behind: the response doesn't wait for DB
+        await self.translation_service.queue_new_word(google_word, on_stored)
+
+        return self._record_reverse(google_word.model_dump())
+
+    async def _detect_and_store(self, word: str, tl: str, on_stored: OnStored | None = None) -> WordDocument:
+        """
+        Google detects the source language. Stored under it: merged into the word if it's stored already
+        """
+        google_word = await self.google_translate_service.get_translated_word(word, SourceLanguageService.AUTO, tl)
+        translation_lookups.inc('new_word')
+        await self._record_detection(word, google_word.language)
+
+        # Written behind: the response doesn't wait for DB
+        await self.translation_service.queue_new_word(google_word, on_stored)
+
+        return self._record_reverse(google_word.model_dump())
+
+    async def _get_stored_word(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        if sl == SourceLanguageService.AUTO:
+            # Nothing is stored under auto
+            return None
+
+        translated_word = await self.translation_service.get_word_language_from_db(word, sl, tl)
+
+        if translated_word and tl in translated_word['languages']:
+            return translated_word
+
+        return None
+
+    async def _get_leased_word(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        """
+        The word stored by the lease holder. Nothing is stored under auto: the holder records the language
+        Google detected before storing the word, it's resolved again to read the word under it
+        """
+        if sl == SourceLanguageService.AUTO and self.source_language_service is not None:
+            sl = await self.source_language_service.resolve(word) or sl
+
+        return await self._get_stored_word(word, sl, tl)
+
+    async def _resolve_auto_keys(self, keys: list[CacheKey]) -> dict[CacheKey, CacheKey]:
+        auto_words = [word for word, sl, _ in keys if sl == SourceLanguageService.AUTO]
+        resolved = {}
+
+        if auto_words and self.source_language_service is not None:
+            resolved = await self.source_language_service.resolve_many(auto_words)
+
+        return {
+            (word, sl, tl): (clean_word(word), resolved.get(word, sl) if sl == SourceLanguageService.AUTO else sl, tl)
+            for word, sl, tl in keys
+        }
+
+    async def _get_derived_words(self, keys: list[CacheKey]) -> dict[CacheKey, WordDocument]:
+        """
+        Words served derived are upgraded to a full Google lookup in the background, if upgrades are on
+        """
+        keys = [key for key in keys if key[1] != SourceLanguageService.AUTO]
+
+        if not keys or self.reverse_index_service is None:
+            return {}
+
+        derived_words = await self.reverse_index_service.derive_many(keys)
+
+        for word, sl, tl in derived_words:
+            self.reverse_index_service.upgrade(self._upgrade(word, sl, tl))
+
+        return derived_words
+
+    async def _upgrade(self, word: str, sl: str, tl: str) -> None:
+        key = self._key(word, sl, tl)
+
+        try:
+            translated_word = await self.single_flight.do(key, lambda: self._translate_once(word, sl, tl))
+        except Exception as e:
+            # Log upgrade error here. The derived word is served until it expires from the cache
+            return
+
+        await self.cache.set(*key, translated_word, fresh=True)
+
+    def _record_reverse(self, word: WordDocument) -> WordDocument:
+        if self.reverse_index_service is not None:
+            self.reverse_index_service.record(word)
+
+        return word
+
+    async def _record_detection(self, word: str, language: str) -> None:
+        if self.source_language_service is not None:
+            await self.source_language_service.record(word, language)
+
+    @staticmethod
+    def _key(word: str, sl: str, tl: str) -> CacheKey:
+        return normalize_word(word, sl), sl, tl
+
+    def _record_access(self, word: str, sl: str, tl: str) -> None:
+        if self.access_recorder is not None:
+            self.access_recorder.record(word, sl, tl)
+
+    def _batch_success(self, key: CacheKey, word: WordDocument, source: str) -> TranslationBatchItemResponse:
+        return TranslationBatchItemResponse(
+            word=key[0], sl=key[1], tl=key[2], status=self.STATUS_SUCCESS, source=source, data=word
+        )
+
+    def _batch_error(self, key: CacheKey, message: str) -> TranslationBatchItemResponse:
+        return TranslationBatchItemResponse(
+            word=key[0], sl=key[1], tl=key[2], status=self.STATUS_ERROR, message=message
+        )
@@ -0,0 +1,132 @@
+import asyncio
+
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from app.v1.cache.translation import CacheKey
+from app.v1.core.resilience import TokenBucket
+from app.v1.models import WordDocument
+
+Refresh = Callable[[], Awaitable]
+
+
+class TranslationRefresher:
+    """
+    Responsibility: Keep stored translations fresh, stale-while-revalidate.
+
+    A stored language is, by the time it was fetched from Google ("fetchedAt.<tl>", see TranslationRepository):
+    - fresh: fetched within fresh_for seconds. Served as is
+    - stale: older. Served as is, re-fetched in the background (submit)
+    - expired: older than max_age seconds. Re-fetched before it's served (see TranslationLookupService)
+    Languages stored before fetch times were recorded are stale.
+
+    Background refreshes are bounded: at most max_pending keys wait, a key waits once, the rest are dropped
+    (served stale, submitted again by a later read). They're run one at a time, at most rate per second,
+    so they take no more than that of the Google quota the lookups share. They still go through
+    the UpstreamPolicy: a rate limited or open circuit refresh fails, and is retried by a later read.
+    Best effort: stop() drops the pending ones.
+    """
+    FRESH = 'fresh'
+    STALE = 'stale'
+    EXPIRED = 'expired'
+
+    def __init__(self, fresh_for: float, max_age: float, rate: float, max_pending: int,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.fresh_for: float = fresh_for
+        self.max_age: float = max_age
+        self.max_pending: int = max_pending
+        self.clock: Callable[[], datetime] = clock
+        self.rate_limiter: TokenBucket = TokenBucket(rate=rate, capacity=1)
+
+        self.refreshed: int = 0
+        self.failed: int = 0
+        self.dropped: int = 0
+
+        self._pending: dict[CacheKey, Refresh] = {}
+        self._submitted: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def freshness(self, word: WordDocument, tl: str) -> str:
+        fetched_at = (word.get('fetchedAt') or {}).get(tl)
+
+        if fetched_at is None:
+            return self.STALE
+
+        if isinstance(fetched_at, str):
+            # Read back from a shared cache tier
+            fetched_at = datetime.fromisoformat(fetched_at)
+
+        if fetched_at.tzinfo is None:
+            # MongoDB returns naive UTC datetimes
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+
+        age = (self.clock() - fetched_at).total_seconds()
+
+        if age > self.max_age:
+            return self.EXPIRED
+
+        return self.STALE if age > self.fresh_for else self.FRESH
+
+    def submit(self, key: CacheKey, refresh: Refresh) -> bool:
+        if key in self._pending:
+            return True
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        self._pending[key] = refresh
+        self._submitted.set()
+
+        return True
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        self._pending.clear()
+
+    async def drain(self) -> None:
+        """
+        Run the pending refreshes now, at the rate
+        """
+        while self._pending:
+            key = next(iter(self._pending))
+            refresh = self._pending[key]
+            await self.rate_limiter.acquire(max_wait=float('inf'))
+
+            try:
+                await refresh()
+                self.refreshed += 1
+            except Exception as e:
+                # Log refresh error here. Served stale until a later read submits it again
+                self.failed += 1
+            finally:
+                # Removed after the refresh: a read meanwhile doesn't submit it again
+                del self._pending[key]
+
+    def stats(self) -> dict:
+        return {
+            'pending': len(self._pending),
+            'maxPending': self.max_pending,
+            'refreshed': self.refreshed,
+            'failed': self.failed,
+            'dropped': self.dropped,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self._submitted.wait()
+            self._submitted.clear()
+            await self.drain()
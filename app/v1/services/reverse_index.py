@@ -0,0 +1,181 @@
+import asyncio
+
+from datetime import datetime, timezone
+from typing import Coroutine
+
+from app.v1.cache.translation import CacheKey
+from app.v1.core.background import TaskSet
+from app.v1.core.normalization import clean_word, normalize_word
+from app.v1.models import WordDocument
+from app.v1.repositories.reverse_index import IReverseIndex, ReverseKey
+
+
+def merge_entries(target: dict[ReverseKey, dict], entries: dict[ReverseKey, dict]) -> dict[ReverseKey, dict]:
+    """
+    Sources and entries of the same key are merged without duplicates, the first spelling is kept
+    """
+    for key, entry in entries.items():
+        merged = target.setdefault(key, {'word': entry['word'], 'sources': [], 'entries': []})
+        merged['sources'] += [source for source in entry['sources'] if source not in merged['sources']]
+        merged['entries'] += [item for item in entry['entries'] if item not in merged['entries']]
+
+    return target
+
+
+def reverse_entries(word: WordDocument) -> dict[ReverseKey, dict]:
+    """
+    What the stored languages of a word tell about the other direction. For a word W in sl, every tl language:
+    - its text and every translation (by part of speech) are words of tl that translate back to W: sources
+    - the back translations Google lists for a translation are its answers in sl: entries, by part of speech
+    """
+    sl = word.get('language')
+    entries: dict[ReverseKey, dict] = {}
+
+    if not word.get('word') or not sl:
+        return entries
+
+    for tl, language in (word.get('languages') or {}).items():
+        if tl == sl or not language:
+            continue
+
+        texts: dict[str, list[dict]] = {language['text']: []} if language.get('text') else {}
+
+        for pos, translations in (language.get('translations') or {}).items():
+            for translation in translations:
+                texts.setdefault(translation['text'], []).extend(
+                    {'pos': pos, 'text': back_translation} for back_translation in translation['translations']
+                )
+
+        for text, back_translations in texts.items():
+            if text.strip():
+                merge_entries(entries, {(normalize_word(text, tl), tl, sl): {
+                    'word': clean_word(text), 'sources': [word['word']], 'entries': back_translations
+                }})
+
+    return entries
+
+
+class ReverseIndexRecorder:
+    """
+    Responsibility: Build the reverse index incrementally from the words Google translates.
+
+    Entries are merged in memory, off the request path, and flushed as one bulk upsert every flush_interval
+    seconds (like AccessRecorder). Best effort: a failed flush loses its entries, stop() flushes the rest.
+    The index can be rebuilt from the stored words: python -m app.v1.commands.reverse_index
+    """
+
+    def __init__(self, repository: IReverseIndex, flush_interval: float):
+        self.repository: IReverseIndex = repository
+        self.flush_interval: float = flush_interval
+
+        self._entries: dict[ReverseKey, dict] = {}
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, word: WordDocument) -> None:
+        merge_entries(self._entries, reverse_entries(word))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        entries, self._entries = self._entries, {}
+
+        if not entries:
+            return
+
+        try:
+            await self.repository.add(entries, datetime.now(timezone.utc))
+        except Exception as e:
+            # Log write error here
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+class ReverseIndexService:
+    """
+    Responsibility: Answer tl -> sl lookups of words never looked up in that direction from the reverse index,
+    without Google: "reto" es -> en is derived from the stored "challenge" en -> es.
+
+    A derived word is marked with "derived": true. It has what the stored translations tell only:
+    the text (the first word it translates), the back translations by part of speech; no pronunciation,
+    definitions or examples. With upgrades, the full Google lookup of a word served derived is run
+    in the background (see TranslationLookupService), the next lookups get the stored word.
+    """
+    DERIVED = 'derived'
+
+    def __init__(self, repository: IReverseIndex, recorder: ReverseIndexRecorder | None = None,
+                 upgrades: TaskSet | None = None):
+        self.repository: IReverseIndex = repository
+        self.recorder: ReverseIndexRecorder | None = recorder
+        self.upgrades: TaskSet | None = upgrades
+
+    async def derive(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        return (await self.derive_many([(word, sl, tl)])).get((word, sl, tl))
+
+    async def derive_many(self, keys: list[CacheKey]) -> dict[CacheKey, WordDocument]:
+        """
+        Derived words only, one query for all of them. A failing DB derives nothing: Google translates instead
+        """
+        index_keys = {(word, sl, tl): (normalize_word(word, sl), sl, tl) for word, sl, tl in keys}
+
+        try:
+            documents = await self.repository.get_words(list(index_keys.values()))
+        except Exception as e:
+            # Log read error here
+            return {}
+
+        return {key: self._derived_word(documents[index_key]) for key, index_key in index_keys.items()
+                if index_key in documents}
+
+    def record(self, word: WordDocument) -> None:
+        if self.recorder is not None:
+            self.recorder.record(word)
+
+    def upgrade(self, coroutine: Coroutine) -> None:
+        if self.upgrades is None:
+            coroutine.close()
+        else:
+            self.upgrades.spawn(coroutine)
+
+    def _derived_word(self, document: dict) -> WordDocument:
+        translations: dict[str, list[dict]] = {}
+
+        for entry in document['entries']:
+            translations.setdefault(entry['pos'], []).append(
+                {'text': entry['text'], 'translations': [document['word']], 'confidence': None}
+            )
+
+        return {
+            'word': document['word'],
+            'language': document['language'],
+            'pronunciation': None,
+            'languages': {
+                document['tl']: {
+                    'text': document['sources'][0],
+                    'confidence': None,
+                    'pronunciation': None,
+                    'definitions': None,
+                    'examples': None,
+                    'translations': translations or None,
+                },
+            },
+            self.DERIVED: True,
+        }
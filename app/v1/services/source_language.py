@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+from app.v1.core.metrics import auto_resolutions
+from app.v1.core.normalization import normalize_word
+from app.v1.repositories.source_language import ISourceLanguage
+
+
+class SourceLanguageService:
+    """
+    Responsibility: Resolve sl=auto to a stored source language, so auto lookups are served from the cache and DB.
+
+    Every language Google detected for a word is counted (record). Only detections: the sl of a user is no
+    evidence of the language of the word, a word stored with an explicit sl isn't resolved by it.
+    A word resolves to its most detected language if that has at least min_count detections and min_share of them
+    all. Unknown and ambiguous words aren't resolved: they go to Google with sl=auto, and its detection
+    is counted for the next time. Words backfilled from before the detections were counted are seeded apart,
+    detections override the seeds (see ISourceLanguage.seed).
+    Words are counted under their language-neutral key (normalize_word), so case variants share their counts.
+    """
+    AUTO = 'auto'
+    RESOLVED = 'resolved'
+    UNKNOWN = 'unknown'
+    AMBIGUOUS = 'ambiguous'
+
+    def __init__(self, repository: ISourceLanguage, min_count: int = 1, min_share: float = 0.8):
+        self.repository: ISourceLanguage = repository
+        self.min_count: int = min_count
+        self.min_share: float = min_share
+
+    async def resolve(self, word: str) -> str | None:
+        return (await self.resolve_many([word])).get(word)
+
+    async def resolve_many(self, words: list[str]) -> dict[str, str]:
+        """
+        Resolved words only, one query for all of them. A failing DB resolves nothing: Google detects instead.
+        Counted under the language-neutral key: the source language isn't known yet
+        """
+        keys = {word: normalize_word(word) for word in words}
+
+        try:
+            detections = await self.repository.get_languages(list(dict.fromkeys(keys.values())))
+        except Exception as e:
+            # Log read error here
+            detections = {}
+
+        resolved = {}
+
+        for word, key in keys.items():
+            language = self._pick(detections.get(key))
+
+            if language is not None:
+                resolved[word] = language
+
+        return resolved
+
+    async def record(self, word: str, language: str) -> None:
+        try:
+            await self.repository.increment(normalize_word(word), language, datetime.now(timezone.utc))
+        except Exception as e:
+            # Log write error here. The word is resolved the next time it's detected
+            pass
+
+    def _pick(self, languages: dict[str, int] | None) -> str | None:
+        if not languages:
+            auto_resolutions.inc(self.UNKNOWN)
+            return None
+
+        language, count = max(languages.items(), key=lambda item: item[1])
+
+        if count < self.min_count or count < self.min_share * sum(languages.values()):
+            auto_resolutions.inc(self.AMBIGUOUS)
+            return None
+
+        auto_resolutions.inc(self.RESOLVED)
+
+        return language
@@ -1,18 +1,31 @@
-from pymongo.results import InsertOneResult, UpdateResult
+from typing import AsyncIterable, AsyncIterator
 
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult, UpdateResult
+
+from app.v1.cache.translation import ITranslationCache
 from app.v1.core.exceptions import WordNotFoundException
+from app.v1.core.metrics import instrumented
+from app.v1.core.normalization import normalize_word, normalized_variants
 from app.v1.models import Word as WordModel
 from app.v1.models import Language as LanguageModel
+from app.v1.models import WordDocument
 from app.v1.schemas import DeleteWordResponse, TranslationListResponse
 from app.v1.repositories.translation import ITranslation
+from app.v1.services.write_behind import OnStored, WriteBehindQueue
 
 
+@instrumented('translation_service')
 class TranslationService:
     """
     A service layer for managing translations, facilitating interaction
     between the application and the repository layer. It abstracts away
     the details of data access from the application.
 
+    Words are validated (WordModel) on the way in only. Stored words are read as WordDocument:
+    they were validated before they were stored, validating them again on every read is pure CPU.
+
     Attributes:
         DOCUMENT_AFFECTED: A constant used to signify a single document affected in CRUD operations.
         DOCUMENT_DELETED_SUCCESS: Message returned when a word is successfully deleted.
@@ -26,22 +39,92 @@ class TranslationService:
     DOCUMENT_NOT_FOUND = "Word not found"
     STATUS_SUCCESS = "success"
 
-    def __init__(self, repository: ITranslation):
+    def __init__(self, repository: ITranslation, cache: ITranslationCache | None = None,
+                 write_behind: WriteBehindQueue | None = None):
         self.repository: ITranslation = repository
+        self.cache: ITranslationCache | None = cache
+        self.write_behind: WriteBehindQueue | None = write_behind
 
     async def get_list_of_words(self, skip: int = 0, limit: int = 10, sort: str = 'asc',
                                 word='') -> TranslationListResponse:
         return await self.repository.get_list_of_words(skip, limit, sort, word)
 
-    async def add_new_word(self, word: WordModel) -> InsertOneResult | None:
+    async def get_list_of_words_by_prefix(self, limit: int = 10, sort: str = 'asc', prefix: str = '',
+                                          cursor: str | None = None,
+                                          with_count: bool = False) -> TranslationListResponse:
+        return await self.repository.get_list_of_words_by_prefix(limit, sort, prefix, cursor, with_count)
+
+    async def add_new_word(self, word: WordModel) -> UpdateResult | None:
+        """
+        Upsert: if the word was stored meanwhile, its languages are added to it
+        """
         try:
-            return await self.repository.insert_word(word.model_dump())
+            return await self.repository.upsert_word(word.model_dump())
         except Exception as e:
             # Log insertion error here
             return None
 
+    async def queue_new_word(self, word: WordModel, on_stored: OnStored | None = None) -> None:
+        """
+        add_new_word without waiting for DB if write-behind is on. on_stored is awaited once the word is stored
+        """
+        if self.write_behind is None:
+            await self.add_new_word(word)
+            await self._stored(on_stored)
+            return
+
+        await self.write_behind.put_word(word.model_dump(), on_stored)
+
+    async def add_new_words(self, words: list[WordModel]) -> BulkWriteResult | None:
+        if not words:
+            return None
+
+        try:
+            return await self.repository.upsert_words([word.model_dump() for word in words])
+        except Exception as e:
+            # Log insertion error here. Unordered bulk write: the rest of the words are stored
+            return None
+
+    def export_words(self, batch_size: int) -> AsyncIterator[WordDocument]:
+        return self.repository.iter_words(batch_size)
+
+    async def import_words(self, lines: AsyncIterable[bytes], chunk_size: int) -> dict:
+        """
+        Upsert words from NDJSON lines (see export_words), chunk_size words per bulk write.
+        Memory is bounded by one chunk. Lines are client input: every line is validated,
+        invalid ones are counted and skipped.
+        """
+        total = imported = 0
+        chunk = []
+
+        async for line in lines:
+            total += 1
+
+            try:
+                chunk.append(WordModel.model_validate_json(line).model_dump())
+            except ValidationError as e:
+                # Log the invalid line here
+                continue
+
+            if len(chunk) >= chunk_size:
+                imported += await self._import_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            imported += await self._import_chunk(chunk)
+
+        return {
+            'total': total,
+            'imported': imported,
+            'failed': total - imported,
+        }
+
     async def delete_word(self, word: str) -> DeleteWordResponse:
+        if self.write_behind is not None:
+            await self.write_behind.discard(word)
+
         result = await self.repository.delete_word(word)
+        await self._invalidate_cache(word)
 
         if result.deleted_count == self.DOCUMENT_AFFECTED:
             return DeleteWordResponse(
@@ -52,32 +135,138 @@ class TranslationService:
 
         raise WordNotFoundException(f'{self.DOCUMENT_NOT_FOUND}: {word}')
 
-    async def get_word_from_db(self, word: str, sl: str) -> WordModel | None:
+    async def get_word_from_db(self, word: str, sl: str) -> WordDocument | None:
         try:
             word = await self.repository.get_word(word, sl)
-            del word['_id']
+        except Exception as e:
+            # Log retrieval error here
+            return None
+
+        return self._document(word) if word else None
 
-            return WordModel(**word)
+    async def get_word_language_from_db(self, word: str, sl: str, tl: str) -> WordDocument | None:
+        """
+        Loads only the tl language of the word.
+        - None: the word is not in DB
+        - languages == {}: the word is in DB, but tl translation is not
+        """
+        try:
+            word = await self.repository.get_word_language(word, sl, tl)
         except Exception as e:
             # Log retrieval error here
             return None
 
-    async def add_new_language_to_word(self, word: WordModel, language: str,
+        return self._document(word) if word else None
+
+    async def get_words_from_db(self, keys: list[tuple[str, str]],
+                                languages: list[str] | None = None) -> dict[tuple[str, str], WordDocument]:
+        """
+        Fetch many (word, sl) pairs with a single query, only "languages" if given.
+        Keyed by the canonical key (normalize_word(word, sl), sl), missing pairs are left out of the result
+        """
+        try:
+            words = await self.repository.get_words(keys, languages)
+        except Exception as e:
+            # Log retrieval error here
+            return {}
+
+        return {(normalize_word(word['word'], word['language']), word['language']): self._document(word)
+                for word in words}
+
+    async def add_new_languages_to_words(self, items: list[tuple[WordDocument, str, LanguageModel]]) \
+            -> BulkWriteResult | None:
+        """
+        Append one language per item in a single bulk write. Only the new languages are sent,
+        all of a word in one update
+        """
+        if not items:
+            return None
+
+        updates: dict[tuple[str, str], tuple[dict, dict]] = {}
+
+        for word, language, data in items:
+            _, update = updates.setdefault((normalize_word(word['word'], word['language']), word['language']), (
+                {'word': word['word'], 'language': word['language']}, {}
+            ))
+            update[f'languages.{language}'] = data.model_dump()
+
+        try:
+            return await self.repository.update_words(list(updates.values()))
+        except Exception as e:
+            # Log update error here
+            return None
+        finally:
+            for query, _ in updates.values():
+                await self._invalidate_cache(query['word'])
+
+    async def add_new_language_to_word(self, word: WordDocument, language: str,
                                        data: LanguageModel) -> UpdateResult | None:
+        """
+        Sets only the new language in DB ("languages.<language>"), the word document is not changed
+        """
         try:
-            word.languages.update({language: data})
-            dumped_word = word.model_dump()
-            query = {
-                'word': word.word,
-                'language': word.language
-            }
-
-            return await self.repository.update_word(query, {'languages': dumped_word['languages']})
+            return await self.repository.set_word_language(word['word'], word['language'], language,
+                                                           data.model_dump())
         except Exception as e:
             # Log update error here
             return None
+        finally:
+            await self._invalidate_cache(word['word'])
+
+    async def queue_new_language(self, word: WordDocument, language: str, data: LanguageModel,
+                                 on_stored: OnStored | None = None) -> None:
+        """
+        add_new_language_to_word without waiting for DB if write-behind is on.
+        on_stored is awaited once the language is stored
+        """
+        if self.write_behind is None:
+            await self.add_new_language_to_word(word, language, data)
+            await self._stored(on_stored)
+            return
+
+        await self.write_behind.put_language(word['word'], word['language'], language, data.model_dump(), on_stored)
+        await self._invalidate_cache(word['word'])
+
+    def get_only_my_language(self, word: WordDocument, language: str) -> WordDocument:
+        """
+        A copy: stored words may be cached and shared, they are never mutated
+        """
+        fetched_at = word.get('fetchedAt') or {}
+
+        return {**word, 'languages': {language: word['languages'][language]},
+                'fetchedAt': {language: fetched_at[language]} if language in fetched_at else None}
+
+    async def _import_chunk(self, words: list[dict]) -> int:
+        """
+        Returns the number of stored words
+        """
+        try:
+            await self.repository.upsert_words(words)
+            return len(words)
+        except BulkWriteError as e:
+            # Log import error here. Unordered bulk write: the rest of the words are stored
+            return len(words) - len(e.details.get('writeErrors', []))
+        except Exception as e:
+            # Log import error here
+            return 0
+        finally:
+            for word in words:
+                await self._invalidate_cache(word['word'])
+
+    async def _invalidate_cache(self, word: str) -> None:
+        if self.cache is not None:
+            # Cached under the canonical key, whatever the casefolding rules of its sl
+            for variant in normalized_variants(word):
+                await self.cache.invalidate(variant)
 
-    def get_only_my_language(self, word: WordModel, language: str) -> WordModel:
-        word.languages = {language: word.languages[language]}
+    @staticmethod
+    def _document(word: dict) -> WordDocument:
+        """
+        Only the Word fields of a stored document, no _id, normalizedWord etc.
+        """
+        return {field: word.get(field) for field in WordModel.model_fields}
 
-        return word
+    @staticmethod
+    async def _stored(on_stored: OnStored | None) -> None:
+        if on_stored is not None:
+            await on_stored()
@@ -0,0 +1,131 @@
+import json
+
+from pydantic import ValidationError
+
+from app.v1.cache.translation import CacheKey, ITranslationCache
+from app.v1.core.normalization import normalize_word
+from app.v1.core.resilience import TokenBucket
+from app.v1.repositories.access import IAccessStats
+from app.v1.schemas import TranslationBatchItem
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.source_language import SourceLanguageService
+from app.v1.services.translation import TranslationService
+
+
+def read_keys(path: str) -> list[CacheKey]:
+    """
+    Warm-up keys from a JSON lines file: {"word": ..., "sl": ..., "tl": ...} per line,
+    validated like a batch item (sl defaults to auto, tl to en). Invalid lines are skipped
+    """
+    keys = []
+
+    with open(path) as file:
+        for line in file:
+            try:
+                item = TranslationBatchItem.model_validate(json.loads(line))
+            except (ValueError, ValidationError) as e:
+                continue
+
+            keys.append((item.word, item.sl, item.tl))
+
+    return list(dict.fromkeys(keys))
+
+
+class WarmupService:
+    """
+    Responsibility: Fill the translation cache with the most requested keys before traffic arrives.
+
+    - load: stored translations of the keys go to the cache, chunk_size keys per DB query. Nothing else is asked
+    - prefetch: keys that aren't stored yet are resolved through the lookup (Google, then DB and cache)
+      at most prefetch_rate per second, so the warm-up doesn't eat the Google quota of the users
+    Keys come from the access stats (see AccessRecorder) or from a supplied list (read_keys).
+    sl=auto keys are resolved to the stored source language (SourceLanguageService), like the lookups do.
+    """
+
+    def __init__(self, translation_service: TranslationService,
+                 lookup_service: TranslationLookupService,
+                 cache: ITranslationCache,
+                 access_stats: IAccessStats,
+                 chunk_size: int = 500,
+                 prefetch_rate: float = 1,
+                 source_language_service: SourceLanguageService | None = None):
+        self.translation_service: TranslationService = translation_service
+        self.lookup_service: TranslationLookupService = lookup_service
+        self.cache: ITranslationCache = cache
+        self.access_stats: IAccessStats = access_stats
+        self.source_language_service: SourceLanguageService | None = source_language_service
+        self.chunk_size: int = chunk_size
+        self.rate_limiter: TokenBucket = TokenBucket(rate=prefetch_rate, capacity=1)
+
+        self.loaded: int = 0
+        self.prefetched: int = 0
+        self.failed: int = 0
+
+    async def get_keys(self, limit: int, path: str = '') -> list[CacheKey]:
+        keys = read_keys(path) if path else await self.access_stats.get_top(limit)
+
+        # Keys of a file may be any spelling, the cache is keyed by the canonical one
+        keys = dict.fromkeys((normalize_word(word, sl), sl, tl) for word, sl, tl in keys if sl != tl)
+
+        return list(keys)[:limit]
+
+    async def load(self, keys: list[CacheKey]) -> list[CacheKey]:
+        """
+        Returns the keys that aren't stored yet
+        """
+        missing = []
+
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start:start + self.chunk_size]
+            lookup_keys = await self._resolve_auto_keys(chunk)
+            stored_words = await self.translation_service.get_words_from_db(
+                list({(word, sl) for word, sl, _ in lookup_keys.values() if sl != SourceLanguageService.AUTO}),
+                list({tl for _, _, tl in chunk})
+            )
+
+            for key in chunk:
+                word, sl, tl = lookup_keys[key]
+                stored_word = stored_words.get((normalize_word(word, sl), sl))
+
+                if stored_word and tl in stored_word['languages']:
+                    only_my_language = self.translation_service.get_only_my_language(stored_word, tl)
+
+                    # Under the requested key, and under the resolved one (see TranslationLookupService)
+                    for cache_key in dict.fromkeys([key, (normalize_word(word, sl), sl, tl)]):
+                        await self.cache.set(*cache_key, only_my_language)
+
+                    self.loaded += 1
+                else:
+                    missing.append(key)
+
+        return missing
+
+    async def prefetch(self, keys: list[CacheKey]) -> None:
+        for key in keys:
+            await self.rate_limiter.acquire(max_wait=float('inf'))
+
+            try:
+                await self.lookup_service.get_word(*key)
+                self.prefetched += 1
+            except Exception as e:
+                # Log prefetch error here. Upstream unavailable or rate limited: the users come first
+                self.failed += 1
+
+    async def _resolve_auto_keys(self, keys: list[CacheKey]) -> dict[CacheKey, CacheKey]:
+        auto_words = [word for word, sl, _ in keys if sl == SourceLanguageService.AUTO]
+        resolved = {}
+
+        if auto_words and self.source_language_service is not None:
+            resolved = await self.source_language_service.resolve_many(auto_words)
+
+        return {
+            (word, sl, tl): (word, resolved.get(word, sl) if sl == SourceLanguageService.AUTO else sl, tl)
+            for word, sl, tl in keys
+        }
+
+    def stats(self) -> dict:
+        return {
+            'loaded': self.loaded,
+            'prefetched': self.prefetched,
+            'failed': self.failed,
+        }
@@ -0,0 +1,183 @@
+import asyncio
+
+from typing import Awaitable, Callable
+
+from app.v1.core.normalization import normalize_word, normalized_variants
+from app.v1.repositories.translation import ITranslation
+
+OnStored = Callable[[], Awaitable[None]]
+
+
+class PendingWrite:
+    """
+    Everything queued for one (word, sl) since the last flush
+    - fields: top-level fields of a new word (upsert), None if only languages were added to a stored word
+    - languages: languages to $set, the latest write of a language wins
+    - on_stored: callbacks awaited once the write is done
+    """
+
+    def __init__(self):
+        self.fields: dict | None = None
+        self.languages: dict[str, dict] = {}
+        self.on_stored: list[OnStored] = []
+
+
+class WriteBehindQueue:
+    """
+    Responsibility: Persist new words and languages off the request path.
+
+    - Writes of the same (word, sl) are coalesced until flushed
+    - Flushed with one bulk write when batch_size keys are pending or every flush_interval seconds
+    - Back-pressure: put_* waits while max_size keys are pending
+    - stop() drains the queue
+    Write errors are swallowed, like the synchronous writes: the translation is served anyway.
+    """
+
+    def __init__(self, repository: ITranslation, max_size: int, batch_size: int, flush_interval: float):
+        self.repository: ITranslation = repository
+        self.max_size: int = max_size
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+
+        self._pending: dict[tuple[str, str], PendingWrite] = {}
+        self._space: asyncio.Condition = asyncio.Condition()
+        self._flush_requested: asyncio.Event = asyncio.Event()
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closed: bool = False
+
+        self.flushes: int = 0
+        self.written: int = 0
+        self.failed: int = 0
+        self.coalesced: int = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._closed = True
+        self._flush_requested.set()
+
+        if self._task:
+            await self._task
+
+        await self.flush()
+
+    async def put_word(self, word: dict, on_stored: OnStored | None = None) -> None:
+        entry = await self._entry(self._key(word['word'], word['language']), on_stored)
+        entry.fields = {key: value for key, value in word.items() if key != 'languages'}
+        entry.languages.update(word['languages'])
+
+    async def put_language(self, word: str, sl: str, language: str, data: dict,
+                           on_stored: OnStored | None = None) -> None:
+        entry = await self._entry(self._key(word, sl), on_stored)
+        entry.languages[language] = data
+
+    async def discard(self, word: str) -> None:
+        """
+        Forget pending writes of a deleted word, so a flush doesn't bring it back.
+        Waits for a flush in progress: a batch it already took is written before the word is deleted.
+        Their on_stored callbacks are still awaited: they release leases other workers wait on
+        """
+        variants = normalized_variants(word)
+
+        async with self._flush_lock:
+            entries = [self._pending.pop(key) for key in [key for key in self._pending if key[0] in variants]]
+
+        async with self._space:
+            self._space.notify_all()
+
+        for entry in entries:
+            await self._stored(entry)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._pending:
+                keys = list(self._pending)[:self.batch_size]
+                batch = {key: self._pending.pop(key) for key in keys}
+
+                async with self._space:
+                    self._space.notify_all()
+
+                await self._write(batch)
+
+    def stats(self) -> dict:
+        return {
+            'pending': len(self._pending),
+            'maxSize': self.max_size,
+            'flushes': self.flushes,
+            'written': self.written,
+            'failed': self.failed,
+            'coalesced': self.coalesced,
+        }
+
+    @staticmethod
+    def _key(word: str, sl: str) -> tuple[str, str]:
+        """
+        Case and Unicode variants of a word are one pending write (see normalize_word)
+        """
+        return normalize_word(word, sl), sl
+
+    async def _entry(self, key: tuple[str, str], on_stored: OnStored | None) -> PendingWrite:
+        async with self._space:
+            await self._space.wait_for(lambda: key in self._pending or len(self._pending) < self.max_size)
+
+        if key in self._pending:
+            self.coalesced += 1
+
+        entry = self._pending.setdefault(key, PendingWrite())
+
+        if on_stored:
+            entry.on_stored.append(on_stored)
+
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+
+        return entry
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def _write(self, batch: dict[tuple[str, str], PendingWrite]) -> None:
+        words = []
+        updates = []
+
+        for (word, sl), entry in batch.items():
+            if entry.fields is not None:
+                words.append({**entry.fields, 'languages': entry.languages})
+            else:
+                updates.append((
+                    {'word': word, 'language': sl},
+                    {f'languages.{language}': data for language, data in entry.languages.items()}
+                ))
+
+        try:
+            await self.repository.save_words(words, updates)
+            self.written += len(batch)
+        except Exception as e:
+            # Log write error here
+            self.failed += len(batch)
+
+        self.flushes += 1
+
+        for entry in batch.values():
+            await self._stored(entry)
+
+    @staticmethod
+    async def _stored(entry: PendingWrite) -> None:
+        for on_stored in entry.on_stored:
+            try:
+                await on_stored()
+            except Exception as e:
+                # Log callback error here
+                pass
@@ -0,0 +1,303 @@
+"""
+Load benchmark of the whole app, in-process: no Mongo, no Google, no network.
+
+The real FastAPI app (middlewares, routing, validation, services, cache, write-behind) is driven through
+httpx's ASGI transport. The repositories are the in-memory stubs, Google is FakeTranslator (tests/stubs)
+with --latency and --error-rate. Requests are a mix of:
+- hot: GET /v1/translations/{word}, words of a --vocabulary drawn from a Zipf distribution (--zipf)
+- auto: the same with sl=auto (not in the default mix)
+- cold: GET /v1/translations/{word} of a word never asked before, always a Google lookup
+- list: GET /v1/translations, a fast mode prefix page
+- delete: DELETE /v1/translations/{word} of a vocabulary word, it goes cold again
+
+Reports RPS and p50/p95/p99 per kind. Results are stored as JSON (--output, by default
+tests/benchmarks/results/<version>-<commit>.json), --compare prints the change against a stored run.
+The numbers are only comparable between runs on the same machine with the same options.
+
+Usage: python -m tests.benchmarks.load [--requests 5000] [--concurrency 50] [--mix hot=90 cold=5 list=4 delete=1]
+                                       [--latency 0.05] [--error-rate 0] [--compare results/old.json]
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import platform
+import random
+import subprocess
+import time
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from app.main import app
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.background import TaskSet
+from app.v1.core.config import settings
+from app.v1.core.loop import LoopLagMonitor
+from app.v1.core.singleflight import SingleFlight
+from app.v1.db.codec import DocumentCodec
+from app.v1.services.google_translate import create_upstream_policy
+from app.v1.services.refresh import TranslationRefresher
+from app.v1.services.reverse_index import ReverseIndexRecorder
+from app.v1.services.write_behind import WriteBehindQueue
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+from tests.stubs.reverse_index import InMemoryReverseIndexRepository
+from tests.stubs.source_language import InMemorySourceLanguageRepository
+from tests.stubs.translator import FakeTranslator
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+KINDS = ('hot', 'auto', 'cold', 'list', 'delete')
+DEFAULT_MIX = {'hot': 90, 'cold': 5, 'list': 4, 'delete': 1}
+PERCENTILES = (50, 95, 99)
+
+
+@asynccontextmanager
+async def in_process_app(latency: float, error_rate: float, google_rate: float, seed: int):
+    """
+    The application state of the lifespan, with the in-memory repositories and the fake translator.
+    Set on app.state, not with dependency_overrides: with any override FastAPI rebuilds every dependency
+    of every request, which would dominate the numbers
+    """
+    repository = InMemoryTranslationRepository()
+
+    app.state.document_codec = DocumentCodec.from_settings(settings)
+    app.state.translation_cache = TieredTranslationCache(LocalTranslationCache(
+        max_size=settings.TRANSLATION_CACHE_MAX_SIZE,
+        ttl=settings.TRANSLATION_CACHE_TTL,
+        negative_ttl=settings.TRANSLATION_CACHE_NEGATIVE_TTL,
+    ))
+    app.state.single_flight = SingleFlight()
+    app.state.translator = FakeTranslator(latency=latency, error_rate=error_rate, seed=seed)
+    app.state.upstream_policy = create_upstream_policy(settings.model_copy(update={
+        'GOOGLE_TRANSLATE_RATE_LIMIT': google_rate,
+        'GOOGLE_TRANSLATE_RATE_BURST': google_rate,
+    }))
+    app.state.write_behind = WriteBehindQueue(
+        repository,
+        max_size=settings.WRITE_BEHIND_MAX_SIZE,
+        batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+        flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL,
+    )
+    app.state.write_behind.start()
+    app.state.access_recorder = None
+    app.state.loop_monitor = LoopLagMonitor(settings.HEALTH_LOOP_LAG_INTERVAL)
+    app.state.index_error = None
+    app.state.translation_repository = repository
+    app.state.lease_repository = InMemoryLeaseRepository()
+    app.state.source_language_repository = InMemorySourceLanguageRepository()
+    app.state.reverse_index_repository = InMemoryReverseIndexRepository()
+    app.state.reverse_index_recorder = ReverseIndexRecorder(app.state.reverse_index_repository,
+                                                            flush_interval=settings.REVERSE_INDEX_FLUSH_INTERVAL)
+    app.state.reverse_index_recorder.start()
+    app.state.background_tasks = TaskSet(settings.REVERSE_INDEX_MAX_UPGRADES)
+    app.state.translation_refresher = TranslationRefresher(
+        fresh_for=settings.TRANSLATION_FRESH_FOR,
+        max_age=settings.TRANSLATION_MAX_AGE,
+        rate=settings.TRANSLATION_REFRESH_RATE,
+        max_pending=settings.TRANSLATION_REFRESH_MAX_PENDING,
+    )
+    app.state.translation_refresher.start()
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://benchmark') as client:
+            yield client
+    finally:
+        await app.state.background_tasks.stop()
+        await app.state.translation_refresher.stop()
+        await app.state.reverse_index_recorder.stop()
+        await app.state.write_behind.stop()
+
+
+class Workload:
+    """
+    Endless stream of (kind, method, url), reproducible for a seed
+    """
+
+    def __init__(self, mix: dict[str, float], vocabulary: int, zipf: float, seed: int):
+        self.random: random.Random = random.Random(seed)
+        self.kinds: list[str] = list(mix)
+        self.kind_weights: list[float] = list(itertools.accumulate(mix.values()))
+        self.words: list[str] = [f'word{rank:05d}' for rank in range(1, vocabulary + 1)]
+        # Rank k is asked with weight 1 / k^s
+        self.word_weights: list[float] = list(itertools.accumulate(1 / rank ** zipf
+                                                                   for rank in range(1, vocabulary + 1)))
+        self.cold: itertools.count = itertools.count()
+
+    def next(self) -> tuple[str, str, str]:
+        kind = self.random.choices(self.kinds, cum_weights=self.kind_weights)[0]
+
+        if kind == 'hot':
+            return kind, 'GET', f'/v1/translations/{self._hot_word()}?sl=en&tl=es'
+        if kind == 'auto':
+            return kind, 'GET', f'/v1/translations/{self._hot_word()}?sl=auto&tl=es'
+        if kind == 'cold':
+            return kind, 'GET', f'/v1/translations/cold{next(self.cold):07d}?sl=en&tl=es'
+        if kind == 'list':
+            return kind, 'GET', f'/v1/translations/?mode=fast&word=word{self.random.randint(0, 9)}&limit=10'
+        if kind == 'delete':
+            return kind, 'DELETE', f'/v1/translations/{self._hot_word()}'
+
+        raise ValueError(f'Unknown request kind {kind}')
+
+    def _hot_word(self) -> str:
+        index = bisect.bisect_left(self.word_weights, self.random.random() * self.word_weights[-1])
+
+        return self.words[min(index, len(self.words) - 1)]
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """
+    Nearest-rank percentile of sorted values
+    """
+    if not sorted_values:
+        return 0.0
+
+    return sorted_values[max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))]
+
+
+def summarize(latencies: list[float], statuses: dict[int, int], seconds: float) -> dict:
+    latencies = sorted(latencies)
+
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / seconds if seconds else 0.0,
+        **{f'p{p}Ms': percentile(latencies, p) * 1000 for p in PERCENTILES},
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+async def run(requests: int, concurrency: int, mix: dict[str, float], vocabulary: int, zipf: float,
+              latency: float, error_rate: float, google_rate: float, seed: int) -> dict:
+    workload = Workload(mix, vocabulary, zipf, seed)
+    latencies: dict[str, list[float]] = {kind: [] for kind in mix}
+    statuses: dict[str, dict[int, int]] = {kind: {} for kind in mix}
+    remaining = itertools.count()
+
+    async with in_process_app(latency, error_rate, google_rate, seed) as client:
+        async def user():
+            while next(remaining) < requests:
+                kind, method, url = workload.next()
+                started_at = time.perf_counter()
+                response = await client.request(method, url)
+                latencies[kind].append(time.perf_counter() - started_at)
+                statuses[kind][response.status_code] = statuses[kind].get(response.status_code, 0) + 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*[user() for _ in range(concurrency)])
+        seconds = time.perf_counter() - started_at
+
+    total_statuses: dict[int, int] = {}
+
+    for kind_statuses in statuses.values():
+        for status, count in kind_statuses.items():
+            total_statuses[status] = total_statuses.get(status, 0) + count
+
+    return {
+        'total': summarize(list(itertools.chain(*latencies.values())), total_statuses, seconds),
+        'kinds': {kind: summarize(latencies[kind], statuses[kind], seconds) for kind in mix if latencies[kind]},
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(result: dict, baseline: dict) -> list[str]:
+    lines = [f'Compared to {baseline["version"]} ({baseline["commit"]}, {baseline["createdAt"]}):']
+
+    for kind, summary in [('total', result['total']), *result['kinds'].items()]:
+        before = baseline['total'] if kind == 'total' else baseline['kinds'].get(kind)
+
+        if not before:
+            continue
+
+        changes = [f'{metric} {(summary[metric] / before[metric] - 1) * 100:+.1f}%'
+                   for metric in ('rps', *(f'p{p}Ms' for p in PERCENTILES)) if before[metric]]
+        lines.append(f'  {kind}: {", ".join(changes)}')
+
+    return lines
+
+
+def report(result: dict) -> list[str]:
+    lines = []
+
+    for kind, summary in [('total', result['total']), *result['kinds'].items()]:
+        percentiles = ' '.join(f'p{p}={summary[f"p{p}Ms"]:.2f}ms' for p in PERCENTILES)
+        lines.append(f'{kind:>6}: {summary["requests"]} requests, {summary["rps"]:.0f} rps, {percentiles}, '
+                     f'statuses {summary["statuses"]}')
+
+    return lines
+
+
+def parse_mix(values: list[str]) -> dict[str, float]:
+    mix = {}
+
+    for value in values:
+        kind, _, weight = value.partition('=')
+
+        if kind not in KINDS or not weight:
+            raise argparse.ArgumentTypeError(f'Expected kind=weight with kind in {list(KINDS)}, got {value}')
+
+        mix[kind] = float(weight)
+
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load benchmark of the app with in-memory dependencies')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--mix', nargs='+', default=[f'{kind}={weight}' for kind, weight in DEFAULT_MIX.items()],
+                        help=f'kind=weight, kinds: {", ".join(KINDS)}')
+    parser.add_argument('--vocabulary', type=int, default=2000, help='Number of hot words')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Exponent of the hot words distribution')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds every Google call takes')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of failing Google calls')
+    parser.add_argument('--google-rate', type=float, default=0, help='Google calls per second, 0 is unlimited')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', type=Path, help='Where to store the results (JSON)')
+    parser.add_argument('--compare', type=Path, help='Stored results to compare with')
+    args = parser.parse_args()
+
+    options = {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'mix': parse_mix(args.mix),
+        'vocabulary': args.vocabulary,
+        'zipf': args.zipf,
+        'latency': args.latency,
+        'error_rate': args.error_rate,
+        'google_rate': args.google_rate,
+        'seed': args.seed,
+    }
+    result = {
+        'version': settings.APP_VERSION,
+        'commit': git_commit(),
+        'createdAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'options': options,
+        **asyncio.run(run(**options)),
+    }
+
+    print('\n'.join(report(result)))
+
+    if args.compare:
+        print('\n'.join(compare(result, json.loads(args.compare.read_text()))))
+
+    output = args.output or RESULTS_DIR / f'{result["version"]}-{result["commit"]}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f'Stored in {output}')
+
+
+if __name__ == '__main__':
+    main()
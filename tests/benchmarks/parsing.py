@@ -0,0 +1,65 @@
+"""
+Google response parsing benchmark.
+
+Enlarges the stub payload (definitions, all-translations and examples repeated N times)
+and times GoogleTranslateService.get_model on it.
+
+Usage: python -m tests.benchmarks.parsing [--sizes 1 50 200] [--number 100] [--repeat 5]
+"""
+import argparse
+import copy
+import timeit
+
+from aiogoogletrans.models import Translated
+
+from app.v1.services.google_translate import GoogleTranslateService
+from tests.stubs.word import word as word_stub
+
+
+def enlarge(n: int) -> Translated:
+    extra_data = copy.deepcopy(word_stub['extra_data'])
+    extra_data['definitions'] = [
+        [part_of_speech, definitions * n, *rest] for part_of_speech, definitions, *rest in extra_data['definitions']
+    ]
+    extra_data['all-translations'] = [
+        [part_of_speech, texts, translations * n, *rest]
+        for part_of_speech, texts, translations, *rest in extra_data['all-translations']
+    ]
+    extra_data['examples'] = [extra_data['examples'][0] * n]
+
+    return Translated(
+        src=word_stub['src'],
+        dest=word_stub['dest'],
+        origin=word_stub['word'],
+        text=word_stub['text'],
+        pronunciation=None,
+        extra_data=extra_data,
+    )
+
+
+def run(sizes: list[int], number: int, repeat: int = 5) -> list[dict]:
+    service = GoogleTranslateService(None)
+    results = []
+
+    for n in sizes:
+        data = enlarge(n)
+        # The best of a few repeats: the least disturbed by the rest of the machine
+        seconds = min(timeit.repeat(lambda: service.get_model(data), number=number, repeat=repeat))
+        results.append({'size': n, 'number': number, 'usPerCall': seconds / number * 1_000_000})
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Google response parsing')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 50, 200])
+    parser.add_argument('--number', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for result in run(args.sizes, args.number, args.repeat):
+        print(f'x{result["size"]}: {result["usPerCall"]:.1f} us per call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from pymongo.errors import DuplicateKeyError
+
+from app.v1.repositories.lease import ILease
+
+
+class InMemoryLeaseRepository(ILease):
+    """
+    ILease kept in a dict. Shared between services to play several workers.
+    """
+
+    def __init__(self):
+        self.leases: dict[str, dict] = {}
+
+    async def insert_lease(self, key: str, owner: str, expires_at: datetime):
+        if key in self.leases:
+            raise DuplicateKeyError(f'Lease {key} exists')
+
+        self.leases[key] = {'_id': key, 'owner': owner, 'expiresAt': expires_at}
+
+        return MagicMock(inserted_id=key)
+
+    async def take_over_expired_lease(self, key: str, owner: str, expires_at: datetime, now: datetime):
+        lease = self.leases.get(key)
+
+        if lease and lease['expiresAt'] <= now:
+            lease.update(owner=owner, expiresAt=expires_at)
+
+            return MagicMock(modified_count=1)
+
+        return MagicMock(modified_count=0)
+
+    async def get_lease(self, key: str) -> dict | None:
+        return self.leases.get(key)
+
+    async def delete_lease(self, key: str, owner: str):
+        lease = self.leases.get(key)
+
+        if lease and lease['owner'] == owner:
+            del self.leases[key]
+
+            return MagicMock(deleted_count=1)
+
+        return MagicMock(deleted_count=0)
@@ -0,0 +1,198 @@
+import copy
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from app.v1.core.normalization import normalize_word, normalized_variants
+from app.v1.repositories.translation import ITranslation, decode_cursor, encode_cursor
+from app.v1.schemas import TranslationListResponse
+
+
+class InMemoryTranslationRepository(ITranslation):
+    """
+    ITranslation kept in a list of documents. Supports the subset of MongoDB the app uses.
+    """
+
+    def __init__(self):
+        self.documents: list[dict] = []
+        self.queries: int = 0
+        self.writes: int = 0
+        self._next_id: int = 0
+
+    async def get_word(self, word: str, sl: str) -> dict | None:
+        self.queries += 1
+
+        key = normalize_word(word, sl)
+
+        for document in self.documents:
+            if document['normalizedWord'] == key and document['language'] == sl:
+                return copy.deepcopy(document)
+
+        return None
+
+    async def get_word_language(self, word: str, sl: str, tl: str) -> dict | None:
+        document = await self.get_word(word, sl)
+
+        if document is None:
+            return None
+
+        document['languages'] = {language: data for language, data in document['languages'].items() if language == tl}
+        document['fetchedAt'] = {language: at for language, at in document['fetchedAt'].items() if language == tl}
+
+        return document
+
+    async def get_words(self, keys: list[tuple[str, str]], languages: list[str] | None = None) -> list[dict]:
+        self.queries += 1
+        keys = {(normalize_word(word, sl), sl) for word, sl in keys}
+        documents = [copy.deepcopy(document) for document in self.documents
+                     if (document['normalizedWord'], document['language']) in keys]
+
+        if languages is not None:
+            for document in documents:
+                document['languages'] = {language: data for language, data in document['languages'].items()
+                                         if language in languages}
+                document['fetchedAt'] = {language: at for language, at in document['fetchedAt'].items()
+                                         if language in languages}
+
+        return documents
+
+    async def iter_words(self, batch_size: int):
+        self.queries += 1
+
+        for document in self.documents:
+            yield {key: copy.deepcopy(value) for key, value in document.items() if key not in ('_id', 'normalizedWord')}
+
+    async def insert_word(self, word: dict):
+        self.writes += 1
+        self._insert(word)
+
+        return MagicMock(inserted_id=word['_id'])
+
+    async def upsert_word(self, word: dict):
+        self.writes += 1
+
+        return MagicMock(modified_count=self._upsert(word))
+
+    async def upsert_words(self, words: list[dict]):
+        self.writes += 1
+
+        return MagicMock(modified_count=sum(self._upsert(word) for word in words))
+
+    async def delete_word(self, word: str):
+        self.writes += 1
+
+        variants = normalized_variants(word)
+
+        for index, document in enumerate(self.documents):
+            if document['normalizedWord'] in variants:
+                del self.documents[index]
+
+                return MagicMock(deleted_count=1)
+
+        return MagicMock(deleted_count=0)
+
+    async def update_word(self, query: dict, data: dict):
+        self.writes += 1
+
+        return MagicMock(modified_count=self._update(query, data))
+
+    async def save_words(self, words: list[dict], updates: list[tuple[dict, dict]]):
+        self.writes += 1
+        modified = sum(self._upsert(word) for word in words)
+        modified += sum(self._update(query, data) for query, data in updates)
+
+        return MagicMock(modified_count=modified)
+
+    async def set_word_language(self, word: str, sl: str, language: str, data: dict):
+        self.writes += 1
+
+        return MagicMock(modified_count=self._update({'word': word, 'language': sl}, {f'languages.{language}': data}))
+
+    async def update_words(self, updates: list[tuple[dict, dict]]):
+        self.writes += 1
+
+        return MagicMock(modified_count=sum(self._update(query, data) for query, data in updates))
+
+    async def get_list_of_words(self, skip: int = 0, limit: int = 10, sort: str = 'asc',
+                                word: str = '') -> TranslationListResponse:
+        self.queries += 1
+        words = sorted((document for document in self.documents if word.lower() in document['word'].lower()),
+                       key=lambda document: document['word'], reverse=sort == 'desc')
+
+        return TranslationListResponse(
+            meta={'totalPages': len(words), 'skip': skip, 'limit': limit},
+            data=[{'word': document['word'], 'language': document['language']}
+                  for document in words[skip:skip + limit]]
+        )
+
+    async def get_list_of_words_by_prefix(self, limit: int = 10, sort: str = 'asc', prefix: str = '',
+                                          cursor: str | None = None,
+                                          with_count: bool = False) -> TranslationListResponse:
+        self.queries += 1
+        prefix = normalize_word(prefix)
+        words = sorted((document for document in self.documents if document['normalizedWord'].startswith(prefix)),
+                       key=lambda document: (document['normalizedWord'], document['_id']), reverse=sort == 'desc')
+        total_count = len(words)
+
+        if cursor:
+            last = decode_cursor(cursor)
+            words = [document for document in words if ((document['normalizedWord'], document['_id']) < last
+                                                         if sort == 'desc' else
+                                                         (document['normalizedWord'], document['_id']) > last)]
+
+        page = words[:limit]
+        meta = {
+            'limit': limit,
+            'next': encode_cursor(page[-1]['normalizedWord'], page[-1]['_id']) if len(words) > limit else None,
+        }
+
+        if with_count:
+            meta['totalPages'] = total_count
+
+        return TranslationListResponse(
+            meta=meta,
+            data=[{'word': document['word'], 'language': document['language']} for document in page]
+        )
+
+    def _insert(self, word: dict) -> None:
+        self._next_id += 1
+        word['_id'] = self._next_id
+        word['normalizedWord'] = normalize_word(word['word'], word['language'])
+        word['fetchedAt'] = {language: (word.get('fetchedAt') or {}).get(language) or datetime.now(timezone.utc)
+                             for language in word['languages']}
+        self.documents.append(copy.deepcopy(word))
+
+    def _upsert(self, word: dict) -> int:
+        query = {'word': word['word'], 'language': word['language']}
+        languages = {f'languages.{language}': data for language, data in word['languages'].items()}
+        languages.update({f'fetchedAt.{language}': (word.get('fetchedAt') or {}).get(language)
+                          or datetime.now(timezone.utc) for language in word['languages']})
+
+        if self._update(query, languages):
+            return 1
+
+        self._insert(word)
+
+        return 0
+
+    def _update(self, query: dict, data: dict) -> int:
+        if 'word' in query:
+            query = {'normalizedWord': normalize_word(query['word'], query['language']), 'language': query['language']}
+
+        data = {**{f'fetchedAt.{path.split(".", 1)[1]}': datetime.now(timezone.utc)
+                   for path in data if path.startswith('languages.')}, **data}
+
+        for document in self.documents:
+            if all(document.get(field) == value for field, value in query.items()):
+                for path, value in data.items():
+                    *parents, field = path.split('.')
+                    target = document
+
+                    for parent in parents:
+                        target = target.setdefault(parent, {})
+
+                    target[field] = copy.deepcopy(value)
+
+                return 1
+
+        return 0
@@ -0,0 +1,37 @@
+import copy
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from app.v1.repositories.reverse_index import IReverseIndex, ReverseKey
+from app.v1.services.reverse_index import merge_entries
+
+
+class InMemoryReverseIndexRepository(IReverseIndex):
+    """
+    IReverseIndex kept in a dict: (normalizedWord, language, tl) -> {'word', 'sources', 'entries'}
+    """
+
+    def __init__(self):
+        self.entries: dict[ReverseKey, dict] = {}
+        self.queries: int = 0
+        self.writes: int = 0
+
+    async def add(self, entries: dict[ReverseKey, dict], now: datetime):
+        self.writes += 1
+        merge_entries(self.entries, copy.deepcopy(entries))
+
+        return MagicMock(upserted_count=len(entries))
+
+    async def get_words(self, keys: list[ReverseKey]) -> dict[ReverseKey, dict]:
+        self.queries += 1
+
+        return {
+            key: {**copy.deepcopy(self.entries[key]), 'normalizedWord': key[0], 'language': key[1], 'tl': key[2]}
+            for key in keys if key in self.entries
+        }
+
+    async def clear(self):
+        deleted, self.entries = len(self.entries), {}
+
+        return MagicMock(deleted_count=deleted)
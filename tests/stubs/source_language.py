@@ -0,0 +1,33 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from app.v1.repositories.source_language import ISourceLanguage
+
+
+class InMemorySourceLanguageRepository(ISourceLanguage):
+    """
+    ISourceLanguage kept in dicts: word -> {language: detections}, word -> {language: 1} (seeds)
+    """
+
+    def __init__(self):
+        self.languages: dict[str, dict[str, int]] = {}
+        self.seeds: dict[str, dict[str, int]] = {}
+        self.queries: int = 0
+
+    async def increment(self, word: str, language: str, now: datetime):
+        languages = self.languages.setdefault(word, {})
+        languages[language] = languages.get(language, 0) + 1
+
+        return MagicMock(modified_count=1)
+
+    async def get_languages(self, words: list[str]) -> dict[str, dict[str, int]]:
+        self.queries += 1
+
+        return {word: dict(self.languages.get(word) or self.seeds[word]) for word in words
+                if word in self.languages or word in self.seeds}
+
+    async def seed(self, pairs: list[tuple[str, str]], now: datetime):
+        for word, language in pairs:
+            self.seeds.setdefault(word, {})[language] = 1
+
+        return MagicMock(modified_count=len(pairs))
@@ -0,0 +1,47 @@
+import asyncio
+import random
+
+import httpx
+
+from aiogoogletrans.models import Translated
+
+from tests.stubs.word import word as word_stub
+
+
+class FakeTranslator:
+    """
+    Local stand-in for aiogoogletrans.Translator. Every word translates like the word stub.
+
+    :param latency: seconds every call takes
+    :param error_rate: share of calls failing with a transient (network) error
+    :param errors: exceptions raised by the next calls, in order, before error_rate applies
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, errors: list[Exception] | None = None,
+                 seed: int | None = None):
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.errors: list[Exception] = list(errors or [])
+        self.random: random.Random = random.Random(seed)
+        self.calls: int = 0
+
+    async def translate(self, text: str, dest: str = 'en', src: str = 'auto', **kwargs) -> Translated:
+        self.calls += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.errors:
+            raise self.errors.pop(0)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise httpx.ConnectError('Fake connection error')
+
+        return Translated(
+            src=word_stub['src'] if src == 'auto' else src,
+            dest=dest,
+            origin=text,
+            text=word_stub['text'],
+            pronunciation=word_stub['pronunciation'],
+            extra_data=word_stub['extra_data'],
+        )
@@ -0,0 +1,185 @@
+import pytest
+
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+
+from app.main import app
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.exceptions import GoogleTranslateRequestException
+from app.v1.core.singleflight import SingleFlight
+from app.v1.dependencies import get_translation_lookup_service
+from app.v1.models import Word, Language
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.translation import TranslationService
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+
+
+def google_word(word: str, sl: str, tl: str) -> Word:
+    if word == 'broken':
+        raise GoogleTranslateRequestException('boom')
+
+    return Word(word=word, language=sl, pronunciation=None, languages={
+        tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)
+    })
+
+
+@pytest.fixture
+def repository():
+    return InMemoryTranslationRepository()
+
+
+@pytest.fixture
+def google_translate_service():
+    service = MagicMock()
+    service.get_translated_word = AsyncMock(side_effect=google_word)
+
+    return service
+
+
+@pytest.fixture
+def lookup(repository, google_translate_service):
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=60))
+
+    return TranslationLookupService(
+        TranslationService(repository, cache),
+        google_translate_service,
+        cache,
+        SingleFlight(),
+        LeaseService(InMemoryLeaseRepository(), ttl=5, poll_interval=0.01, wait_timeout=1),
+        batch_concurrency=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_status_per_item(lookup, repository):
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+
+    items = await lookup.get_words([
+        ('challenge', 'en', 'es'),
+        ('challenge', 'en', 'de'),
+        ('dare', 'en', 'es'),
+        ('dare', 'en', 'de'),
+        ('broken', 'en', 'es'),
+        ('same', 'en', 'en'),
+    ])
+
+    assert [(item.status, item.source) for item in items] == [
+        ('success', 'db'),
+        ('success', 'google'),
+        ('success', 'google'),
+        ('success', 'google'),
+        ('error', None),
+        ('error', None),
+    ]
+    assert items[1].data['languages']['de']['text'] == 'challenge-de'
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_bulk_reads_and_writes(lookup, repository, google_translate_service):
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    repository.queries = repository.writes = 0
+
+    await lookup.get_words([('challenge', 'en', 'de'), ('dare', 'en', 'es'), ('dare', 'en', 'de'),
+                            ('dare', 'en', 'es')])
+
+    assert repository.queries == 1
+    # One bulk upsert for "dare", one bulk update for "challenge"
+    assert repository.writes == 2
+    assert google_translate_service.get_translated_word.await_count == 3
+
+    dare = await repository.get_word('dare', 'en')
+    challenge = await repository.get_word('challenge', 'en')
+
+    assert set(dare['languages']) == {'es', 'de'}
+    assert set(challenge['languages']) == {'es', 'de'}
+
+
+@pytest.mark.asyncio
+async def test_batch_serves_second_run_from_cache(lookup, repository, google_translate_service):
+    await lookup.get_words([('dare', 'en', 'es')])
+
+    items = await lookup.get_words([('dare', 'en', 'es')])
+
+    assert items[0].source == 'cache'
+    assert google_translate_service.get_translated_word.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_word_is_served_as_plain_document(lookup, repository, google_translate_service):
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+
+    app.dependency_overrides[get_translation_lookup_service] = lambda: lookup
+
+    try:
+        response = TestClient(app).get('/v1/translations/challenge', params={'sl': 'en', 'tl': 'es'})
+    finally:
+        app.dependency_overrides.clear()
+
+    # Neither validated again nor leaking DB fields (_id, normalizedWord). Served with its fetch time
+    assert response.status_code == 200
+    assert response.json() == {**google_word('challenge', 'en', 'es').model_dump(),
+                               'fetchedAt': {'es': repository.documents[0]['fetchedAt']['es'].isoformat()}}
+    assert google_translate_service.get_translated_word.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_many_target_languages_in_one_request(lookup, repository, google_translate_service):
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    repository.queries = repository.writes = 0
+
+    app.dependency_overrides[get_translation_lookup_service] = lambda: lookup
+
+    try:
+        client = TestClient(app)
+        response = client.get('/v1/translations/challenge', params={'sl': 'en', 'tl': 'ES,de,fr,de'})
+        same_languages = client.get('/v1/translations/challenge', params={'sl': 'en', 'tl': 'es,en'})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert list(response.json()['languages']) == ['es', 'de', 'fr']
+    assert response.json()['languages']['fr']['text'] == 'challenge-fr'
+    # One read for all the languages, one update with the missing ones
+    assert repository.queries == 1
+    assert repository.writes == 1
+    assert google_translate_service.get_translated_word.await_count == 2
+    assert set((await repository.get_word('challenge', 'en'))['languages']) == {'es', 'de', 'fr'}
+    assert same_languages.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_many_target_languages_merge_fetch_times_and_derived_languages(lookup):
+    lookup._lookup_many = AsyncMock(return_value={
+        ('reto', 'es', 'en'): ('derived', {'word': 'reto', 'language': 'es', 'pronunciation': None,
+                                           'languages': {'en': {'text': 'challenge'}}, 'derived': True}),
+        ('reto', 'es', 'de'): ('db', {'word': 'reto', 'language': 'es', 'pronunciation': 'reto',
+                                      'languages': {'de': {'text': 'Herausforderung'}},
+                                      'fetchedAt': {'de': '2026-01-01T00:00:00+00:00'}}),
+    })
+
+    word = await lookup.get_word_languages('reto', 'es', ['en', 'de'])
+
+    assert word == {'word': 'reto', 'language': 'es', 'pronunciation': 'reto', 'languages': {
+        'en': {'text': 'challenge', 'derived': True},
+        'de': {'text': 'Herausforderung'},
+    }, 'fetchedAt': {'de': '2026-01-01T00:00:00+00:00'}}
+
+
+@pytest.mark.asyncio
+async def test_many_target_languages_detected_from_different_languages_conflict(lookup, google_translate_service):
+    google_translate_service.get_translated_word.side_effect = lambda word, sl, tl: Word(
+        word=word, language='fr' if tl == 'de' else 'en', pronunciation=None,
+        languages={tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)}
+    )
+    app.dependency_overrides[get_translation_lookup_service] = lambda: lookup
+
+    try:
+        response = TestClient(app).get('/v1/translations/chance', params={'sl': 'auto', 'tl': 'es,de'})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 409
+    assert response.json()['error']['message'] == 'chance is detected as en, fr, set sl'
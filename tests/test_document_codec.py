@@ -0,0 +1,115 @@
+import bson
+import pytest
+
+from aiogoogletrans.models import Translated
+from unittest.mock import AsyncMock, MagicMock
+
+from app.v1.commands.compact import convert_documents
+from app.v1.db.codec import DocumentCodec
+from app.v1.repositories.translation import TranslationRepository
+from app.v1.services.google_translate import GoogleTranslateService
+from tests.stubs.word import word as word_stub
+
+
+@pytest.fixture
+def word() -> dict:
+    data = Translated(
+        src=word_stub['src'], dest=word_stub['dest'], origin=word_stub['word'], text=word_stub['text'],
+        extra_data=word_stub['extra_data'], pronunciation=word_stub['pronunciation'],
+    )
+
+    return GoogleTranslateService(None).get_model(data).model_dump()
+
+
+def test_compact_round_trip_is_smaller(word):
+    language = word['languages']['es']
+    encoded = DocumentCodec(compact=True).encode_language(language)
+
+    assert 'text' not in encoded and encoded['t'] == language['text']
+    assert len(bson.encode(encoded)) < len(bson.encode(language))
+    assert DocumentCodec().decode_language(encoded) == language
+
+
+def test_compressed_round_trip(word):
+    language = word['languages']['es']
+    codec = DocumentCodec(compact=True, compression='zlib', compression_min_size=100)
+    encoded = codec.encode_language(language)
+
+    assert set(encoded) == {'z', 'b'}
+    assert len(bson.encode(encoded)) < len(bson.encode(DocumentCodec(compact=True).encode_language(language)))
+    assert DocumentCodec().decode_language(encoded) == language
+
+
+def test_small_languages_are_not_compressed():
+    language = {'text': 'reto', 'confidence': None, 'pronunciation': None, 'definitions': None,
+                'examples': [], 'translations': None}
+    encoded = DocumentCodec(compact=True, compression='zlib', compression_min_size=1024).encode_language(language)
+
+    assert encoded == {'t': 'reto'}
+    assert DocumentCodec().decode_language(encoded) == language
+
+
+@pytest.mark.parametrize('codec', [
+    DocumentCodec(compact=True),
+    DocumentCodec(compact=True, compression='zlib', compression_min_size=100),
+])
+def test_round_trip_is_exact(word, codec):
+    edge_cases = {'text': 'reto', 'confidence': None, 'pronunciation': None, 'definitions': {},
+                  'examples': None, 'translations': {'sustantivo': [
+                      {'text': 'challenge', 'translations': [], 'confidence': None},
+                  ]}}
+    word['languages']['de'] = edge_cases
+    word['languages']['es']['definitions']['sustantivo'][0].update(synonyms=None, context=[])
+
+    # Through BSON, as stored. Only the languages are encoded
+    stored = bson.decode(bson.encode(codec.encode_word(word)))
+
+    assert DocumentCodec().decode_word(stored)['languages'] == word['languages']
+
+
+def test_compression_needs_the_compact_format():
+    with pytest.raises(ValueError):
+        DocumentCodec(compression='zlib')
+
+
+@pytest.mark.asyncio
+async def test_compact_command_updates_languages_still_stored_as_read(word):
+    language = word['languages']['es']
+    collection = MagicMock()
+    collection.find.return_value.batch_size.return_value.__aiter__.return_value = [
+        {'_id': 1, 'languages': {'es': language}},
+    ]
+    collection.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1))
+
+    assert await convert_documents(collection, DocumentCodec(compact=True), batch_size=10) == 1
+
+    request, = collection.bulk_write.call_args.args[0]
+    assert request._filter == {'_id': 1, 'languages.es': language}
+    assert request._doc == {'$set': {'languages.es': DocumentCodec(compact=True).encode_language(language)}}
+
+
+def test_full_format_is_read_as_is(word):
+    language = word['languages']['es']
+
+    assert DocumentCodec(compact=True).decode_language(language) is language
+
+
+@pytest.mark.asyncio
+async def test_repository_writes_compact_and_reads_full(word):
+    codec = DocumentCodec(compact=True)
+    collection = MagicMock()
+    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock(return_value={
+        'word': word['word'], 'language': word['language'], 'pronunciation': None,
+        'languages': {'es': codec.encode_language(word['languages']['es'])},
+    })
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    repository = TranslationRepository(db, codec)
+
+    await repository.upsert_word(word)
+    stored = await repository.get_word_language(word['word'], word['language'], 'es')
+
+    _, update = collection.update_one.call_args.args
+    assert update['$set']['languages.es']['t'] == word['languages']['es']['text']
+    assert stored['languages']['es'] == word['languages']['es']
@@ -1,9 +1,11 @@
 import pytest
 
+from aiogoogletrans import Translator
 from aiogoogletrans.models import Translated
 from unittest.mock import AsyncMock, patch
 
-from app.v1.services.google_translate import GoogleTranslateService
+from app.v1.core.config import settings
+from app.v1.services.google_translate import GoogleTranslateService, create_translator
 from app.v1.models import Word, Language
 from tests.stubs.word import word
 
@@ -29,7 +31,7 @@ async def test_get_translated_word(mock_translator):
     )
     mock_translator.return_value.translate = AsyncMock(return_value=translated_data)
 
-    service = GoogleTranslateService()
+    service = GoogleTranslateService(mock_translator())
 
     word_model = await service.get_translated_word('challenge', 'en', 'es')
 
@@ -39,3 +41,42 @@ async def test_get_translated_word(mock_translator):
     assert isinstance(word_model, Word)
     assert isinstance(word_model.languages[word['dest']], Language)
     # ... more assertions based on your requirements
+
+
+@pytest.mark.asyncio
+async def test_create_translator_shares_one_pooled_client():
+    default_clients = []
+
+    def make_translator(**kwargs) -> Translator:
+        created = Translator(**kwargs)
+        default_clients.append(created.client)
+        return created
+
+    with patch('app.v1.services.google_translate.Translator', side_effect=make_translator):
+        translator = await create_translator(settings)
+
+    default_client, = default_clients
+    assert translator.token_acquirer.client is translator.client
+    assert translator.client is not default_client
+    # The client Translator created for itself isn't leaked
+    assert default_client.is_closed
+    assert translator.client.timeout.connect == settings.GOOGLE_TRANSLATE_CONNECT_TIMEOUT
+    assert translator.client.timeout.read == settings.GOOGLE_TRANSLATE_TIMEOUT
+    await translator.client.aclose()
+
+
+def test_get_model_maps_definition_and_translation_rows():
+    data = Translated(
+        src=word['src'], dest=word['dest'], origin=word['word'], text=word['text'],
+        extra_data=word['extra_data'], pronunciation=word['pronunciation'],
+    )
+
+    language = GoogleTranslateService(None).get_model(data).languages[word['dest']]
+
+    first = language.definitions['sustantivo'][0]
+    assert first.example == 'he accepted the challenge'
+    assert first.synonyms == ['dare', 'provocation', 'summons']
+    assert language.definitions['verbo'][2].example is None
+    assert language.translations['sustantivo'][0].confidence is None
+    assert language.translations['verbo'][0].text == 'desafiar'
+    assert language.translations['verbo'][0].confidence == 0.12913783
@@ -0,0 +1,148 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.v1.cache.translation import LocalTranslationCache
+from app.v1.core.loop import LoopLagMonitor
+from app.v1.core.resilience import CircuitBreaker, RecentCalls
+from app.v1.db.mongodb import PoolStats
+from app.v1.services.health import HealthService
+from tests.test_resilience import FakeClock, make_policy
+
+
+def make_health_service(clock: FakeClock, db=None, pool_stats=None, policy=None, loop_monitor=None,
+                        **options) -> HealthService:
+    if db is None:
+        db = MagicMock()
+        db.command = AsyncMock(return_value={'ok': 1})
+
+    return HealthService(
+        db,
+        pool_stats or PoolStats(max_pool_size=10),
+        policy or make_policy(clock),
+        LocalTranslationCache(max_size=10, ttl=60, negative_ttl=60, clock=clock),
+        loop_monitor or LoopLagMonitor(interval=0.5, clock=clock),
+        **options,
+    )
+
+
+def test_recent_calls_stats_drop_expired_calls():
+    clock = FakeClock()
+    recent_calls = RecentCalls(window=60, clock=clock)
+
+    recent_calls.record(latency=5, failed=True)
+    clock.now = 30
+    for latency in (0.1, 0.2, 0.3):
+        recent_calls.record(latency=latency, failed=False)
+
+    stats = recent_calls.stats()
+    assert stats['calls'] == 4
+    assert stats['errorRate'] == 0.25
+    assert stats['latencyP95'] == 5
+
+    clock.now = 61
+    stats = recent_calls.stats()
+    assert stats['calls'] == 3
+    assert stats['errorRate'] == 0.0
+    assert stats['latencyP50'] == 0.2
+
+
+def test_pool_stats_counts_checked_out_connections():
+    pool_stats = PoolStats(max_pool_size=2)
+
+    for _ in range(2):
+        pool_stats.connection_created(None)
+        pool_stats.connection_check_out_started(None)
+        pool_stats.connection_checked_out(None)
+    pool_stats.connection_check_out_started(None)
+    pool_stats.connection_checked_in(None)
+
+    assert pool_stats.stats() == {'open': 2, 'inUse': 1, 'available': 1, 'waiting': 1, 'maxSize': 2}
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_ready_when_dependencies_are_healthy():
+    result = await make_health_service(FakeClock()).readiness()
+
+    assert result['status'] == HealthService.READY
+    assert set(result['checks']) == {'mongo', 'mongoPool', 'upstream', 'eventLoop', 'cache', 'indexes'}
+    assert all(check['ok'] for check in result['checks'].values())
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_not_ready_when_mongo_ping_fails():
+    db = MagicMock()
+    db.command = AsyncMock(side_effect=ConnectionError('refused'))
+
+    result = await make_health_service(FakeClock(), db=db).readiness()
+
+    assert result['status'] == HealthService.NOT_READY
+    assert result['checks']['mongo'] == {'ok': False, 'latency': pytest.approx(0, abs=1), 'error': 'refused'}
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_not_ready_when_pool_is_saturated():
+    pool_stats = PoolStats(max_pool_size=10)
+    pool_stats.in_use = 10
+
+    result = await make_health_service(FakeClock(), pool_stats=pool_stats, max_pool_usage=0.9).readiness()
+
+    assert result['status'] == HealthService.NOT_READY
+    assert result['checks']['mongoPool']['ok'] is False
+
+
+@pytest.mark.asyncio
+async def test_readiness_upstream_is_judged_on_enough_recent_calls():
+    clock = FakeClock()
+    policy = make_policy(clock)
+    policy.recent_calls = RecentCalls(window=60, clock=clock)
+    service = make_health_service(clock, policy=policy, upstream_required=True, upstream_min_calls=3,
+                                  max_upstream_error_rate=0.5)
+
+    for _ in range(2):
+        policy.recent_calls.record(latency=0.1, failed=True)
+    assert (await service.readiness())['status'] == HealthService.READY
+
+    policy.recent_calls.record(latency=0.1, failed=True)
+    result = await service.readiness()
+    assert result['status'] == HealthService.NOT_READY
+    assert result['checks']['upstream']['errorRate'] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_readiness_upstream_open_circuit_is_report_only_unless_required():
+    clock = FakeClock()
+    policy = make_policy(clock)
+    for _ in range(2):
+        policy.circuit_breaker.record_failure()
+    assert policy.circuit_breaker.state == CircuitBreaker.OPEN
+
+    required = await make_health_service(clock, policy=policy, upstream_required=True).readiness()
+    assert required['status'] == HealthService.NOT_READY
+
+    # By default: stored words are still served
+    result = await make_health_service(clock, policy=policy).readiness()
+    assert result['status'] == HealthService.READY
+    assert result['checks']['upstream']['healthy'] is False
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_not_ready_when_event_loop_lags():
+    loop_monitor = LoopLagMonitor(interval=0.5)
+    loop_monitor._samples.extend([0.01, 0.8, 0.02])
+
+    result = await make_health_service(FakeClock(), loop_monitor=loop_monitor, max_loop_lag=0.5).readiness()
+
+    assert result['status'] == HealthService.NOT_READY
+    assert result['checks']['eventLoop'] == {'ok': False, 'lag': 0.02, 'maxLag': 0.8}
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_failed_index_creation():
+    result = await make_health_service(FakeClock(), index_error='not authorized').readiness()
+
+    assert result['status'] == HealthService.READY
+    assert result['checks']['indexes'] == {'ok': True, 'ensured': False, 'error': 'not authorized'}
+
+    result = await make_health_service(FakeClock(), index_error='not authorized', indexes_required=True).readiness()
+    assert result['status'] == HealthService.NOT_READY
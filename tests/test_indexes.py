@@ -0,0 +1,47 @@
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock
+
+from app.v1.db.indexes import INDEXES, ensure_indexes
+
+
+def make_db(existing: dict[str, dict]) -> tuple[MagicMock, dict[str, MagicMock]]:
+    collections = {name: MagicMock(create_indexes=AsyncMock(return_value=['index']),
+                                   index_information=AsyncMock(return_value=existing.get(name, {})),
+                                   drop_index=AsyncMock())
+                   for name in INDEXES}
+    db = MagicMock()
+    db.__getitem__.side_effect = collections.__getitem__
+
+    return db, collections
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_declared_indexes():
+    db, collections = make_db({})
+
+    result = await ensure_indexes(db)
+
+    assert set(result) == set(INDEXES)
+
+    for name, collection in collections.items():
+        collection.create_indexes.assert_awaited_once_with(INDEXES[name])
+        collection.drop_index.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_drops_the_redundant_word_language_index():
+    db, collections = make_db({'translations': {'_id_': {}, 'word_language_unique': {}}})
+
+    await ensure_indexes(db)
+
+    collections['translations'].drop_index.assert_awaited_once_with('word_language_unique')
+
+
+def test_canonical_key_index_is_unique():
+    key, = [index.document for index in INDEXES['translations']
+            if index.document['name'] == 'normalizedWord_language_unique']
+
+    assert list(key['key']) == ['normalizedWord', 'language']
+    assert key['unique'] is True
+    assert 'word_language_unique' not in [index.document['name'] for index in INDEXES['translations']]
@@ -0,0 +1,35 @@
+import pytest
+
+from tests.benchmarks.load import DEFAULT_MIX, Workload, compare, percentile, run
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_workload_is_reproducible_and_skewed():
+    first = Workload(DEFAULT_MIX, vocabulary=100, zipf=1.1, seed=7)
+    second = Workload(DEFAULT_MIX, vocabulary=100, zipf=1.1, seed=7)
+    requests = [first.next() for _ in range(1000)]
+
+    assert requests == [second.next() for _ in range(1000)]
+
+    hot = [url for kind, _, url in requests if kind == 'hot']
+    assert hot.count('/v1/translations/word00001?sl=en&tl=es') > hot.count('/v1/translations/word00100?sl=en&tl=es')
+
+
+@pytest.mark.asyncio
+async def test_run_drives_the_app_and_reports_every_kind():
+    result = await run(requests=200, concurrency=10, mix=DEFAULT_MIX, vocabulary=20, zipf=1.1,
+                       latency=0, error_rate=0, google_rate=0, seed=1)
+
+    assert result['total']['requests'] == 200
+    assert set(result['total']['statuses']) <= {'200', '404'}
+    assert result['kinds']['hot']['p99Ms'] >= result['kinds']['hot']['p50Ms']
+
+    baseline = {'version': 'old', 'commit': 'abc', 'createdAt': 'now', **result}
+    assert compare(result, baseline)[1].startswith('  total: rps +0.0%')
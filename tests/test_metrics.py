@@ -0,0 +1,115 @@
+import inspect
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.v1.core.metrics import MetricsRegistry, stage_duration, translation_lookups, upstream_errors
+from app.v1.repositories.access import AccessStatsRepository
+from app.v1.repositories.lease import LeaseRepository
+from app.v1.repositories.reverse_index import ReverseIndexRepository
+from app.v1.repositories.source_language import SourceLanguageRepository
+from app.v1.repositories.translation import TranslationRepository
+from app.v1.services.google_translate import GoogleTranslateService
+from app.v1.services.translation import TranslationService
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+from tests.stubs.translator import FakeTranslator
+from tests.test_resilience import FakeClock, make_policy
+from tests.test_singleflight import FakeGoogleTranslateService, make_worker
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('request_seconds', 'Request time', labels=('route',), buckets=(0.1, 1))
+
+    histogram.observe(0.05, '/a"b')
+    histogram.observe(0.5, '/a"b')
+    histogram.observe(2, '/a"b')
+
+    assert registry.render().splitlines() == [
+        '# HELP request_seconds Request time',
+        '# TYPE request_seconds histogram',
+        'request_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'request_seconds_bucket{route="/a\\"b",le="1.0"} 2',
+        'request_seconds_bucket{route="/a\\"b",le="+Inf"} 3',
+        'request_seconds_sum{route="/a\\"b"} 2.55',
+        'request_seconds_count{route="/a\\"b"} 3',
+    ]
+
+
+def test_counter_renders_per_label_values():
+    registry = MetricsRegistry()
+    counter = registry.counter('errors_total', 'Errors', labels=('error',))
+
+    counter.inc('ReadTimeout')
+    counter.inc('ReadTimeout')
+
+    assert 'errors_total{error="ReadTimeout"} 2' in registry.render()
+
+    with pytest.raises(ValueError):
+        registry.counter('errors_total', 'Errors')
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_counted_by_scenario_and_stages_are_timed():
+    worker = make_worker(InMemoryTranslationRepository(), FakeGoogleTranslateService(), InMemoryLeaseRepository())
+    before = {scenario: translation_lookups.get(scenario) for scenario in ('new_word', 'new_language', 'cache')}
+    repository_calls = stage_duration.count('translation_repository', 'get_word_language')
+
+    await worker.get_word('challenge', 'en', 'es')
+    await worker.get_word('challenge', 'en', 'es')
+    await worker.get_word('challenge', 'en', 'fr')
+
+    assert translation_lookups.get('new_word') == before['new_word'] + 1
+    assert translation_lookups.get('new_language') == before['new_language'] + 1
+    assert translation_lookups.get('cache') == before['cache'] + 1
+    assert stage_duration.count('lookup_service', 'get_word') >= 3
+    # The stub repository isn't instrumented, only TranslationRepository is
+    assert stage_duration.count('translation_repository', 'get_word_language') == repository_calls
+
+
+@pytest.mark.parametrize('repository', [
+    TranslationRepository, LeaseRepository, SourceLanguageRepository, ReverseIndexRepository, AccessStatsRepository,
+])
+def test_every_repository_is_timed(repository):
+    public = [attribute for name, attribute in vars(repository).items()
+              if not name.startswith('_') and inspect.iscoroutinefunction(attribute)]
+
+    assert public
+    assert all(hasattr(attribute, '__wrapped__') for attribute in public)
+
+
+def test_async_iterations_are_not_timed():
+    # Only the creation of the iterator would be: export_words returns before a word is read
+    assert not hasattr(TranslationService.export_words, '__wrapped__')
+    assert hasattr(TranslationService.import_words, '__wrapped__')
+
+
+@pytest.mark.asyncio
+async def test_upstream_errors_are_counted_by_type():
+    translator = FakeTranslator(errors=[httpx.ReadTimeout('slow')])
+    before = upstream_errors.get('ReadTimeout')
+    parsed = stage_duration.count('google_translate_service', 'get_model')
+
+    await GoogleTranslateService(translator, make_policy(FakeClock())).get_translated_word('challenge', 'en', 'es')
+
+    assert upstream_errors.get('ReadTimeout') == before + 1
+    assert stage_duration.count('google_translate_service', 'get_model') == parsed + 1
+
+
+def test_metrics_endpoint_exposes_request_latency_by_route():
+    with patch('app.main.ensure_indexes', AsyncMock()), patch('app.main.warm_up', AsyncMock(return_value=None)):
+        with TestClient(app) as client:
+            client.get('/v1/healthcheck/live')
+            response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'http_request_duration_seconds_count{method="GET",route="/v1/healthcheck/live",status="200"}' \
+           in response.text
+    assert '# TYPE translation_lookups_total counter' in response.text
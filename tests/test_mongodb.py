@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.v1.core.config import settings
+from app.v1.db.mongodb import MongoDB
+
+
+def test_mongodb_from_settings_passes_pool_options():
+    client = MagicMock()
+
+    MongoDB.from_settings(client, settings)
+
+    client.assert_called_once()
+    uri = client.call_args.args[0]
+    options = client.call_args.kwargs
+
+    assert uri == settings.MONGO_URL
+    assert options['maxPoolSize'] == settings.MONGO_MAX_POOL_SIZE
+    assert options['connectTimeoutMS'] == settings.MONGO_CONNECT_TIMEOUT_MS
+    assert options['serverSelectionTimeoutMS'] == settings.MONGO_SERVER_SELECTION_TIMEOUT_MS
+
+
+def test_lifespan_creates_single_client_and_closes_it():
+    with patch.object(MongoDB, 'close') as close, patch('app.main.ensure_indexes', AsyncMock()) as ensure_indexes, \
+            patch('app.main.warm_up', AsyncMock(return_value=None)):
+        with TestClient(app) as client:
+            ensure_indexes.assert_awaited_once()
+            mongodb = app.state.mongodb
+
+            client.get('/v1/healthcheck')
+            client.get('/v1/healthcheck')
+
+            assert app.state.mongodb is mongodb
+            close.assert_not_called()
+
+        close.assert_called_once()
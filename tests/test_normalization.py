@@ -0,0 +1,125 @@
+import unicodedata
+
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.commands.normalize import merge_duplicates
+from app.v1.core.normalization import clean_word, normalize_word, normalized_variants
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word, Language
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.translation import TranslationService
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+
+
+def google_word(word: str, sl: str, tl: str) -> Word:
+    return Word(word=word, language=sl, pronunciation=None, languages={
+        tl: Language(text=f'{word.lower()}-{tl}', confidence=None, translations=None)
+    })
+
+
+def make_lookup(repository) -> tuple[TranslationLookupService, MagicMock]:
+    google_translate_service = MagicMock()
+    google_translate_service.get_translated_word = AsyncMock(side_effect=google_word)
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=60))
+
+    return TranslationLookupService(
+        TranslationService(repository, cache),
+        google_translate_service,
+        cache,
+        SingleFlight(),
+        LeaseService(InMemoryLeaseRepository(), ttl=5, poll_interval=0.01, wait_timeout=1),
+    ), google_translate_service
+
+
+class FakeAggregation:
+    def __init__(self, groups: list[dict]):
+        self.groups = groups
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for group in self.groups:
+            yield group
+
+
+def test_variants_share_one_key():
+    decomposed = unicodedata.normalize('NFD', 'Café')
+
+    assert {normalize_word(word) for word in ('Café', 'CAFÉ', decomposed, '  café ', 'ｃａｆé')} == {'café'}
+    assert clean_word(f' {decomposed}  au   lait ') == 'Café au lait'
+    assert normalize_word('Straße') == normalize_word('STRASSE') == 'strasse'
+
+
+def test_dotted_and_dotless_i_follow_the_language():
+    assert normalize_word('Istanbul', 'tr') == 'ıstanbul'
+    assert normalize_word('İstanbul', 'tr') == 'istanbul'
+    assert normalize_word('Istanbul', 'en') == 'istanbul'
+    assert normalized_variants('Istanbul') == {'istanbul', 'ıstanbul'}
+    assert normalize_word(normalize_word('İstanbul', 'tr'), 'tr') == normalize_word('İstanbul', 'tr')
+
+
+@pytest.mark.asyncio
+async def test_variants_share_one_google_lookup_and_one_stored_word():
+    repository = InMemoryTranslationRepository()
+    lookup, google_translate_service = make_lookup(repository)
+
+    first = await lookup.get_word(' Café ', 'fr', 'en')
+    second = await lookup.get_word('CAFÉ', 'fr', 'en')
+    third = await lookup.get_word(unicodedata.normalize('NFD', 'café'), 'fr', 'en')
+
+    assert google_translate_service.get_translated_word.await_count == 1
+    # Google gets the cleaned spelling of the first request, it's the stored one
+    assert google_translate_service.get_translated_word.await_args.args == ('Café', 'fr', 'en')
+    assert first == second == third
+    assert [document['word'] for document in repository.documents] == ['Café']
+
+
+@pytest.mark.asyncio
+async def test_batch_variants_share_one_google_lookup():
+    repository = InMemoryTranslationRepository()
+    lookup, google_translate_service = make_lookup(repository)
+
+    items = await lookup.get_words([('Dare', 'en', 'es'), ('dare', 'en', 'es'), ('DARE ', 'en', 'de')])
+
+    assert [(item.word, item.status) for item in items] == [
+        ('Dare', 'success'), ('dare', 'success'), ('DARE ', 'success'),
+    ]
+    assert google_translate_service.get_translated_word.await_count == 2
+    assert len(repository.documents) == 1
+    assert set(repository.documents[0]['languages']) == {'es', 'de'}
+
+    await lookup.translation_service.delete_word('DaRe')
+
+    assert repository.documents == []
+    assert (await lookup.get_words([('dare', 'en', 'es')]))[0].source == 'google'
+
+
+@pytest.mark.asyncio
+async def test_merge_duplicates_keeps_the_oldest_and_its_missing_languages():
+    documents = [
+        {'_id': 1, 'languages': {'es': 'stored es'}},
+        {'_id': 2, 'languages': {'es': 'other es', 'de': 'stored de'}, 'fetchedAt': {'es': 'es time', 'de': 'de time'}},
+        {'_id': 3, 'languages': {'de': 'newer de', 'fr': 'stored fr'}, 'fetchedAt': {'de': 'newer de time'}},
+    ]
+    cursor = MagicMock()
+    cursor.sort.return_value.to_list = AsyncMock(return_value=documents)
+    collection = MagicMock()
+    collection.aggregate.return_value = FakeAggregation([{'_id': {'normalizedWord': 'café', 'language': 'fr'},
+                                                          'ids': [3, 1, 2], 'count': 3}])
+    collection.find.return_value = cursor
+    collection.bulk_write = AsyncMock()
+
+    assert await merge_duplicates(collection, batch_size=100) == 2
+
+    update, delete = collection.bulk_write.call_args.args[0]
+    assert update._filter == {'_id': 1}
+    # Copied with its fetch time, not taken for expired. Languages stored before fetch times have none
+    assert update._doc == {'$set': {'languages.de': 'stored de', 'fetchedAt.de': 'de time',
+                                    'languages.fr': 'stored fr'}}
+    assert delete._filter == {'_id': {'$in': [2, 3]}}
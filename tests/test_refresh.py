@@ -0,0 +1,134 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.exceptions import UpstreamUnavailableException
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word, Language
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.refresh import TranslationRefresher
+from app.v1.services.translation import TranslationService
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+
+DAY = 24 * 60 * 60
+
+
+def google_word(word: str, sl: str, tl: str) -> Word:
+    return Word(word=word, language=sl, pronunciation=None, languages={
+        tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)
+    }, fetchedAt={tl: datetime.now(timezone.utc)})
+
+
+async def make_lookup(age: float) -> tuple[TranslationLookupService, MagicMock, InMemoryTranslationRepository,
+                                           TranslationRefresher]:
+    """
+    "hello" en -> es stored age days ago, as "hola"
+    """
+    repository = InMemoryTranslationRepository()
+    await repository.insert_word({'word': 'hello', 'language': 'en', 'pronunciation': None, 'languages': {
+        'es': {'text': 'hola', 'confidence': None, 'translations': None}
+    }, 'fetchedAt': {'es': datetime.now(timezone.utc) - timedelta(days=age)}})
+
+    google_translate_service = MagicMock()
+    google_translate_service.get_translated_word = AsyncMock(side_effect=google_word)
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=60))
+    refresher = TranslationRefresher(fresh_for=30 * DAY, max_age=365 * DAY, rate=0, max_pending=10)
+
+    return TranslationLookupService(
+        TranslationService(repository, cache),
+        google_translate_service,
+        cache,
+        SingleFlight(),
+        LeaseService(InMemoryLeaseRepository(), ttl=5, poll_interval=0.01, wait_timeout=1),
+        refresher=refresher,
+    ), google_translate_service, repository, refresher
+
+
+def test_freshness_by_fetch_time():
+    now = datetime(2026, 1, 31, tzinfo=timezone.utc)
+    refresher = TranslationRefresher(fresh_for=30 * DAY, max_age=365 * DAY, rate=0, max_pending=10,
+                                     clock=lambda: now)
+
+    def word(fetched_at) -> dict:
+        return {'languages': {'es': {}}, 'fetchedAt': {'es': fetched_at}}
+
+    assert refresher.freshness(word(now - timedelta(days=1)), 'es') == refresher.FRESH
+    # Naive, as read from MongoDB, or serialized by the shared cache
+    assert refresher.freshness(word(datetime(2025, 12, 1)), 'es') == refresher.STALE
+    assert refresher.freshness(word('2024-01-01T00:00:00+00:00'), 'es') == refresher.EXPIRED
+    assert refresher.freshness({'languages': {'es': {}}}, 'es') == refresher.STALE
+
+
+@pytest.mark.asyncio
+async def test_stale_word_is_served_and_refreshed_in_the_background():
+    lookup, google_translate_service, repository, refresher = await make_lookup(age=60)
+
+    assert (await lookup.get_word('hello', 'en', 'es'))['languages']['es']['text'] == 'hola'
+    assert google_translate_service.get_translated_word.await_count == 0
+
+    await refresher.drain()
+
+    assert google_translate_service.get_translated_word.await_args.args == ('hello', 'en', 'es')
+    assert repository.documents[0]['languages']['es']['text'] == 'hello-es'
+    assert refresher.freshness(repository.documents[0], 'es') == refresher.FRESH
+    # The refresh invalidated the cached stale word
+    assert (await lookup.get_word('hello', 'en', 'es'))['languages']['es']['text'] == 'hello-es'
+    assert refresher.stats()['refreshed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_of_a_deleted_word_does_not_store_it_again():
+    lookup, google_translate_service, repository, refresher = await make_lookup(age=60)
+
+    await lookup.get_word('hello', 'en', 'es')
+    await lookup.translation_service.delete_word('hello')
+    await refresher.drain()
+
+    assert repository.documents == []
+    assert await lookup.translation_service.get_word_language_from_db('hello', 'en', 'es') is None
+
+
+@pytest.mark.asyncio
+async def test_expired_word_is_refreshed_before_it_is_served():
+    lookup, google_translate_service, repository, refresher = await make_lookup(age=400)
+
+    word = await lookup.get_word('hello', 'en', 'es')
+    items = await lookup.get_words([('hello', 'en', 'es')])
+
+    assert word['languages']['es']['text'] == 'hello-es'
+    assert items[0].data['languages']['es']['text'] == 'hello-es'
+    assert google_translate_service.get_translated_word.await_count == 1
+    assert len(refresher) == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_word_is_served_stale_while_google_is_unavailable():
+    lookup, google_translate_service, repository, refresher = await make_lookup(age=400)
+    google_translate_service.get_translated_word.side_effect = UpstreamUnavailableException('Circuit open')
+
+    items = await lookup.get_words([('hello', 'en', 'es')])
+    word = await lookup.get_word('hello', 'en', 'es')
+
+    assert word['languages']['es']['text'] == 'hola'
+    assert (items[0].status, items[0].source) == ('success', 'db')
+    assert items[0].data['languages']['es']['text'] == 'hola'
+
+
+@pytest.mark.asyncio
+async def test_refreshes_are_deduplicated_and_bounded():
+    refresher = TranslationRefresher(fresh_for=0, max_age=DAY, rate=0, max_pending=2)
+    refresh = AsyncMock()
+
+    assert refresher.submit(('hello', 'en', 'es'), refresh)
+    assert refresher.submit(('hello', 'en', 'es'), refresh)
+    assert refresher.submit(('hello', 'en', 'de'), refresh)
+    assert not refresher.submit(('hello', 'en', 'fr'), refresh)
+
+    await refresher.drain()
+
+    assert refresh.await_count == 2
+    assert refresher.stats() == {'pending': 0, 'maxPending': 2, 'refreshed': 2, 'failed': 0, 'dropped': 1}
@@ -0,0 +1,126 @@
+import asyncio
+import httpx
+import pytest
+
+from app.v1.core.exceptions import GoogleTranslateRequestException, UpstreamUnavailableException
+from app.v1.core.resilience import CircuitBreaker, TokenBucket, UpstreamPolicy
+from app.v1.services.google_translate import GoogleTranslateService, is_transient_error
+from tests.stubs.translator import FakeTranslator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_policy(clock: FakeClock, rate: float = 0, retry_attempts: int = 3,
+                failure_threshold: int = 2) -> UpstreamPolicy:
+    return UpstreamPolicy(
+        rate_limiter=TokenBucket(rate=rate, capacity=1, clock=clock),
+        circuit_breaker=CircuitBreaker(failure_threshold=failure_threshold, recovery_timeout=10, clock=clock),
+        is_transient=is_transient_error,
+        rate_limit_max_wait=0,
+        retry_attempts=retry_attempts,
+        retry_base_delay=0,
+        retry_max_delay=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rejects_when_wait_is_too_long():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+
+    await bucket.acquire(max_wait=0)
+
+    with pytest.raises(UpstreamUnavailableException):
+        await bucket.acquire(max_wait=0.5)
+
+    clock.now = 1
+    await bucket.acquire(max_wait=0)
+
+
+def test_transient_errors():
+    assert is_transient_error(httpx.ConnectError('boom'))
+    assert is_transient_error(Exception('Unexpected status code "429" from [\'translate.google.com\']'))
+    assert not is_transient_error(Exception('Unexpected status code "400" from [\'translate.google.com\']'))
+    assert not is_transient_error(ValueError('invalid destination language'))
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    translator = FakeTranslator(errors=[httpx.ConnectError('boom'), httpx.ReadTimeout('slow')])
+    policy = make_policy(FakeClock())
+    service = GoogleTranslateService(translator, policy)
+
+    word = await service.get_translated_word('challenge', 'en', 'es')
+
+    assert word.word == 'challenge'
+    assert translator.calls == 3
+    assert policy.stats()['retries'] == 2
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_retried():
+    translator = FakeTranslator(errors=[ValueError('invalid destination language')])
+    policy = make_policy(FakeClock())
+    service = GoogleTranslateService(translator, policy)
+
+    with pytest.raises(GoogleTranslateRequestException):
+        await service.get_translated_word('challenge', 'en', 'xx')
+
+    assert translator.calls == 1
+    assert policy.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_recovers():
+    clock = FakeClock()
+    translator = FakeTranslator(error_rate=1)
+    policy = make_policy(clock, retry_attempts=1)
+    service = GoogleTranslateService(translator, policy)
+
+    for _ in range(2):
+        with pytest.raises(GoogleTranslateRequestException):
+            await service.get_translated_word('challenge', 'en', 'es')
+
+    assert policy.circuit_breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(UpstreamUnavailableException):
+        await service.get_translated_word('challenge', 'en', 'es')
+
+    assert translator.calls == 2
+
+    clock.now = 10
+    translator.error_rate = 0
+
+    assert policy.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    await service.get_translated_word('challenge', 'en', 'es')
+    assert policy.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_call_frees_the_circuit():
+    clock = FakeClock()
+    policy = make_policy(clock, retry_attempts=1, failure_threshold=1)
+    service = GoogleTranslateService(FakeTranslator(error_rate=1), policy)
+
+    with pytest.raises(GoogleTranslateRequestException):
+        await service.get_translated_word('challenge', 'en', 'es')
+
+    clock.now = 10
+    service.translator = FakeTranslator(latency=10)
+    trial = asyncio.create_task(service.get_translated_word('challenge', 'en', 'es'))
+    await asyncio.sleep(0)
+    trial.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    service.translator = FakeTranslator()
+    await service.get_translated_word('challenge', 'en', 'es')
+
+    assert policy.circuit_breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,105 @@
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.commands.reverse_index import rebuild_reverse_index
+from app.v1.core.background import TaskSet
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word, Language, Translation
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.reverse_index import ReverseIndexRecorder, ReverseIndexService, reverse_entries
+from app.v1.services.translation import TranslationService
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+from tests.stubs.reverse_index import InMemoryReverseIndexRepository
+
+
+def google_word(word: str, sl: str, tl: str) -> Word:
+    if (word, sl, tl) == ('challenge', 'en', 'es'):
+        return Word(word=word, language=sl, pronunciation=None, languages={tl: Language(
+            text='desafío', confidence=None, translations={
+                'noun': [Translation(text='reto', translations=['challenge', 'dare'], confidence=0.6),
+                         Translation(text='desafío', translations=['challenge', 'defiance'], confidence=0.3)],
+                'verb': [Translation(text='retar', translations=['challenge'], confidence=0.1)],
+            }
+        )})
+
+    return Word(word=word, language=sl, pronunciation=None, languages={
+        tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)
+    })
+
+
+def make_lookup(upgrades: TaskSet | None = None) -> tuple[TranslationLookupService, MagicMock, ReverseIndexRecorder]:
+    google_translate_service = MagicMock()
+    google_translate_service.get_translated_word = AsyncMock(side_effect=google_word)
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=60))
+    reverse_index = InMemoryReverseIndexRepository()
+    recorder = ReverseIndexRecorder(reverse_index, flush_interval=60)
+
+    return TranslationLookupService(
+        TranslationService(InMemoryTranslationRepository(), cache),
+        google_translate_service,
+        cache,
+        SingleFlight(),
+        LeaseService(InMemoryLeaseRepository(), ttl=5, poll_interval=0.01, wait_timeout=1),
+        reverse_index_service=ReverseIndexService(reverse_index, recorder, upgrades),
+    ), google_translate_service, recorder
+
+
+def test_reverse_entries_of_a_stored_word():
+    entries = reverse_entries(google_word('challenge', 'en', 'es').model_dump())
+
+    assert set(entries) == {('desafío', 'es', 'en'), ('reto', 'es', 'en'), ('retar', 'es', 'en')}
+    assert entries[('reto', 'es', 'en')] == {'word': 'reto', 'sources': ['challenge'], 'entries': [
+        {'pos': 'noun', 'text': 'challenge'}, {'pos': 'noun', 'text': 'dare'},
+    ]}
+
+
+@pytest.mark.asyncio
+async def test_reverse_lookup_is_derived_without_google():
+    lookup, google_translate_service, recorder = make_lookup()
+
+    await lookup.get_word('challenge', 'en', 'es')
+    await recorder.flush()
+
+    word = await lookup.get_word('Reto', 'es', 'en')
+    items = await lookup.get_words([('retar', 'es', 'en'), ('nuevo', 'es', 'en')])
+
+    assert google_translate_service.get_translated_word.await_count == 2
+    assert word['derived'] is True
+    assert word['languages']['en']['text'] == 'challenge'
+    assert [translation['text'] for translation in word['languages']['en']['translations']['noun']] == \
+           ['challenge', 'dare']
+    assert [item.source for item in items] == ['derived', 'google']
+
+
+@pytest.mark.asyncio
+async def test_derived_word_is_upgraded_in_the_background():
+    upgrades = TaskSet(max_size=10)
+    lookup, google_translate_service, recorder = make_lookup(upgrades)
+
+    await lookup.get_word('challenge', 'en', 'es')
+    await recorder.flush()
+
+    assert (await lookup.get_word('reto', 'es', 'en'))['derived'] is True
+
+    await upgrades.join()
+
+    assert google_translate_service.get_translated_word.await_args.args == ('reto', 'es', 'en')
+    assert 'derived' not in await lookup.get_word('reto', 'es', 'en')
+    assert google_translate_service.get_translated_word.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_stored_words():
+    translations = InMemoryTranslationRepository()
+    reverse_index = InMemoryReverseIndexRepository()
+    await translations.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    await translations.insert_word(google_word('dare', 'en', 'es').model_dump())
+
+    assert await rebuild_reverse_index(translations, reverse_index, batch_size=1, clear=True) == 2
+    assert reverse_index.writes == 2
+    assert set(reverse_index.entries) == {('desafío', 'es', 'en'), ('reto', 'es', 'en'), ('retar', 'es', 'en'),
+                                          ('dare-es', 'es', 'en')}
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word, Language
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.source_language import SourceLanguageService
+from app.v1.services.translation import TranslationService
+from app.v1.services.write_behind import WriteBehindQueue
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+from tests.stubs.source_language import InMemorySourceLanguageRepository
+
+
+class FakeGoogleTranslateService:
+    def __init__(self):
+        self.calls: int = 0
+
+    async def get_translated_word(self, word: str, sl: str, tl: str) -> Word:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+
+        # Detects every word as English
+        return Word(word=word, language='en' if sl == 'auto' else sl, pronunciation=None, languages={
+            tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)
+        })
+
+
+def make_worker(repository, google_translate_service, lease_repository,
+                write_behind: WriteBehindQueue | None = None,
+                source_language_service: SourceLanguageService | None = None) -> TranslationLookupService:
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=1))
+
+    return TranslationLookupService(
+        TranslationService(repository, cache, write_behind),
+        google_translate_service,
+        cache,
+        SingleFlight(),
+        LeaseService(lease_repository, ttl=5, poll_interval=0.01, wait_timeout=1),
+        source_language_service=source_language_service,
+    )
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+        return calls
+
+    results = await asyncio.gather(*[single_flight.do('key', fn) for _ in range(10)])
+
+    assert results == [1] * 10
+    assert calls == 1
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_of_a_cancelled_call_call_again():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+
+        return calls
+
+    leader = asyncio.create_task(single_flight.do('key', fn))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(single_flight.do('key', fn)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    # The cancellation isn't shared, the first waiter calls again for the rest
+    assert results == [2] * 3
+    assert calls == 2
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_exception_to_every_waiter():
+    single_flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    results = await asyncio.gather(*[single_flight.do('key', fn) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stampede_across_workers_costs_one_upstream_call():
+    repository = InMemoryTranslationRepository()
+    google_translate_service = FakeGoogleTranslateService()
+    lease_repository = InMemoryLeaseRepository()
+    workers = [make_worker(repository, google_translate_service, lease_repository) for _ in range(3)]
+
+    results = await asyncio.gather(*[
+        worker.get_word('challenge', 'en', 'es') for worker in workers for _ in range(5)
+    ])
+
+    assert google_translate_service.calls == 1
+    assert len(repository.documents) == 1
+    assert {result['languages']['es']['text'] for result in results} == {'challenge-es'}
+    assert lease_repository.leases == {}
+
+
+@pytest.mark.asyncio
+async def test_stampede_of_auto_lookups_across_workers_costs_one_upstream_call():
+    repository = InMemoryTranslationRepository()
+    google_translate_service = FakeGoogleTranslateService()
+    lease_repository = InMemoryLeaseRepository()
+    source_language_service = SourceLanguageService(InMemorySourceLanguageRepository())
+    workers = [make_worker(repository, google_translate_service, lease_repository,
+                           source_language_service=source_language_service) for _ in range(5)]
+
+    results = await asyncio.gather(*[worker.get_word('challenge', 'auto', 'es') for worker in workers])
+
+    assert google_translate_service.calls == 1
+    assert {(result['language'], result['languages']['es']['text']) for result in results} == \
+           {('en', 'challenge-es')}
+    assert lease_repository.leases == {}
+
+
+@pytest.mark.asyncio
+async def test_lease_is_held_until_written_behind_word_is_stored():
+    repository = InMemoryTranslationRepository()
+    google_translate_service = FakeGoogleTranslateService()
+    lease_repository = InMemoryLeaseRepository()
+    queues = [WriteBehindQueue(repository, max_size=100, batch_size=100, flush_interval=0.2) for _ in range(2)]
+    workers = [make_worker(repository, google_translate_service, lease_repository, queue) for queue in queues]
+
+    for queue in queues:
+        queue.start()
+
+    try:
+        results = await asyncio.gather(*[worker.get_word('challenge', 'en', 'es') for worker in workers])
+    finally:
+        for queue in queues:
+            await queue.stop()
+
+    assert google_translate_service.calls == 1
+    assert {result['languages']['es']['text'] for result in results} == {'challenge-es'}
+    assert lease_repository.leases == {}
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_taken_over():
+    lease_service = LeaseService(InMemoryLeaseRepository(), ttl=0, poll_interval=0.01, wait_timeout=1)
+
+    first = await lease_service.acquire('key')
+    second = await lease_service.acquire('key')
+
+    assert first and second and first != second
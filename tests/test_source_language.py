@@ -0,0 +1,157 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word, Language
+from app.v1.repositories.source_language import SourceLanguageRepository
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.source_language import SourceLanguageService
+from app.v1.services.translation import TranslationService
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+from tests.stubs.source_language import InMemorySourceLanguageRepository
+
+
+def google_word(word: str, sl: str, tl: str) -> Word:
+    # Google detects every word as English
+    return Word(word=word, language='en' if sl == 'auto' else sl, pronunciation=None, languages={
+        tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)
+    })
+
+
+def make_lookup(repository, source_languages, google_translate_service) -> TranslationLookupService:
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=60))
+
+    return TranslationLookupService(
+        TranslationService(repository, cache),
+        google_translate_service,
+        cache,
+        SingleFlight(),
+        LeaseService(InMemoryLeaseRepository(), ttl=5, poll_interval=0.01, wait_timeout=1),
+        source_language_service=SourceLanguageService(source_languages, min_count=1, min_share=0.8),
+    )
+
+
+@pytest.fixture
+def google_translate_service():
+    service = MagicMock()
+    service.get_translated_word = AsyncMock(side_effect=google_word)
+
+    return service
+
+
+@pytest.mark.asyncio
+async def test_resolve_picks_a_dominant_language_only():
+    repository = InMemorySourceLanguageRepository()
+    repository.languages = {'chat': {'en': 5, 'fr': 5}, 'challenge': {'en': 9, 'fr': 1}, 'rare': {'en': 1}}
+
+    resolved = await SourceLanguageService(repository, min_count=1, min_share=0.8) \
+        .resolve_many(['chat', 'challenge', 'rare', 'unknown'])
+
+    assert resolved == {'challenge': 'en', 'rare': 'en'}
+    assert repository.queries == 1
+    assert await SourceLanguageService(repository, min_count=2).resolve('rare') is None
+
+
+@pytest.mark.asyncio
+async def test_explicit_sl_is_not_counted_as_a_detection(google_translate_service):
+    repository = InMemoryTranslationRepository()
+    source_languages = InMemorySourceLanguageRepository()
+
+    await make_lookup(repository, source_languages, google_translate_service).get_word('gift', 'de', 'es')
+    assert source_languages.languages == {}
+
+    # Google detects it, the sl of a user doesn't decide it
+    word = await make_lookup(repository, source_languages, google_translate_service).get_word('gift', 'auto', 'es')
+
+    assert word['language'] == 'en'
+    assert source_languages.languages == {'gift': {'en': 1}}
+
+    # Another worker: nothing cached, served from DB
+    word = await make_lookup(repository, source_languages, google_translate_service).get_word('gift', 'auto', 'es')
+
+    assert word['language'] == 'en'
+    assert google_translate_service.get_translated_word.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_auto_word_is_detected_stored_and_counted(google_translate_service):
+    repository = InMemoryTranslationRepository()
+    source_languages = InMemorySourceLanguageRepository()
+
+    word = await make_lookup(repository, source_languages, google_translate_service).get_word('hello', 'auto', 'de')
+
+    assert word['language'] == 'en'
+    google_translate_service.get_translated_word.assert_awaited_once_with('hello', 'auto', 'de')
+    assert source_languages.languages == {'hello': {'en': 1}}
+    # Stored under the detected language, never under auto
+    assert [(document['word'], document['language']) for document in repository.documents] == [('hello', 'en')]
+
+    await make_lookup(repository, source_languages, google_translate_service).get_word('hello', 'auto', 'de')
+    assert google_translate_service.get_translated_word.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_resolves_auto_items_against_stored_words(google_translate_service):
+    repository = InMemoryTranslationRepository()
+    source_languages = InMemorySourceLanguageRepository()
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    await source_languages.seed([('challenge', 'en')], now=None)
+
+    items = await make_lookup(repository, source_languages, google_translate_service).get_words([
+        ('challenge', 'auto', 'es'),
+        ('hello', 'auto', 'es'),
+    ])
+
+    assert [(item.source, item.data['language']) for item in items] == [('db', 'en'), ('google', 'en')]
+    google_translate_service.get_translated_word.assert_awaited_once_with('hello', 'auto', 'es')
+    assert source_languages.languages['hello'] == {'en': 1}
+
+
+@pytest.mark.asyncio
+async def test_repeated_auto_batch_is_served_from_the_cache(google_translate_service):
+    repository = InMemoryTranslationRepository()
+    source_languages = InMemorySourceLanguageRepository()
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    await source_languages.seed([('challenge', 'en')], now=None)
+    lookup = make_lookup(repository, source_languages, google_translate_service)
+    keys = [('challenge', 'auto', 'es'), ('hello', 'auto', 'es')]
+
+    await lookup.get_words(keys)
+    queries = source_languages.queries
+    items = await lookup.get_words(keys)
+
+    assert [item.source for item in items] == ['cache', 'cache']
+    assert source_languages.queries == queries
+    google_translate_service.get_translated_word.assert_awaited_once_with('hello', 'auto', 'es')
+
+
+@pytest.mark.asyncio
+async def test_seeds_are_overridden_by_detections():
+    source_languages = InMemorySourceLanguageRepository()
+    service = SourceLanguageService(source_languages, min_count=1, min_share=0.8)
+    await source_languages.seed([('gift', 'de')], now=None)
+
+    assert await service.resolve('gift') == 'de'
+
+    await service.record('gift', 'en')
+
+    assert await service.resolve('gift') == 'en'
+
+
+@pytest.mark.asyncio
+async def test_seed_keeps_detected_counts():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock()
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+
+    await SourceLanguageRepository(db).seed([('chat', 'en'), ('chat', 'fr')], now=None)
+
+    request, = collection.bulk_write.call_args.args[0]
+    assert request._filter == {'word': 'chat'}
+    assert request._doc == {'$set': {'seeds.en': 1, 'seeds.fr': 1, 'updatedAt': None},
+                            '$setOnInsert': {'languages': {}}}
@@ -0,0 +1,90 @@
+import gzip
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.v1.core.exceptions import LineTooLongException
+from app.v1.core.ndjson import dump_lines, load_lines
+from app.v1.dependencies import get_translation_service
+from app.v1.models import Word, Language
+from app.v1.services.translation import TranslationService
+from tests.stubs.repository import InMemoryTranslationRepository
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+def make_word(word: str) -> dict:
+    return Word(word=word, language='en', pronunciation=None, languages={
+        'es': Language(text=f'{word}-es', confidence=None, translations=None)
+    }).model_dump()
+
+
+def make_client(repository: InMemoryTranslationRepository) -> TestClient:
+    app.dependency_overrides[get_translation_service] = lambda: TranslationService(repository)
+
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('compressed', [False, True])
+async def test_lines_survive_any_chunk_boundaries(compressed):
+    documents = [make_word(f'word{index}') for index in range(50)]
+    data = b''.join([chunk async for chunk in dump_lines(aiter(documents), compressed, chunk_size=100)])
+    # Re-chunked at 7 bytes: lines and gzip blocks are split between chunks
+    chunks = [data[index:index + 7] for index in range(0, len(data), 7)]
+
+    lines = [line async for line in load_lines(aiter(chunks), compressed)]
+
+    assert [Word.model_validate_json(line).model_dump() for line in lines] == documents
+
+
+def test_export_and_import_round_trip():
+    source = InMemoryTranslationRepository()
+
+    for index in range(5):
+        source._insert(make_word(f'word{index}'))
+
+    response = make_client(source).get('/v1/translations:export', params={'gzip': True, 'batch_size': 2})
+
+    assert response.headers['content-type'] == 'application/gzip'
+    assert len(gzip.decompress(response.content).splitlines()) == 5
+
+    target = InMemoryTranslationRepository()
+    body = gzip.compress(gzip.decompress(response.content) + b'{"word": "broken"}\n')
+    response = make_client(target).post('/v1/translations:import', params={'chunk_size': 2}, content=body,
+                                        headers={'Content-Encoding': 'gzip'})
+
+    assert response.json()['meta'] == {'total': 6, 'imported': 5, 'failed': 1}
+    assert [document['languages'] for document in target.documents] == \
+           [document['languages'] for document in source.documents]
+    # Chunks of 2: 3 bulk writes
+    assert target.writes == 3
+
+
+@pytest.mark.asyncio
+async def test_decompression_bomb_is_rejected_without_inflating_it():
+    # 20 MB of one line, about 20 KB compressed
+    bomb = gzip.compress(b'a' * 20 * 1024 * 1024)
+
+    with pytest.raises(LineTooLongException):
+        async for line in load_lines(aiter([bomb]), gzip=True, max_line_size=1024, chunk_size=1024):
+            pass
+
+
+def test_import_rejects_too_long_lines():
+    body = gzip.compress(b'{"word": "' + b'a' * 2 * 1024 * 1024 + b'"}\n')
+    response = make_client(InMemoryTranslationRepository()).post('/v1/translations:import', params={'gzip': True},
+                                                                 content=body)
+
+    assert response.status_code == 413
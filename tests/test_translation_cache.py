@@ -0,0 +1,173 @@
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock
+
+from app.v1.cache.shared import InMemorySharedCache
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.core.exceptions import GoogleTranslateRequestException
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from tests.stubs.lease import InMemoryLeaseRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_word(text: str = 'challenge') -> dict:
+    return Word(word=text, language='en', pronunciation=None, languages={}).model_dump()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return LocalTranslationCache(max_size=2, ttl=10, negative_ttl=1, clock=clock)
+
+
+def test_hit_and_miss_counters(cache):
+    word = make_word()
+
+    assert cache.get('challenge', 'en', 'es') is None
+    cache.set('challenge', 'en', 'es', word)
+
+    assert cache.get('challenge', 'en', 'es') is word
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_lru_eviction(cache):
+    cache.set('one', 'en', 'es', make_word('one'))
+    cache.set('two', 'en', 'es', make_word('two'))
+    cache.get('one', 'en', 'es')
+    cache.set('three', 'en', 'es', make_word('three'))
+
+    assert cache.get('two', 'en', 'es') is None
+    assert cache.get('one', 'en', 'es') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl_expiration(cache, clock):
+    cache.set('challenge', 'en', 'es', make_word())
+    clock.now = 10
+
+    assert cache.get('challenge', 'en', 'es') is None
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_negative_entry_is_raised_until_it_expires(cache, clock):
+    cache.set_negative('challenge', 'en', 'es', GoogleTranslateRequestException('boom'))
+
+    with pytest.raises(GoogleTranslateRequestException):
+        cache.get('challenge', 'en', 'es')
+
+    clock.now = 1
+
+    assert cache.get('challenge', 'en', 'es') is None
+
+
+def test_invalidate_drops_every_language_pair(cache):
+    cache.set('challenge', 'en', 'es', make_word())
+    cache.set('challenge', 'auto', 'de', make_word())
+
+    cache.invalidate('challenge')
+
+    assert len(cache) == 0
+    assert cache.stats()['invalidations'] == 2
+
+
+@pytest.mark.asyncio
+async def test_lookup_caches_failed_google_lookups(cache):
+    translation_service = MagicMock()
+    translation_service.get_word_language_from_db = AsyncMock(return_value=None)
+    google_translate_service = MagicMock()
+    google_translate_service.get_translated_word = AsyncMock(side_effect=GoogleTranslateRequestException('boom'))
+    lease_service = LeaseService(InMemoryLeaseRepository(), ttl=10, poll_interval=0.01, wait_timeout=1)
+    lookup = TranslationLookupService(translation_service, google_translate_service, TieredTranslationCache(cache),
+                                      SingleFlight(), lease_service)
+
+    for _ in range(3):
+        with pytest.raises(GoogleTranslateRequestException):
+            await lookup.get_word('challenge', 'en', 'es')
+
+    assert google_translate_service.get_translated_word.await_count == 1
+
+
+def make_tiered_cache(l2: InMemorySharedCache) -> TieredTranslationCache:
+    return TieredTranslationCache(LocalTranslationCache(max_size=10, ttl=10, negative_ttl=1), l2,
+                                  l2_ttl=60, l2_negative_ttl=1)
+
+
+@pytest.mark.asyncio
+async def test_l2_is_shared_between_workers():
+    l2 = InMemorySharedCache()
+    first, second = make_tiered_cache(l2), make_tiered_cache(l2)
+
+    await first.set('challenge', 'en', 'es', make_word())
+    cached_word = await second.get('challenge', 'en', 'es')
+
+    assert cached_word == make_word()
+    assert second.stats()['l2Hits'] == 1
+    # Now in the L1 of the second worker
+    assert await second.get('challenge', 'en', 'es') is cached_word
+
+
+@pytest.mark.asyncio
+async def test_l2_negative_entries_are_shared():
+    l2 = InMemorySharedCache()
+    first, second = make_tiered_cache(l2), make_tiered_cache(l2)
+
+    await first.set_negative('challenge', 'en', 'es', GoogleTranslateRequestException('boom'))
+
+    with pytest.raises(GoogleTranslateRequestException):
+        await second.get('challenge', 'en', 'es')
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_l2_version():
+    l2 = InMemorySharedCache()
+    first, second = make_tiered_cache(l2), make_tiered_cache(l2)
+
+    await first.set('challenge', 'en', 'es', make_word())
+    await first.set('challenge', 'auto', 'de', make_word())
+    await second.invalidate('challenge')
+
+    assert await first.get('challenge', 'en', 'es') is not None  # L1 of another worker, until its TTL
+    assert await second.get('challenge', 'en', 'es') is None
+    assert await second.get('challenge', 'auto', 'de') is None
+
+
+@pytest.mark.asyncio
+async def test_value_read_before_invalidate_is_not_served():
+    l2 = InMemorySharedCache()
+    first, second = make_tiered_cache(l2), make_tiered_cache(l2)
+
+    # A miss, then the DB is read, then another worker writes the word and invalidates it
+    assert await first.get('challenge', 'en', 'es') is None
+    await second.invalidate('challenge')
+    await first.set('challenge', 'en', 'es', make_word('old'))
+
+    assert await second.get('challenge', 'en', 'es') is None
+
+    # The same within a worker: not even its L1 keeps it
+    assert await first.get('challenge', 'en', 'de') is None
+    await first.invalidate('challenge')
+    await first.set('challenge', 'en', 'de', make_word('old'))
+
+    assert await first.get('challenge', 'en', 'de') is None
+
+    # A fresh value is newer than the write that invalidated the word
+    await first.invalidate('challenge')
+    await first.set('challenge', 'en', 'de', make_word('new'), fresh=True)
+
+    assert await second.get('challenge', 'en', 'de') == make_word('new')
@@ -0,0 +1,144 @@
+import pytest
+
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+from app.v1.core.exceptions import InvalidCursorException
+from app.v1.repositories.translation import TranslationRepository, decode_cursor, encode_cursor
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+        self.sort_spec = None
+        self.limit_value = None
+
+    def sort(self, spec):
+        self.sort_spec = spec
+        return self
+
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents[:self.limit_value]
+
+
+def make_repository(documents: list[dict]) -> tuple[TranslationRepository, MagicMock, FakeCursor]:
+    cursor = FakeCursor(documents)
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+
+    return TranslationRepository(db), collection, cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor('challenge', 42)) == ('challenge', 42)
+
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursorException):
+        decode_cursor('not a cursor')
+
+
+@pytest.mark.asyncio
+async def test_prefix_listing_uses_anchored_match_and_keyset():
+    documents = [{'_id': index, 'word': word, 'language': 'en', 'normalizedWord': word.lower()}
+                 for index, word in enumerate(['Chain', 'challenge', 'chance'])]
+    repository, collection, cursor = make_repository(documents)
+
+    page = await repository.get_list_of_words_by_prefix(limit=2, prefix='CHA')
+
+    query, projection = collection.find.call_args.args
+    assert query == {'normalizedWord': {'$regex': '^cha'}}
+    assert cursor.sort_spec == [('normalizedWord', 1), ('_id', 1)]
+    assert cursor.limit_value == 3
+    assert [word.word for word in page.data] == ['Chain', 'challenge']
+    assert decode_cursor(page.meta['next']) == ('challenge', 1)
+    assert 'totalPages' not in page.meta
+
+    await repository.get_list_of_words_by_prefix(limit=2, prefix='cha', cursor=page.meta['next'])
+
+    query, _ = collection.find.call_args.args
+    assert query['$and'][1] == {'$or': [
+        {'normalizedWord': {'$gt': 'challenge'}},
+        {'normalizedWord': 'challenge', '_id': {'$gt': 1}},
+    ]}
+
+
+@pytest.mark.asyncio
+async def test_insert_word_stores_normalized_word():
+    repository, collection, _ = make_repository([])
+    collection.insert_one = AsyncMock()
+
+    await repository.insert_word({'word': ' Challenge ', 'language': 'en'})
+
+    assert collection.insert_one.call_args.args[0]['normalizedWord'] == 'challenge'
+
+
+@pytest.mark.asyncio
+async def test_upsert_word_sets_languages_one_by_one():
+    repository, collection, _ = make_repository([])
+    collection.update_one = AsyncMock()
+
+    await repository.upsert_word({'word': 'Challenge', 'language': 'en', 'pronunciation': None,
+                                  'languages': {'es': {'text': 'desafío'}, 'de': {'text': 'Herausforderung'}}})
+
+    query, update = collection.update_one.call_args.args
+
+    assert query == {'normalizedWord': 'challenge', 'language': 'en'}
+    assert update['$set'] == {'languages.es': {'text': 'desafío'}, 'languages.de': {'text': 'Herausforderung'},
+                              'fetchedAt.es': ANY, 'fetchedAt.de': ANY}
+    assert update['$setOnInsert'] == {'word': 'Challenge', 'language': 'en', 'pronunciation': None,
+                                      'normalizedWord': 'challenge'}
+    assert collection.update_one.call_args.kwargs == {'upsert': True}
+
+
+@pytest.mark.asyncio
+async def test_set_word_language_sends_only_that_language():
+    repository, collection, _ = make_repository([])
+    collection.update_one = AsyncMock()
+
+    await repository.set_word_language('CHALLENGE', 'en', 'de', {'text': 'Herausforderung'})
+
+    collection.update_one.assert_awaited_once_with(
+        {'normalizedWord': 'challenge', 'language': 'en'},
+        {'$set': {'languages.de': {'text': 'Herausforderung'}, 'fetchedAt.de': ANY}}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_word_language_projects_one_language():
+    repository, collection, _ = make_repository([])
+    collection.find_one = AsyncMock(return_value={'word': 'challenge', 'language': 'en', 'pronunciation': None})
+
+    word = await repository.get_word_language('challenge', 'en', 'de')
+
+    query, projection = collection.find_one.call_args.args
+    assert projection['languages.de'] == 1
+    assert 'languages' not in projection
+    # The word exists, the language doesn't
+    assert word['languages'] == {}
+
+
+@pytest.mark.asyncio
+async def test_variants_share_the_canonical_key():
+    repository, collection, _ = make_repository([])
+    collection.find_one = AsyncMock(return_value=None)
+    collection.delete_one = AsyncMock()
+
+    for variant in ('Café', 'café', ' CAFÉ '):
+        await repository.get_word(variant, 'fr')
+        assert collection.find_one.call_args.args[0] == {'normalizedWord': 'café', 'language': 'fr'}
+
+    await repository.get_words([('Istanbul', 'tr'), ('Istanbul', 'en')])
+    query, _ = collection.find.call_args.args
+    assert query == {'$or': [
+        {'language': 'tr', 'normalizedWord': {'$in': ['ıstanbul']}},
+        {'language': 'en', 'normalizedWord': {'$in': ['istanbul']}},
+    ]}
+
+    await repository.delete_word('Istanbul')
+    assert sorted(collection.delete_one.call_args.args[0]['normalizedWord']['$in']) == ['istanbul', 'ıstanbul']
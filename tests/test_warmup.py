@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.v1.cache.translation import LocalTranslationCache, TieredTranslationCache
+from app.v1.commands import warmup as warmup_command
+from app.v1.core.singleflight import SingleFlight
+from app.v1.models import Word, Language
+from app.v1.services.access import AccessRecorder
+from app.v1.services.lease import LeaseService
+from app.v1.services.lookup import TranslationLookupService
+from app.v1.services.source_language import SourceLanguageService
+from app.v1.services.translation import TranslationService
+from app.v1.services.warmup import WarmupService, read_keys
+from tests.stubs.lease import InMemoryLeaseRepository
+from tests.stubs.repository import InMemoryTranslationRepository
+from tests.stubs.source_language import InMemorySourceLanguageRepository
+
+
+def google_word(word: str, sl: str, tl: str) -> Word:
+    return Word(word=word, language=sl, pronunciation=None, languages={
+        tl: Language(text=f'{word}-{tl}', confidence=None, translations=None)
+    })
+
+
+@pytest.fixture
+def repository():
+    return InMemoryTranslationRepository()
+
+
+@pytest.fixture
+def access_stats():
+    access_stats = MagicMock()
+    access_stats.increment = AsyncMock()
+    access_stats.get_top = AsyncMock(return_value=[('challenge', 'en', 'es'), ('dare', 'en', 'es'),
+                                                   ('same', 'en', 'en')])
+
+    return access_stats
+
+
+@pytest.fixture
+def google_translate_service():
+    service = MagicMock()
+    service.get_translated_word = AsyncMock(side_effect=google_word)
+
+    return service
+
+
+def make_warmup_service(repository, google_translate_service, access_stats,
+                        access_recorder: AccessRecorder | None = None,
+                        source_language_service: SourceLanguageService | None = None) -> WarmupService:
+    cache = TieredTranslationCache(LocalTranslationCache(max_size=100, ttl=60, negative_ttl=60))
+    translation_service = TranslationService(repository, cache)
+    lookup = TranslationLookupService(
+        translation_service, google_translate_service, cache, SingleFlight(),
+        LeaseService(InMemoryLeaseRepository(), ttl=5, poll_interval=0.01, wait_timeout=1),
+        access_recorder=access_recorder,
+        source_language_service=source_language_service,
+    )
+
+    return WarmupService(translation_service, lookup, cache, access_stats, chunk_size=10, prefetch_rate=1000,
+                         source_language_service=source_language_service)
+
+
+@pytest.mark.asyncio
+async def test_access_recorder_flushes_counts_in_one_write(access_stats):
+    recorder = AccessRecorder(access_stats, flush_interval=60)
+
+    for _ in range(3):
+        recorder.record('challenge', 'en', 'es')
+
+    recorder.record('dare', 'en', 'es')
+    await recorder.flush()
+
+    counts, _ = access_stats.increment.call_args.args
+    assert counts == {('challenge', 'en', 'es'): 3, ('dare', 'en', 'es'): 1}
+    assert len(recorder) == 0
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_recorded(repository, google_translate_service, access_stats):
+    recorder = AccessRecorder(access_stats, flush_interval=60)
+    warmup_service = make_warmup_service(repository, google_translate_service, access_stats, recorder)
+
+    await warmup_service.lookup_service.get_word('challenge', 'en', 'es')
+    await warmup_service.lookup_service.get_words([('dare', 'en', 'es'), ('same', 'en', 'en')])
+
+    assert len(recorder) == 2
+
+
+@pytest.mark.asyncio
+async def test_load_caches_stored_keys_and_prefetch_resolves_the_rest(repository, google_translate_service,
+                                                                      access_stats):
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    warmup_service = make_warmup_service(repository, google_translate_service, access_stats)
+
+    keys = await warmup_service.get_keys(limit=10)
+    missing = await warmup_service.load(keys)
+
+    assert keys == [('challenge', 'en', 'es'), ('dare', 'en', 'es')]
+    assert missing == [('dare', 'en', 'es')]
+    assert await warmup_service.cache.get('challenge', 'en', 'es') is not None
+    assert google_translate_service.get_translated_word.await_count == 0
+
+    await warmup_service.prefetch(missing)
+
+    assert warmup_service.stats() == {'loaded': 1, 'prefetched': 1, 'failed': 0}
+    assert await warmup_service.cache.get('dare', 'en', 'es') is not None
+    assert await repository.get_word('dare', 'en') is not None
+
+
+@pytest.mark.asyncio
+async def test_load_resolves_auto_keys_to_the_stored_language(repository, google_translate_service, access_stats):
+    await repository.insert_word(google_word('challenge', 'en', 'es').model_dump())
+    source_languages = InMemorySourceLanguageRepository()
+    await source_languages.seed([('challenge', 'en')], now=None)
+    source_language_service = SourceLanguageService(source_languages, min_count=1, min_share=0.8)
+    warmup_service = make_warmup_service(repository, google_translate_service, access_stats,
+                                         source_language_service=source_language_service)
+
+    missing = await warmup_service.load([('challenge', 'auto', 'es'), ('dare', 'auto', 'es')])
+
+    assert missing == [('dare', 'auto', 'es')]
+    assert (await warmup_service.cache.get('challenge', 'auto', 'es'))['language'] == 'en'
+    assert await warmup_service.cache.get('challenge', 'en', 'es') is not None
+    assert google_translate_service.get_translated_word.await_count == 0
+
+
+def test_read_keys_skips_invalid_lines(tmp_path):
+    path = tmp_path / 'keys.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'word': 'challenge', 'sl': 'EN', 'tl': 'es'}),
+        json.dumps({'word': 'dare'}),
+        json.dumps({'word': 'x'}),
+        'not json',
+        json.dumps({'word': 'challenge', 'sl': 'en', 'tl': 'es'}),
+    ]))
+
+    assert read_keys(str(path)) == [('challenge', 'en', 'es'), ('dare', 'auto', 'en')]
+
+
+@pytest.mark.asyncio
+async def test_warmup_command_wires_the_services(tmp_path):
+    path = tmp_path / 'keys.jsonl'
+    path.write_text(json.dumps({'word': 'challenge', 'sl': 'en', 'tl': 'es'}))
+
+    with patch.object(warmup_command.MongoDB, 'from_settings', return_value=MagicMock()), \
+            patch.object(warmup_command, 'create_translator', AsyncMock()), \
+            patch.object(warmup_command, 'close_translator', AsyncMock()), \
+            patch.object(WarmupService, 'load', AsyncMock(return_value=[('challenge', 'en', 'es')])) as load, \
+            patch.object(WarmupService, 'prefetch', AsyncMock()) as prefetch:
+        await warmup_command.main(limit=10, path=str(path), rate=1, prefetch=True)
+
+    load.assert_awaited_once_with([('challenge', 'en', 'es')])
+    prefetch.assert_awaited_once_with([('challenge', 'en', 'es')])
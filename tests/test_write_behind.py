@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from unittest.mock import AsyncMock
+
+from app.v1.services.write_behind import WriteBehindQueue
+from tests.stubs.repository import InMemoryTranslationRepository
+
+
+def make_word(text: str, *languages: str) -> dict:
+    return {'word': text, 'language': 'en', 'pronunciation': None,
+            'languages': {language: {'text': f'{text}-{language}'} for language in languages}}
+
+
+@pytest.fixture
+def repository():
+    return InMemoryTranslationRepository()
+
+
+@pytest.mark.asyncio
+async def test_writes_of_the_same_word_are_coalesced(repository):
+    queue = WriteBehindQueue(repository, max_size=10, batch_size=10, flush_interval=60)
+
+    await queue.put_word(make_word('challenge', 'es'))
+    await queue.put_language('challenge', 'en', 'de', {'text': 'challenge-de'})
+    await queue.put_word(make_word('dare', 'es'))
+    await queue.flush()
+
+    assert repository.writes == 1
+    assert queue.stats()['coalesced'] == 1
+
+    challenge = await repository.get_word('challenge', 'en')
+
+    assert set(challenge['languages']) == {'es', 'de'}
+
+
+@pytest.mark.asyncio
+async def test_languages_of_stored_words_are_updated_not_upserted(repository):
+    queue = WriteBehindQueue(repository, max_size=10, batch_size=10, flush_interval=60)
+
+    await queue.put_language('missing', 'en', 'de', {'text': 'missing-de'})
+    await queue.flush()
+
+    assert repository.documents == []
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_batch_size_and_runs_callbacks(repository):
+    queue = WriteBehindQueue(repository, max_size=10, batch_size=2, flush_interval=60)
+    stored = asyncio.Event()
+
+    async def on_stored():
+        stored.set()
+
+    queue.start()
+
+    try:
+        await queue.put_word(make_word('challenge', 'es'), on_stored)
+        await queue.put_word(make_word('dare', 'es'))
+        await asyncio.wait_for(stored.wait(), 1)
+    finally:
+        await queue.stop()
+
+    assert len(repository.documents) == 2
+
+
+@pytest.mark.asyncio
+async def test_back_pressure_when_full(repository):
+    queue = WriteBehindQueue(repository, max_size=1, batch_size=10, flush_interval=60)
+
+    await queue.put_word(make_word('challenge', 'es'))
+    blocked = asyncio.create_task(queue.put_word(make_word('dare', 'es')))
+    await asyncio.sleep(0.01)
+
+    assert not blocked.done()
+
+    await queue.flush()
+    await asyncio.wait_for(blocked, 1)
+
+    assert len(queue) == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_and_discard_drops(repository):
+    queue = WriteBehindQueue(repository, max_size=10, batch_size=10, flush_interval=60)
+    queue.start()
+
+    released = []
+
+    await queue.put_word(make_word('challenge', 'es'))
+    await queue.put_word(make_word('dare', 'es'), on_stored=AsyncMock(side_effect=lambda: released.append('dare')))
+    await queue.discard('dare')
+
+    # Whoever waits for the dropped write (a lease) isn't left hanging
+    assert released == ['dare']
+
+    await queue.stop()
+
+    assert [document['word'] for document in repository.documents] == ['challenge']
+
+
+@pytest.mark.asyncio
+async def test_discard_makes_room_for_waiting_writes(repository):
+    queue = WriteBehindQueue(repository, max_size=1, batch_size=10, flush_interval=60)
+
+    await queue.put_word(make_word('challenge', 'es'))
+    blocked = asyncio.create_task(queue.put_word(make_word('dare', 'es')))
+    await asyncio.sleep(0.01)
+
+    await queue.discard('challenge')
+    await asyncio.wait_for(blocked, 1)
+
+    assert [word for word, _ in queue._pending] == ['dare']
+
+
+@pytest.mark.asyncio
+async def test_discard_waits_for_the_batch_a_flush_took(repository):
+    queue = WriteBehindQueue(repository, max_size=10, batch_size=10, flush_interval=60)
+    writing = asyncio.Event()
+    release = asyncio.Event()
+    save_words = repository.save_words
+
+    async def slow_save_words(*args):
+        writing.set()
+        await release.wait()
+        await save_words(*args)
+
+    repository.save_words = slow_save_words
+    await queue.put_word(make_word('challenge', 'es'))
+    flush = asyncio.create_task(queue.flush())
+    await writing.wait()
+
+    discard = asyncio.create_task(queue.discard('challenge'))
+    await asyncio.sleep(0.01)
+
+    assert not discard.done()
+
+    release.set()
+    await asyncio.wait_for(discard, 1)
+    await flush
+
+    # Stored before discard returned: the delete that follows removes it
+    assert [document['word'] for document in repository.documents] == ['challenge']